@@ -112,3 +112,18 @@ class ProduccionAcademica(db.Model):
     
     # Relaciones
     autores = db.relationship('Docente', secondary=docentes_producciones_academicas, back_populates='producciones_academicas')
+
+# =============================================
+# REGISTRO DE MODELOS POR TABLA
+# =============================================
+
+MODELOS_POR_TABLA = {
+    'areas': Area,
+    'lineas_investigacion': LineaInvestigacion,
+    'periodos_academicos': PeriodoAcademico,
+    'cursos': Curso,
+    'docentes': Docente,
+    'disponibilidades_horarias': DisponibilidadHoraria,
+    'producciones_academicas': ProduccionAcademica,
+    'asignaciones_docentes': AsignacionDocente,
+}
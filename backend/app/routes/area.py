@@ -3,6 +3,8 @@ from app.models.models import Area
 from app.schemas import area_schema, areas_schema
 from app import db
 from sqlalchemy.exc import IntegrityError
+from app.utils.pagination import paginated_response
+from app.utils.search import search_response
 
 area_bp = Blueprint('area', __name__)
 
@@ -10,11 +12,7 @@ area_bp = Blueprint('area', __name__)
 def get_areas():
     """Obtener todas las áreas académicas"""
     try:
-        areas = Area.query.all()
-        return jsonify({
-            'success': True,
-            'data': areas_schema.dump(areas)
-        }), 200
+        return paginated_response(Area.query, areas_schema)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -125,17 +123,12 @@ def delete_area(area_id):
 
 @area_bp.route('/buscar', methods=['GET'])
 def buscar_areas():
-    """Buscar áreas académicas por nombre"""
+    """Buscar áreas académicas por texto (q, nombre)"""
     try:
-        nombre = request.args.get('nombre', '')
-        query = Area.query
-        if nombre:
-            query = query.filter(Area.nombre.ilike(f'%{nombre}%'))
-        areas = query.all()
-        return jsonify({
-            'success': True,
-            'data': areas_schema.dump(areas)
-        }), 200
+        return search_response(Area.query, areas_schema, {
+            None: request.args.get('q'),
+            'nombre': request.args.get('nombre'),
+        })
     except Exception as e:
         return jsonify({
             'success': False,
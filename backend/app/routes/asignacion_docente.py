@@ -3,18 +3,19 @@ from app.models.models import AsignacionDocente, Docente, Curso, PeriodoAcademic
 from app.schemas import asignacion_docente_schema, asignaciones_docentes_schema
 from app import db
 from sqlalchemy.exc import IntegrityError
+from app.utils.pagination import paginated_response
+from app.services.carga_horaria_cube import carga_horaria_cube, DIMENSIONES
+from app.services.asignacion_bulk_service import AsignacionBulkService
+from app.utils.bulk_input import iter_request_rows
 
 asignacion_docente_bp = Blueprint('asignacion_docente', __name__)
+asignacion_bulk_service = AsignacionBulkService()
 
 @asignacion_docente_bp.route('/', methods=['GET'])
 def get_asignaciones():
     """Obtener todas las asignaciones de docentes"""
     try:
-        asignaciones = AsignacionDocente.query.all()
-        return jsonify({
-            'success': True,
-            'data': asignaciones_docentes_schema.dump(asignaciones)
-        }), 200
+        return paginated_response(AsignacionDocente.query, asignaciones_docentes_schema)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -103,6 +104,41 @@ def create_asignacion():
             'error': str(e)
         }), 500
 
+@asignacion_docente_bp.route('/bulk', methods=['POST'])
+def bulk_asignaciones():
+    """
+    Crear, actualizar y eliminar asignaciones por lotes.
+    Acepta un arreglo JSON o NDJSON con objetos {"op": "create"|"update"|"delete", ...};
+    las filas inválidas se informan en 'errores' sin abortar el resto del lote.
+    """
+    try:
+        resultado = asignacion_bulk_service.procesar(iter_request_rows())
+        return jsonify({
+            'success': True,
+            'data': resultado,
+            'message': f"{len(resultado['creadas'])} creadas, {resultado['actualizadas']} actualizadas, "
+                       f"{resultado['eliminadas']} eliminadas, {len(resultado['errores'])} con errores"
+        }), 200
+        
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': 'Error de integridad en la base de datos'
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @asignacion_docente_bp.route('/<int:asignacion_id>', methods=['PUT'])
 def update_asignacion(asignacion_id):
     """Actualizar una asignación de docente"""
@@ -222,27 +258,13 @@ def get_asignaciones_por_periodo(periodo_id):
 def get_carga_horaria_periodo(periodo_id):
     """Obtener carga horaria por docente en un período específico"""
     try:
-        from sqlalchemy import func
-        
-        # Consulta para obtener carga horaria por docente
-        carga_horaria = db.session.query(
-            Docente.nombre,
-            func.sum(AsignacionDocente.horas_asignadas).label('total_horas')
-        ).join(
-            AsignacionDocente, Docente.id == AsignacionDocente.docente_id
-        ).filter(
-            AsignacionDocente.periodo_id == periodo_id
-        ).group_by(
-            Docente.id, Docente.nombre
-        ).order_by(
-            func.sum(AsignacionDocente.horas_asignadas).desc()
-        ).all()
+        carga_horaria = carga_horaria_cube.agrupar(['docente'], {'periodo': [periodo_id]})
         
         result = []
-        for nombre, total_horas in carga_horaria:
+        for fila in carga_horaria:
             result.append({
-                'docente': nombre,
-                'total_horas': total_horas
+                'docente': fila['docente']['nombre'],
+                'total_horas': fila['total_horas']
             })
         
         return jsonify({
@@ -254,4 +276,41 @@ def get_carga_horaria_periodo(periodo_id):
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500 
\ No newline at end of file
+        }), 500
+
+@asignacion_docente_bp.route('/carga-horaria/cubo', methods=['GET'])
+def get_carga_horaria_cubo():
+    """
+    Cubo de carga horaria:
+      - ?dimensiones=docente,periodo,curso,area,linea: agrupación (vacío = total general)
+      - ?<dimension>=id1,id2: filtra el cubo por esos valores (slice/dice)
+      - ?rollup=true: devuelve también los subtotales de cada nivel
+    """
+    try:
+        dimensiones = [d.strip() for d in request.args.get('dimensiones', '').split(',') if d.strip()]
+        filtros = {}
+        for dimension in DIMENSIONES:
+            valores = request.args.get(dimension)
+            if valores:
+                filtros[dimension] = [int(valor) for valor in valores.split(',') if valor.strip()]
+        
+        if request.args.get('rollup', 'false').lower() == 'true':
+            data = carga_horaria_cube.rollup(dimensiones, filtros)
+        else:
+            data = carga_horaria_cube.agrupar(dimensiones, filtros)
+        
+        return jsonify({
+            'success': True,
+            'data': data
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
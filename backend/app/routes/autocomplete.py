@@ -0,0 +1,31 @@
+from flask import Blueprint, request, jsonify
+from app.services.autocomplete_index import autocomplete_index, TIPOS_AUTOCOMPLETE
+
+autocomplete_bp = Blueprint('autocomplete', __name__)
+
+# Sugerencias devueltas por defecto (y como máximo)
+DEFAULT_AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+
+@autocomplete_bp.route('', methods=['GET'])
+def autocomplete():
+    """Sugerencias por prefijo del nombre (?tipo=docentes|cursos|lineas|periodos|areas&q=...&limit=n)"""
+    try:
+        tipo = request.args.get('tipo', '')
+        if tipo not in TIPOS_AUTOCOMPLETE:
+            return jsonify({
+                'success': False,
+                'error': f"tipo debe ser uno de: {', '.join(TIPOS_AUTOCOMPLETE)}"
+            }), 400
+        limit = request.args.get('limit', DEFAULT_AUTOCOMPLETE_LIMIT, type=int)
+        limit = max(1, min(limit, MAX_AUTOCOMPLETE_LIMIT))
+        sugerencias = autocomplete_index.buscar(tipo, request.args.get('q', ''), limit)
+        return jsonify({
+            'success': True,
+            'data': sugerencias
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -3,6 +3,8 @@ from app.models.models import Curso, LineaInvestigacion
 from app.schemas import curso_schema, cursos_schema
 from app import db
 from sqlalchemy.exc import IntegrityError
+from app.utils.pagination import paginated_response
+from app.utils.search import search_response
 
 curso_bp = Blueprint('curso', __name__)
 
@@ -10,11 +12,7 @@ curso_bp = Blueprint('curso', __name__)
 def get_cursos():
     """Obtener todos los cursos"""
     try:
-        cursos = Curso.query.all()
-        return jsonify({
-            'success': True,
-            'data': cursos_schema.dump(cursos)
-        }), 200
+        return paginated_response(Curso.query, cursos_schema)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -162,24 +160,20 @@ def delete_curso(curso_id):
 
 @curso_bp.route('/buscar', methods=['GET'])
 def buscar_cursos():
-    """Buscar cursos por criterios"""
+    """Buscar cursos por texto (q, nombre, codigo) y línea de investigación"""
     try:
-        nombre = request.args.get('nombre', '')
         linea_id = request.args.get('linea_id', '')
         
         query = Curso.query
         
-        if nombre:
-            query = query.filter(Curso.nombre.ilike(f'%{nombre}%'))
         if linea_id:
-            query = query.filter(Curso.linea_investigacion_id == linea_id)
-        
-        cursos = query.all()
+            query = query.join(Curso.lineas_investigacion).filter(LineaInvestigacion.id == int(linea_id))
         
-        return jsonify({
-            'success': True,
-            'data': cursos_schema.dump(cursos)
-        }), 200
+        return search_response(query, cursos_schema, {
+            None: request.args.get('q'),
+            'nombre': request.args.get('nombre'),
+            'codigo': request.args.get('codigo'),
+        })
         
     except Exception as e:
         return jsonify({
@@ -3,6 +3,8 @@ from app.models.models import DisponibilidadHoraria, Docente
 from app.schemas import disponibilidad_horaria_schema, disponibilidades_horarias_schema
 from app import db
 from sqlalchemy.exc import IntegrityError
+from app.utils.pagination import paginated_response
+from app.utils.search import search_response
 from datetime import datetime
 
 disponibilidad_horaria_bp = Blueprint('disponibilidad_horaria', __name__)
@@ -11,11 +13,7 @@ disponibilidad_horaria_bp = Blueprint('disponibilidad_horaria', __name__)
 def get_disponibilidades():
     """Obtener todas las disponibilidades horarias"""
     try:
-        disponibilidades = DisponibilidadHoraria.query.all()
-        return jsonify({
-            'success': True,
-            'data': disponibilidades_horarias_schema.dump(disponibilidades)
-        }), 200
+        return paginated_response(DisponibilidadHoraria.query, disponibilidades_horarias_schema)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -224,24 +222,20 @@ def get_disponibilidades_por_docente(docente_id):
 
 @disponibilidad_horaria_bp.route('/buscar', methods=['GET'])
 def buscar_disponibilidades():
-    """Buscar disponibilidades horarias por criterios"""
+    """Buscar disponibilidades horarias por docente y texto de la descripción (q, dia_semana)"""
     try:
         docente_id = request.args.get('docente_id', '')
-        dia_semana = request.args.get('dia_semana', '')
         
         query = DisponibilidadHoraria.query
         
         if docente_id:
             query = query.filter(DisponibilidadHoraria.docente_id == int(docente_id))
-        if dia_semana:
-            query = query.filter(DisponibilidadHoraria.dia_semana.ilike(f'%{dia_semana}%'))
-        
-        disponibilidades = query.all()
         
-        return jsonify({
-            'success': True,
-            'data': disponibilidades_horarias_schema.dump(disponibilidades)
-        }), 200
+        # El día de la semana forma parte de la descripción ("Lunes 08:00-10:00")
+        return search_response(query, disponibilidades_horarias_schema, {
+            None: request.args.get('q'),
+            'descripcion': request.args.get('dia_semana'),
+        })
         
     except Exception as e:
         return jsonify({
@@ -1,32 +1,27 @@
 from flask import Blueprint, request, jsonify
 from app.models.models import Docente, LineaInvestigacion, ProduccionAcademica
-from app.schemas import docente_schema, docentes_schema
+from app.schemas import docente_schema, docentes_schema, docente_perfil_schema
 from app import db
 from sqlalchemy.exc import IntegrityError
-from app.services.rdf_service import RDFService
-import requests
+from app.utils.pagination import paginated_response
+from app.utils.search import search_response
+from app.services.rdf_service import rdf_graph_cache
+from app.services.triplestore_sync import TriplestoreSyncService, TriplestoreSyncQueue
 
 docente_bp = Blueprint('docente', __name__)
-
-JENA_DATA_ENDPOINT = 'http://localhost:3030/acadontology/data'  # Ajusta si tu endpoint es diferente
+triplestore_sync = TriplestoreSyncQueue(TriplestoreSyncService(), source=rdf_graph_cache)
 
 # --- Utilidad para sincronizar el triple store ---
 def sync_triple_store():
-    rdf_service = RDFService()
-    rdf_xml = rdf_service.generate_rdf_from_database().serialize(format='xml')
-    # Borra y sube el nuevo RDF al dataset de Jena
-    headers = {'Content-Type': 'application/rdf+xml'}
-    requests.post(JENA_DATA_ENDPOINT, data=rdf_xml, headers=headers)
+    # Solo se reemplazan los grafos con nombre que dependen del docente, a partir del
+    # grafo en memoria ya actualizado por el commit; el envío ocurre en segundo plano
+    triplestore_sync.programar(['docentes', 'disponibilidades_horarias', 'producciones_academicas'])
 
 @docente_bp.route('/', methods=['GET'])
 def get_docentes():
     """Obtener todos los docentes"""
     try:
-        docentes = Docente.query.all()
-        return jsonify({
-            'success': True,
-            'data': docentes_schema.dump(docentes)
-        }), 200
+        return paginated_response(Docente.query, docentes_schema)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -131,20 +126,18 @@ def delete_docente(docente_id):
 
 @docente_bp.route('/buscar', methods=['GET'])
 def buscar_docentes():
-    """Buscar docentes por criterios"""
+    """Buscar docentes por texto (q, nombre, grado, especialidad) y línea de investigación"""
     try:
-        nombre = request.args.get('nombre', '')
-        grado = request.args.get('grado', '')
         linea_id = request.args.get('linea_id', '')
         query = Docente.query
-        if nombre:
-            query = query.filter(Docente.nombre.ilike(f'%{nombre}%'))
-        if grado:
-            query = query.filter(Docente.grado_academico.ilike(f'%{grado}%'))
         if linea_id:
-            query = query.join(Docente.lineas_investigacion).filter(LineaInvestigacion.id == linea_id)
-        docentes = query.all()
-        return jsonify({'success': True, 'data': docentes_schema.dump(docentes)}), 200
+            query = query.join(Docente.lineas_investigacion).filter(LineaInvestigacion.id == int(linea_id))
+        return search_response(query, docentes_schema, {
+            None: request.args.get('q'),
+            'nombre': request.args.get('nombre'),
+            'grado_academico': request.args.get('grado'),
+            'especialidad': request.args.get('especialidad'),
+        })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -152,31 +145,9 @@ def buscar_docentes():
 def get_perfil_completo(docente_id):
     """Obtener perfil completo de un docente con todas sus relaciones"""
     try:
-        docente = Docente.query.get_or_404(docente_id)
-        perfil = docente_schema.dump(docente)
-        perfil['asignaciones'] = [
-            {
-                'id': a.id,
-                'curso': a.curso.nombre,
-                'periodo': a.periodo_academico.nombre,
-                'horas_asignadas': a.horas_asignadas
-            } for a in docente.asignaciones
-        ]
-        perfil['producciones_academicas'] = [
-            {
-                'id': p.id,
-                'titulo': p.titulo,
-                'doi': p.doi,
-                'revista': p.revista,
-                'anio_publicacion': p.anio_publicacion
-            } for p in docente.producciones_academicas
-        ]
-        perfil['disponibilidades'] = [
-            {
-                'id': d.id,
-                'descripcion': d.descripcion
-            } for d in docente.disponibilidades
-        ]
+        # Todas las relaciones del perfil se cargan con un número fijo de consultas
+        docente = Docente.query.options(*docente_perfil_schema.loader_options()).get_or_404(docente_id)
+        perfil = docente_perfil_schema.dump(docente)
         return jsonify({'success': True, 'data': perfil}), 200
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
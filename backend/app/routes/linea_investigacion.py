@@ -3,6 +3,8 @@ from app.models.models import LineaInvestigacion
 from app.schemas import linea_investigacion_schema, lineas_investigacion_schema
 from app import db
 from sqlalchemy.exc import IntegrityError
+from app.utils.pagination import paginated_response
+from app.utils.search import search_response
 
 linea_investigacion_bp = Blueprint('linea_investigacion', __name__)
 
@@ -10,11 +12,7 @@ linea_investigacion_bp = Blueprint('linea_investigacion', __name__)
 def get_lineas_investigacion():
     """Obtener todas las líneas de investigación"""
     try:
-        lineas = LineaInvestigacion.query.all()
-        return jsonify({
-            'success': True,
-            'data': lineas_investigacion_schema.dump(lineas)
-        }), 200
+        return paginated_response(LineaInvestigacion.query, lineas_investigacion_schema)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -140,21 +138,12 @@ def delete_linea_investigacion(linea_id):
 
 @linea_investigacion_bp.route('/buscar', methods=['GET'])
 def buscar_lineas_investigacion():
-    """Buscar líneas de investigación por criterios"""
+    """Buscar líneas de investigación por texto (q, nombre)"""
     try:
-        nombre = request.args.get('nombre', '')
-        
-        query = LineaInvestigacion.query
-        
-        if nombre:
-            query = query.filter(LineaInvestigacion.nombre.ilike(f'%{nombre}%'))
-        
-        lineas = query.all()
-        
-        return jsonify({
-            'success': True,
-            'data': lineas_investigacion_schema.dump(lineas)
-        }), 200
+        return search_response(LineaInvestigacion.query, lineas_investigacion_schema, {
+            None: request.args.get('q'),
+            'nombre': request.args.get('nombre'),
+        })
         
     except Exception as e:
         return jsonify({
@@ -21,7 +21,8 @@ def index():
             'disponibilidad_horaria': '/api/disponibilidad-horaria',
             'sparql': '/api/sparql',
             'rdf_export': '/api/rdf',
-            'visualizacion': '/api/visualizacion'
+            'visualizacion': '/api/visualizacion',
+            'autocomplete': '/api/autocomplete'
         },
         'documentation': {
             'swagger': '/swagger',
@@ -0,0 +1,31 @@
+from flask import Blueprint, jsonify
+from app.utils.profiling import metricas_store, PERCENTILES
+
+metricas_bp = Blueprint('metricas', __name__)
+
+@metricas_bp.route('', methods=['GET'])
+def get_metricas():
+    """Percentiles de tiempo por ruta (total, SQL, SPARQL y serialización), de la más lenta a la más rápida"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': {
+                'percentiles': [f'p{p}' for p in PERCENTILES],
+                'muestras_por_ruta': metricas_store.muestras_por_ruta,
+                'rutas': metricas_store.resumen()
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@metricas_bp.route('', methods=['DELETE'])
+def reset_metricas():
+    """Descartar las métricas acumuladas"""
+    metricas_store.reset()
+    return jsonify({
+        'success': True,
+        'message': 'Métricas reiniciadas'
+    }), 200
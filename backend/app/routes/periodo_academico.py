@@ -3,6 +3,8 @@ from app.models.models import PeriodoAcademico
 from app.schemas import periodo_academico_schema, periodos_academicos_schema
 from app import db
 from sqlalchemy.exc import IntegrityError
+from app.utils.pagination import paginated_response
+from app.utils.search import search_response
 from datetime import datetime
 
 periodo_academico_bp = Blueprint('periodo_academico', __name__)
@@ -11,11 +13,7 @@ periodo_academico_bp = Blueprint('periodo_academico', __name__)
 def get_periodos_academicos():
     """Obtener todos los períodos académicos"""
     try:
-        periodos = PeriodoAcademico.query.all()
-        return jsonify({
-            'success': True,
-            'data': periodos_academicos_schema.dump(periodos)
-        }), 200
+        return paginated_response(PeriodoAcademico.query, periodos_academicos_schema)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -192,24 +190,19 @@ def delete_periodo_academico(periodo_id):
 
 @periodo_academico_bp.route('/buscar', methods=['GET'])
 def buscar_periodos_academicos():
-    """Buscar períodos académicos por criterios"""
+    """Buscar períodos académicos por texto (q, nombre) y año"""
     try:
-        nombre = request.args.get('nombre', '')
         anio = request.args.get('anio', '')
         
         query = PeriodoAcademico.query
         
-        if nombre:
-            query = query.filter(PeriodoAcademico.nombre.ilike(f'%{nombre}%'))
         if anio:
-            query = query.filter(PeriodoAcademico.nombre.ilike(f'%{anio}%'))
-        
-        periodos = query.all()
+            query = query.filter(PeriodoAcademico.anio == int(anio))
         
-        return jsonify({
-            'success': True,
-            'data': periodos_academicos_schema.dump(periodos)
-        }), 200
+        return search_response(query, periodos_academicos_schema, {
+            None: request.args.get('q'),
+            'nombre': request.args.get('nombre'),
+        })
         
     except Exception as e:
         return jsonify({
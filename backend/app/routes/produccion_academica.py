@@ -3,6 +3,9 @@ from app.models.models import ProduccionAcademica, Docente
 from app.schemas import produccion_academica_schema, producciones_academicas_schema
 from app import db
 from sqlalchemy.exc import IntegrityError
+from app.utils.pagination import paginated_response
+from app.utils.search import search_response
+from app.services.estadisticas_service import estadisticas_store
 
 produccion_academica_bp = Blueprint('produccion_academica', __name__)
 
@@ -10,11 +13,7 @@ produccion_academica_bp = Blueprint('produccion_academica', __name__)
 def get_producciones():
     """Obtener toda la producción académica"""
     try:
-        producciones = ProduccionAcademica.query.all()
-        return jsonify({
-            'success': True,
-            'data': producciones_academicas_schema.dump(producciones)
-        }), 200
+        return paginated_response(ProduccionAcademica.query, producciones_academicas_schema)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -192,30 +191,23 @@ def get_producciones_por_docente(docente_id):
 
 @produccion_academica_bp.route('/buscar', methods=['GET'])
 def buscar_producciones():
-    """Buscar producción académica por criterios"""
+    """Buscar producción académica por texto (q, titulo, revista), año y autor"""
     try:
-        titulo = request.args.get('titulo', '')
-        tipo = request.args.get('tipo', '')
         anio = request.args.get('anio', '')
         docente_id = request.args.get('docente_id', '')
         
         query = ProduccionAcademica.query
         
-        if titulo:
-            query = query.filter(ProduccionAcademica.titulo.ilike(f'%{titulo}%'))
-        if tipo:
-            query = query.filter(ProduccionAcademica.tipo.ilike(f'%{tipo}%'))
         if anio:
-            query = query.filter(ProduccionAcademica.anio == int(anio))
+            query = query.filter(ProduccionAcademica.anio_publicacion == int(anio))
         if docente_id:
-            query = query.filter(ProduccionAcademica.docente_id == int(docente_id))
+            query = query.join(ProduccionAcademica.autores).filter(Docente.id == int(docente_id))
         
-        producciones = query.all()
-        
-        return jsonify({
-            'success': True,
-            'data': producciones_academicas_schema.dump(producciones)
-        }), 200
+        return search_response(query, producciones_academicas_schema, {
+            None: request.args.get('q'),
+            'titulo': request.args.get('titulo'),
+            'revista': request.args.get('revista'),
+        })
         
     except Exception as e:
         return jsonify({
@@ -227,39 +219,15 @@ def buscar_producciones():
 def get_estadisticas_produccion():
     """Obtener estadísticas de producción académica"""
     try:
-        from sqlalchemy import func
-        
-        # Total de producciones
-        total_producciones = ProduccionAcademica.query.count()
-        
-        # Producciones por tipo
-        producciones_por_tipo = db.session.query(
-            ProduccionAcademica.tipo,
-            func.count(ProduccionAcademica.id).label('cantidad')
-        ).filter(
-            ProduccionAcademica.tipo.isnot(None)
-        ).group_by(
-            ProduccionAcademica.tipo
-        ).all()
-        
-        # Producciones por año
-        producciones_por_anio = db.session.query(
-            ProduccionAcademica.anio,
-            func.count(ProduccionAcademica.id).label('cantidad')
-        ).filter(
-            ProduccionAcademica.anio.isnot(None)
-        ).group_by(
-            ProduccionAcademica.anio
-        ).order_by(
-            ProduccionAcademica.anio.desc()
-        ).all()
-        
+        estadisticas = estadisticas_store.snapshot()
         return jsonify({
             'success': True,
             'data': {
-                'total_producciones': total_producciones,
-                'por_tipo': [{'tipo': tipo, 'cantidad': cantidad} for tipo, cantidad in producciones_por_tipo],
-                'por_anio': [{'anio': anio, 'cantidad': cantidad} for anio, cantidad in producciones_por_anio]
+                'total_producciones': estadisticas['conteos']['producciones_academicas'],
+                # Las TOP_N revistas con más producciones y cuántas revistas distintas hay
+                'por_revista': estadisticas['producciones_por_revista'],
+                'revistas_distintas': estadisticas['revistas_distintas'],
+                'por_anio': estadisticas['producciones_por_anio']
             }
         }), 200
         
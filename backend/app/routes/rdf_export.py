@@ -1,19 +1,20 @@
-from flask import Blueprint, request, jsonify, Response
-from app.services.rdf_service import RDFService
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from app.services.rdf_service import rdf_graph_cache
+from app.services.estadisticas_service import estadisticas_store
 from app.models.models import Docente
 from app import db
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, FOAF, DCTERMS, XSD
 
 rdf_export_bp = Blueprint('rdf_export', __name__)
-rdf_service = RDFService()
+rdf_service = rdf_graph_cache.rdf_service
 
 @rdf_export_bp.route('/generate', methods=['POST'])
 def generate_rdf():
     """Generar RDF completo desde la base de datos"""
     try:
-        # Generar RDF desde la base de datos
-        graph = rdf_service.generate_rdf_from_database()
+        # Regenerar el grafo en memoria desde la base de datos
+        graph = rdf_graph_cache.rebuild()
         
         return jsonify({
             'success': True,
@@ -31,9 +32,8 @@ def generate_rdf():
 def export_rdf_xml():
     """Exportar RDF en formato XML"""
     try:
-        # Generar RDF
-        rdf_service.generate_rdf_from_database()
-        xml_content = rdf_service.export_rdf_xml()
+        # Serializar el grafo en memoria
+        xml_content = rdf_graph_cache.serialize(format='xml')
         
         response = Response(xml_content, mimetype='application/rdf+xml')
         response.headers['Content-Disposition'] = 'attachment; filename=acadontology.rdf'
@@ -50,9 +50,8 @@ def export_rdf_xml():
 def export_rdf_turtle():
     """Exportar RDF en formato Turtle"""
     try:
-        # Generar RDF
-        rdf_service.generate_rdf_from_database()
-        turtle_content = rdf_service.export_rdf_turtle()
+        # Serializar el grafo en memoria
+        turtle_content = rdf_graph_cache.serialize(format='turtle')
         
         response = Response(turtle_content, mimetype='text/turtle')
         response.headers['Content-Disposition'] = 'attachment; filename=acadontology.ttl'
@@ -69,9 +68,8 @@ def export_rdf_turtle():
 def export_rdf_jsonld():
     """Exportar RDF en formato JSON-LD"""
     try:
-        # Generar RDF
-        rdf_service.generate_rdf_from_database()
-        jsonld_content = rdf_service.export_rdf_jsonld()
+        # Serializar el grafo en memoria
+        jsonld_content = rdf_graph_cache.serialize(format='json-ld')
         
         response = Response(jsonld_content, mimetype='application/ld+json')
         response.headers['Content-Disposition'] = 'attachment; filename=acadontology.jsonld'
@@ -84,6 +82,36 @@ def export_rdf_jsonld():
             'error': str(e)
         }), 500
 
+@rdf_export_bp.route('/export/ntriples', methods=['GET'])
+def export_rdf_ntriples():
+    """Exportar RDF en formato N-Triples por streaming"""
+    return _stream_export(quads=False)
+
+@rdf_export_bp.route('/export/nquads', methods=['GET'])
+def export_rdf_nquads():
+    """Exportar RDF en formato N-Quads por streaming (un grafo por tipo de entidad)"""
+    return _stream_export(quads=True)
+
+def _stream_export(quads):
+    try:
+        batch_size = request.args.get('batch_size', 1000, type=int)
+        chunks = rdf_service.stream_ntriples(quads=quads, batch_size=max(batch_size, 1))
+        
+        if quads:
+            response = Response(stream_with_context(chunks), mimetype='application/n-quads')
+            response.headers['Content-Disposition'] = 'attachment; filename=acadontology.nq'
+        else:
+            response = Response(stream_with_context(chunks), mimetype='application/n-triples')
+            response.headers['Content-Disposition'] = 'attachment; filename=acadontology.nt'
+        
+        return response
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @rdf_export_bp.route('/docente/<int:docente_id>/perfil', methods=['GET'])
 def export_perfil_docente(docente_id):
     """Exportar perfil completo de un docente en formato RDF"""
@@ -91,29 +119,8 @@ def export_perfil_docente(docente_id):
         # Verificar que el docente existe
         docente = Docente.query.get_or_404(docente_id)
         
-        # Generar RDF específico para el docente
-        graph = rdf_service.generate_rdf_from_database()
-        
-        # Filtrar solo los triples relacionados con el docente
-        from rdflib import URIRef
-        docente_uri = URIRef(f"{rdf_service.ns}Docente_{docente_id}")
-        
-        # Obtener todos los triples que involucran al docente
-        triples = []
-        for s, p, o in graph:
-            if s == docente_uri or o == docente_uri:
-                triples.append((s, p, o))
-        
-        # Crear un nuevo grafo solo con los triples del docente
-        from rdflib import Graph
-        docente_graph = Graph()
-        for triple in triples:
-            docente_graph.add(triple)
-        
-        # Agregar los namespaces
-        docente_graph.bind("acad", rdf_service.ns)
-        docente_graph.bind("foaf", rdf_service.g.namespace_manager.namespaces()[1][1])
-        docente_graph.bind("dcterms", rdf_service.g.namespace_manager.namespaces()[2][1])
+        # Construir solo el vecindario del docente (sin recorrer el grafo completo)
+        docente_graph = rdf_service.describe_docente(docente.id)
         
         # Exportar en el formato solicitado
         format_type = request.args.get('format', 'xml')
@@ -146,32 +153,22 @@ def export_perfil_docente(docente_id):
 def get_rdf_statistics():
     """Obtener estadísticas del RDF generado"""
     try:
-        # Generar RDF
-        graph = rdf_service.generate_rdf_from_database()
-        
-        # Contar diferentes tipos de entidades
-        from rdflib import RDF, URIRef
-        
-        docentes = len(list(graph.subjects(RDF.type, rdf_service.ns.Docente)))
-        cursos = len(list(graph.subjects(RDF.type, rdf_service.ns.Curso)))
-        lineas = len(list(graph.subjects(RDF.type, rdf_service.ns.LineaInvestigacion)))
-        periodos = len(list(graph.subjects(RDF.type, rdf_service.ns.PeriodoAcademico)))
-        asignaciones = len(list(graph.subjects(RDF.type, rdf_service.ns.AsignacionDocente)))
-        producciones = len(list(graph.subjects(RDF.type, rdf_service.ns.ProduccionAcademica)))
-        disponibilidades = len(list(graph.subjects(RDF.type, rdf_service.ns.DisponibilidadHoraria)))
+        # Conteos materializados: no hace falta recorrer el grafo
+        conteos = estadisticas_store.snapshot()['conteos']
+        total_triples = rdf_graph_cache.total_triples
         
         return jsonify({
             'success': True,
             'data': {
-                'total_triples': len(graph),
+                'total_triples': total_triples,
                 'entidades': {
-                    'docentes': docentes,
-                    'cursos': cursos,
-                    'lineas_investigacion': lineas,
-                    'periodos_academicos': periodos,
-                    'asignaciones_docentes': asignaciones,
-                    'produccion_academica': producciones,
-                    'disponibilidad_horaria': disponibilidades
+                    'docentes': conteos['docentes'],
+                    'cursos': conteos['cursos'],
+                    'lineas_investigacion': conteos['lineas_investigacion'],
+                    'periodos_academicos': conteos['periodos_academicos'],
+                    'asignaciones_docentes': conteos['asignaciones_docentes'],
+                    'produccion_academica': conteos['producciones_academicas'],
+                    'disponibilidad_horaria': conteos['disponibilidades_horarias']
                 },
                 'namespaces': {
                     'acad': str(rdf_service.ns),
@@ -215,6 +212,22 @@ def get_available_formats():
             'mime_type': 'application/ld+json',
             'extension': '.jsonld',
             'endpoint': '/api/rdf/export/jsonld'
+        },
+        {
+            'id': 'ntriples',
+            'name': 'N-Triples',
+            'description': 'Formato línea a línea, exportado por streaming',
+            'mime_type': 'application/n-triples',
+            'extension': '.nt',
+            'endpoint': '/api/rdf/export/ntriples'
+        },
+        {
+            'id': 'nquads',
+            'name': 'N-Quads',
+            'description': 'N-Triples con un grafo con nombre por tipo de entidad, exportado por streaming',
+            'mime_type': 'application/n-quads',
+            'extension': '.nq',
+            'endpoint': '/api/rdf/export/nquads'
         }
     ]
     
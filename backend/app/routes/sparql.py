@@ -17,7 +17,14 @@ def execute_sparql_query():
             }), 400
         
         query = data['query']
-        results = sparql_service._execute_sparql_query(query)
+        # TTL opcional de caché en segundos (0 = sin caché)
+        cache_ttl = data.get('cache_ttl')
+        if cache_ttl is not None and (isinstance(cache_ttl, bool) or not isinstance(cache_ttl, int) or cache_ttl < 0):
+            return jsonify({
+                'success': False,
+                'error': 'cache_ttl debe ser un entero mayor o igual a 0 (segundos)'
+            }), 400
+        results = sparql_service._execute_sparql_query(query, ttl=cache_ttl)
         
         return jsonify({
             'success': True,
@@ -229,6 +236,23 @@ def get_consultas_predefinidas():
         'data': consultas
     }), 200
 
+@sparql_bp.route('/cache', methods=['GET'])
+def get_cache_estadisticas():
+    """Obtener estadísticas de la caché de resultados SPARQL y el estado del endpoint"""
+    return jsonify({
+        'success': True,
+        'data': dict(sparql_service.result_cache.stats(), endpoint=sparql_service.breaker.estado)
+    }), 200
+
+@sparql_bp.route('/cache', methods=['DELETE'])
+def limpiar_cache():
+    """Vaciar la caché de resultados SPARQL"""
+    sparql_service.result_cache.clear()
+    return jsonify({
+        'success': True,
+        'message': 'Caché SPARQL vaciada exitosamente'
+    }), 200
+
 @sparql_bp.route('/general-query', methods=['GET'])
 def general_query():
     """Consulta generalizada por clase, propiedad y valor (por ID o por label)"""
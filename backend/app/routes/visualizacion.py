@@ -1,144 +1,81 @@
-from flask import Blueprint, request, jsonify
-from app.services.rdf_service import RDFService
-from app.models.models import (
-    Docente, Curso, LineaInvestigacion, PeriodoAcademico, 
-    AsignacionDocente, ProduccionAcademica, DisponibilidadHoraria
-)
-from app import db
-from sqlalchemy import func
-from SPARQLWrapper import SPARQLWrapper, JSON
+from flask import Blueprint, request, jsonify, Response
+from app.services.grafo_service import grafo_cache, node_id, NODO_PREFIJOS
+from app.services.grafo_clusters import grafo_clusters
+from app.services.estadisticas_service import estadisticas_store
 
 visualizacion_bp = Blueprint('visualizacion', __name__)
-rdf_service = RDFService()
 
-JENA_SPARQL_ENDPOINT = 'http://localhost:3030/acadontology/query'
+# Nodos devueltos por defecto (y como máximo) al expandir un cluster
+DEFAULT_EXPAND_LIMIT = 500
+MAX_EXPAND_LIMIT = 5000
+
+# Saltos y nodos permitidos en las consultas de vecindario
+MAX_HOPS = 4
+DEFAULT_VECINDARIO_NODES = 200
+MAX_VECINDARIO_NODES = 5000
 
 @visualizacion_bp.route('/grafo-completo', methods=['GET'])
 def get_grafo_completo():
-    """Obtener grafo completo de relaciones para visualización (usando la base de datos relacional)"""
+    """Obtener grafo completo de relaciones para visualización (materializado en memoria)"""
     try:
-        # Obtener todos los datos
-        docentes = Docente.query.all()
-        cursos = Curso.query.all()
-        lineas = LineaInvestigacion.query.all()
-        periodos = PeriodoAcademico.query.all()
-        asignaciones = AsignacionDocente.query.all()
-        producciones = ProduccionAcademica.query.all()
-        disponibilidades = DisponibilidadHoraria.query.all()
-        
-        # Construir nodos
-        nodes = []
-        edges = []
-        
-        # Agregar nodos de docentes
-        for docente in docentes:
-            nodes.append({
-                'id': f'docente_{docente.id}',
-                'label': docente.nombre,
-                'type': 'docente',
-                'data': {
-                    'grado_academico': docente.grado_academico,
-                    'orcid': docente.orcid,
-                    'email': docente.email
-                }
-            })
-        
-        # Agregar nodos de cursos
-        for curso in cursos:
-            nodes.append({
-                'id': f'curso_{curso.id}',
-                'label': curso.nombre,
-                'type': 'curso'
-            })
-        
-        # Agregar nodos de líneas de investigación
-        for linea in lineas:
-            nodes.append({
-                'id': f'linea_{linea.id}',
-                'label': linea.nombre,
-                'type': 'linea_investigacion'
-            })
-        
-        # Agregar nodos de períodos académicos
-        for periodo in periodos:
-            nodes.append({
-                'id': f'periodo_{periodo.id}',
-                'label': periodo.nombre,
-                'type': 'periodo_academico'
-            })
-        
-        # Agregar relaciones
-        # Docente -> Línea de investigación (muchos a muchos)
-        for docente in docentes:
-            for linea in docente.lineas_investigacion:
-                edges.append({
-                    'source': f'docente_{docente.id}',
-                    'target': f'linea_{linea.id}',
-                    'type': 'pertenece_linea'
-                })
-        # Curso -> Línea de investigación (muchos a muchos)
-        for curso in cursos:
-            for linea in curso.lineas_investigacion:
-                edges.append({
-                    'source': f'curso_{curso.id}',
-                    'target': f'linea_{linea.id}',
-                    'type': 'relacionado_linea'
-                })
-        # Asignaciones: Docente -> Curso -> Período
-        for asignacion in asignaciones:
-            edges.append({
-                'source': f'docente_{asignacion.docente_id}',
-                'target': f'curso_{asignacion.curso_id}',
-                'type': 'dicta',
-                'data': {
-                    'horas_asignadas': asignacion.horas_asignadas
-                }
-            })
-            edges.append({
-                'source': f'curso_{asignacion.curso_id}',
-                'target': f'periodo_{asignacion.periodo_id}',
-                'type': 'asignado_periodo'
-            })
-        # Producción académica: Docente -> Producción (muchos a muchos)
-        for docente in docentes:
-            for produccion in docente.producciones_academicas:
-                nodes.append({
-                    'id': f'produccion_{produccion.id}',
-                    'label': produccion.titulo[:50] + '...' if len(produccion.titulo) > 50 else produccion.titulo,
-                    'type': 'produccion_academica',
-                    'data': {
-                        'doi': produccion.doi,
-                        'revista': produccion.revista,
-                        'anio_publicacion': produccion.anio_publicacion
-                    }
-                })
-                edges.append({
-                    'source': f'docente_{docente.id}',
-                    'target': f'produccion_{produccion.id}',
-                    'type': 'tiene_produccion'
-                })
-        # Disponibilidad horaria: Docente -> Disponibilidad
-        for disponibilidad in disponibilidades:
-            nodes.append({
-                'id': f'disponibilidad_{disponibilidad.id}',
-                'label': disponibilidad.descripcion,
-                'type': 'disponibilidad_horaria',
-                'data': {
-                    'descripcion': disponibilidad.descripcion
-                }
-            })
-            edges.append({
-                'source': f'docente_{disponibilidad.docente_id}',
-                'target': f'disponibilidad_{disponibilidad.id}',
-                'type': 'tiene_disponibilidad'
-            })
+        body, etag = grafo_cache.payload()
+        response = Response(body, mimetype='application/json')
+        # El cliente siempre revalida; si el grafo no cambió recibe un 304 sin cuerpo
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@visualizacion_bp.route('/grafo-clusters', methods=['GET'])
+def get_grafo_clusters():
+    """Grafo agregado por clusters (nivel de detalle): ?por=area|linea|periodo"""
+    try:
+        por = request.args.get('por', 'area')
+        clusters, edges = grafo_clusters.clusters(por)
         return jsonify({
             'success': True,
             'data': {
-                'nodes': nodes,
+                'agrupacion': por,
+                'nodes': clusters,
                 'edges': edges
             }
         }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@visualizacion_bp.route('/grafo-clusters/<por>/<cluster_id>', methods=['GET'])
+def expandir_cluster(por, cluster_id):
+    """Expandir un cluster: sus nodos (?offset, ?limit) y sus aristas"""
+    try:
+        offset = max(0, request.args.get('offset', 0, type=int))
+        limit = max(1, min(request.args.get('limit', DEFAULT_EXPAND_LIMIT, type=int), MAX_EXPAND_LIMIT))
+        data = grafo_clusters.expandir(por, cluster_id, offset, limit)
+        if data is None:
+            return jsonify({
+                'success': False,
+                'error': 'Cluster no encontrado'
+            }), 404
+        return jsonify({
+            'success': True,
+            'data': data
+        }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -149,103 +86,21 @@ def get_grafo_completo():
 def get_grafo_docente(docente_id):
     """Obtener grafo de relaciones para un docente específico"""
     try:
-        # Verificar que el docente existe
-        docente = Docente.query.get_or_404(docente_id)
-        
-        nodes = []
-        edges = []
-        
-        # Nodo del docente
-        nodes.append({
-            'id': f'docente_{docente.id}',
-            'label': docente.nombre,
-            'type': 'docente',
-            'data': {
-                'grado_academico': docente.grado_academico,
-                'orcid': docente.orcid,
-                'correo': docente.correo
-            }
-        })
-        
-        # Línea de investigación del docente
-        if docente.linea_investigacion_id:
-            linea = LineaInvestigacion.query.get(docente.linea_investigacion_id)
-            if linea:
-                nodes.append({
-                    'id': f'linea_{linea.id}',
-                    'label': linea.nombre,
-                    'type': 'linea_investigacion'
-                })
-                edges.append({
-                    'source': f'docente_{docente.id}',
-                    'target': f'linea_{linea.id}',
-                    'type': 'pertenece_linea'
-                })
-        
-        # Cursos que dicta
-        asignaciones = AsignacionDocente.query.filter_by(docente_id=docente_id).all()
-        for asignacion in asignaciones:
-            curso = Curso.query.get(asignacion.curso_id)
-            if curso:
-                nodes.append({
-                    'id': f'curso_{curso.id}',
-                    'label': curso.nombre,
-                    'type': 'curso'
-                })
-                edges.append({
-                    'source': f'docente_{docente.id}',
-                    'target': f'curso_{curso.id}',
-                    'type': 'dicta',
-                    'data': {
-                        'horas_asignadas': asignacion.horas_asignadas
-                    }
-                })
-        
-        # Producción académica
-        producciones = ProduccionAcademica.query.filter_by(docente_id=docente_id).all()
-        for produccion in producciones:
-            nodes.append({
-                'id': f'produccion_{produccion.id}',
-                'label': produccion.titulo[:50] + '...' if len(produccion.titulo) > 50 else produccion.titulo,
-                'type': 'produccion_academica',
-                'data': {
-                    'tipo': produccion.tipo,
-                    'anio': produccion.anio,
-                    'doi': produccion.doi
-                }
-            })
-            edges.append({
-                'source': f'docente_{docente.id}',
-                'target': f'produccion_{produccion.id}',
-                'type': 'tiene_produccion'
-            })
-        
-        # Disponibilidad horaria
-        disponibilidades = DisponibilidadHoraria.query.filter_by(docente_id=docente_id).all()
-        for disponibilidad in disponibilidades:
-            nodes.append({
-                'id': f'disponibilidad_{disponibilidad.id}',
-                'label': f"{disponibilidad.dia_semana} {disponibilidad.hora_inicio}-{disponibilidad.hora_fin}",
-                'type': 'disponibilidad_horaria',
-                'data': {
-                    'dia_semana': disponibilidad.dia_semana,
-                    'hora_inicio': str(disponibilidad.hora_inicio) if disponibilidad.hora_inicio else None,
-                    'hora_fin': str(disponibilidad.hora_fin) if disponibilidad.hora_fin else None
-                }
-            })
-            edges.append({
-                'source': f'docente_{docente.id}',
-                'target': f'disponibilidad_{disponibilidad.id}',
-                'type': 'tiene_disponibilidad'
-            })
-        
+        vecindario = grafo_cache.vecindario(node_id('docentes', docente_id), hops=1, max_nodes=MAX_VECINDARIO_NODES)
+        if vecindario is None:
+            return jsonify({
+                'success': False,
+                'error': 'Docente no encontrado'
+            }), 404
+        nodes, edges, _ = vecindario
+        docente = nodes[0]
         return jsonify({
             'success': True,
             'data': {
                 'docente': {
-                    'id': docente.id,
-                    'nombre': docente.nombre,
-                    'grado_academico': docente.grado_academico
+                    'id': docente_id,
+                    'nombre': docente['label'],
+                    'grado_academico': docente['data']['grado_academico']
                 },
                 'nodes': nodes,
                 'edges': edges
@@ -258,46 +113,52 @@ def get_grafo_docente(docente_id):
             'error': str(e)
         }), 500
 
+@visualizacion_bp.route('/vecindario/<tipo>/<int:entity_id>', methods=['GET'])
+def get_vecindario(tipo, entity_id):
+    """Vecindario de k saltos de cualquier nodo: ?hops=N&max_nodes=M"""
+    try:
+        tablas = {prefijo: tabla for tabla, prefijo in NODO_PREFIJOS.items()}
+        if tipo not in tablas:
+            return jsonify({
+                'success': False,
+                'error': f"Tipo no válido: {tipo}. Opciones: {', '.join(tablas)}"
+            }), 400
+        hops = max(0, min(request.args.get('hops', 1, type=int), MAX_HOPS))
+        max_nodes = max(1, min(request.args.get('max_nodes', DEFAULT_VECINDARIO_NODES, type=int), MAX_VECINDARIO_NODES))
+        
+        vecindario = grafo_cache.vecindario(node_id(tablas[tipo], entity_id), hops, max_nodes)
+        if vecindario is None:
+            return jsonify({
+                'success': False,
+                'error': 'Nodo no encontrado'
+            }), 404
+        nodes, edges, truncated = vecindario
+        return jsonify({
+            'success': True,
+            'data': {
+                'origen': node_id(tablas[tipo], entity_id),
+                'hops': hops,
+                'nodes': nodes,
+                'edges': edges,
+                'truncated': truncated
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @visualizacion_bp.route('/estadisticas-grafo', methods=['GET'])
 def get_estadisticas_grafo():
     """Obtener estadísticas del grafo para visualización"""
     try:
-        # Contar entidades
-        total_docentes = Docente.query.count()
-        total_cursos = Curso.query.count()
-        total_lineas = LineaInvestigacion.query.count()
-        total_periodos = PeriodoAcademico.query.count()
-        total_asignaciones = AsignacionDocente.query.count()
-        total_producciones = ProduccionAcademica.query.count()
-        total_disponibilidades = DisponibilidadHoraria.query.count()
-        
-        # Estadísticas de relaciones
-        docentes_con_linea = Docente.query.filter(Docente.linea_investigacion_id.isnot(None)).count()
-        cursos_con_linea = Curso.query.filter(Curso.linea_investigacion_id.isnot(None)).count()
-        
-        # Docentes con más asignaciones
-        docentes_mas_asignaciones = db.session.query(
-            Docente.nombre,
-            func.count(AsignacionDocente.id).label('num_asignaciones')
-        ).join(
-            AsignacionDocente, Docente.id == AsignacionDocente.docente_id
-        ).group_by(
-            Docente.id, Docente.nombre
-        ).order_by(
-            func.count(AsignacionDocente.id).desc()
-        ).limit(5).all()
-        
-        # Líneas con más docentes
-        lineas_mas_docentes = db.session.query(
-            LineaInvestigacion.nombre,
-            func.count(Docente.id).label('num_docentes')
-        ).join(
-            Docente, LineaInvestigacion.id == Docente.linea_investigacion_id
-        ).group_by(
-            LineaInvestigacion.id, LineaInvestigacion.nombre
-        ).order_by(
-            func.count(Docente.id).desc()
-        ).limit(5).all()
+        estadisticas = estadisticas_store.snapshot()
+        conteos = estadisticas['conteos']
+        total_docentes = conteos['docentes']
+        total_cursos = conteos['cursos']
+        docentes_con_linea = estadisticas['docentes_con_linea']
+        cursos_con_linea = estadisticas['cursos_con_linea']
         
         return jsonify({
             'success': True,
@@ -305,11 +166,11 @@ def get_estadisticas_grafo():
                 'entidades': {
                     'total_docentes': total_docentes,
                     'total_cursos': total_cursos,
-                    'total_lineas_investigacion': total_lineas,
-                    'total_periodos_academicos': total_periodos,
-                    'total_asignaciones': total_asignaciones,
-                    'total_producciones': total_producciones,
-                    'total_disponibilidades': total_disponibilidades
+                    'total_lineas_investigacion': conteos['lineas_investigacion'],
+                    'total_periodos_academicos': conteos['periodos_academicos'],
+                    'total_asignaciones': conteos['asignaciones_docentes'],
+                    'total_producciones': conteos['producciones_academicas'],
+                    'total_disponibilidades': conteos['disponibilidades_horarias']
                 },
                 'relaciones': {
                     'docentes_con_linea': docentes_con_linea,
@@ -318,14 +179,8 @@ def get_estadisticas_grafo():
                     'porcentaje_cursos_con_linea': round((cursos_con_linea / total_cursos * 100), 2) if total_cursos > 0 else 0
                 },
                 'ranking': {
-                    'docentes_mas_asignaciones': [
-                        {'nombre': nombre, 'asignaciones': num} 
-                        for nombre, num in docentes_mas_asignaciones
-                    ],
-                    'lineas_mas_docentes': [
-                        {'nombre': nombre, 'docentes': num} 
-                        for nombre, num in lineas_mas_docentes
-                    ]
+                    'docentes_mas_asignaciones': estadisticas['docentes_mas_asignaciones'],
+                    'lineas_mas_docentes': estadisticas['lineas_mas_docentes']
                 }
             }
         }), 200
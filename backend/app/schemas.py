@@ -3,8 +3,66 @@ from app.models.models import (
     Docente, Curso, LineaInvestigacion, PeriodoAcademico, 
     AsignacionDocente, ProduccionAcademica, DisponibilidadHoraria, Area
 )
+from marshmallow import fields
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import joinedload, selectinload
+from app.utils.profiling import medir
 
-class AreaSchema(ma.SQLAlchemySchema):
+# Tamaño de los bloques de ids usados al precargar relaciones
+PREFETCH_CHUNK_SIZE = 500
+
+class EagerLoadingSchema(ma.SQLAlchemySchema):
+    """
+    Esquema base que deriva la estrategia de carga de relaciones a partir de sus
+    campos anidados: relaciones a-uno con joinedload y colecciones con selectinload,
+    recursivamente según el "only" de cada anidado.
+    dump() precarga en bloque las relaciones que aún no estén cargadas, de modo que
+    serializar N objetos cuesta un número fijo de consultas y no N consultas perezosas.
+    """
+    def loader_options(self):
+        """Opciones de carga (joinedload/selectinload) para consultar este esquema"""
+        if not hasattr(self, '_loader_options'):
+            self._loader_options = self._build_loader_options(self.opts.model, self)
+        return self._loader_options
+
+    @classmethod
+    def _build_loader_options(cls, model, schema):
+        relaciones = sa_inspect(model).relationships
+        options = []
+        for name, field in schema.fields.items():
+            if not isinstance(field, fields.Nested):
+                continue
+            relacion = relaciones.get(field.attribute or name)
+            if relacion is None:
+                continue
+            atributo = getattr(model, relacion.key)
+            option = selectinload(atributo) if relacion.uselist else joinedload(atributo)
+            sub_options = cls._build_loader_options(relacion.mapper.class_, field.schema)
+            options.append(option.options(*sub_options) if sub_options else option)
+        return options
+
+    def prefetch(self, items):
+        """Carga en bloque las relaciones anidadas de los objetos que no las tengan cargadas"""
+        model = self.opts.model
+        options = self.loader_options()
+        if not options:
+            return
+        relaciones = {field.attribute or name for name, field in self.fields.items() if isinstance(field, fields.Nested)}
+        pendientes = [
+            item.id for item in items
+            if isinstance(item, model) and relaciones & sa_inspect(item).unloaded
+        ]
+        for inicio in range(0, len(pendientes), PREFETCH_CHUNK_SIZE):
+            ids = pendientes[inicio:inicio + PREFETCH_CHUNK_SIZE]
+            model.query.filter(model.id.in_(ids)).options(*options).all()
+
+    def dump(self, obj, *, many=None):
+        many = self.many if many is None else bool(many)
+        self.prefetch(obj if many else [obj])
+        with medir('serializacion'):
+            return super().dump(obj, many=many)
+
+class AreaSchema(EagerLoadingSchema):
     class Meta:
         model = Area
         include_fk = True
@@ -12,7 +70,7 @@ class AreaSchema(ma.SQLAlchemySchema):
     nombre = ma.auto_field()
     descripcion = ma.auto_field()
 
-class LineaInvestigacionSchema(ma.SQLAlchemySchema):
+class LineaInvestigacionSchema(EagerLoadingSchema):
     class Meta:
         model = LineaInvestigacion
         include_fk = True
@@ -21,7 +79,7 @@ class LineaInvestigacionSchema(ma.SQLAlchemySchema):
     descripcion = ma.auto_field()
     area = ma.Nested(AreaSchema, only=("id", "nombre"))
 
-class CursoSchema(ma.SQLAlchemySchema):
+class CursoSchema(EagerLoadingSchema):
     class Meta:
         model = Curso
         include_fk = True
@@ -32,7 +90,7 @@ class CursoSchema(ma.SQLAlchemySchema):
     area = ma.Nested(AreaSchema, only=("id", "nombre"))
     lineas_investigacion = ma.Nested(LineaInvestigacionSchema, many=True, only=("id", "nombre"))
 
-class DocenteSchema(ma.SQLAlchemySchema):
+class DocenteSchema(EagerLoadingSchema):
     class Meta:
         model = Docente
         include_fk = True
@@ -45,7 +103,7 @@ class DocenteSchema(ma.SQLAlchemySchema):
     orcid = ma.auto_field()
     lineas_investigacion = ma.Nested(LineaInvestigacionSchema, many=True, only=("id", "nombre"))
 
-class PeriodoAcademicoSchema(ma.SQLAlchemySchema):
+class PeriodoAcademicoSchema(EagerLoadingSchema):
     class Meta:
         model = PeriodoAcademico
         include_fk = True
@@ -55,7 +113,7 @@ class PeriodoAcademicoSchema(ma.SQLAlchemySchema):
     semestre = ma.auto_field()
     descripcion = ma.auto_field()
 
-class AsignacionDocenteSchema(ma.SQLAlchemySchema):
+class AsignacionDocenteSchema(EagerLoadingSchema):
     class Meta:
         model = AsignacionDocente
         include_fk = True
@@ -66,7 +124,7 @@ class AsignacionDocenteSchema(ma.SQLAlchemySchema):
     curso = ma.Nested(CursoSchema, only=("id", "nombre", "codigo"))
     periodo_academico = ma.Nested(PeriodoAcademicoSchema, only=("id", "nombre"))
 
-class ProduccionAcademicaSchema(ma.SQLAlchemySchema):
+class ProduccionAcademicaSchema(EagerLoadingSchema):
     class Meta:
         model = ProduccionAcademica
         include_fk = True
@@ -78,7 +136,7 @@ class ProduccionAcademicaSchema(ma.SQLAlchemySchema):
     anio_publicacion = ma.auto_field()
     autores = ma.Nested(DocenteSchema, many=True, only=("id", "nombre"))
 
-class DisponibilidadHorariaSchema(ma.SQLAlchemySchema):
+class DisponibilidadHorariaSchema(EagerLoadingSchema):
     class Meta:
         model = DisponibilidadHoraria
         include_fk = True
@@ -86,6 +144,20 @@ class DisponibilidadHorariaSchema(ma.SQLAlchemySchema):
     descripcion = ma.auto_field()
     docente = ma.Nested(DocenteSchema, only=("id", "nombre"))
 
+class AsignacionPerfilSchema(EagerLoadingSchema):
+    class Meta:
+        model = AsignacionDocente
+    id = ma.auto_field()
+    curso = ma.Pluck(CursoSchema, 'nombre')
+    periodo = ma.Pluck(PeriodoAcademicoSchema, 'nombre', attribute='periodo_academico')
+    horas_asignadas = ma.auto_field()
+
+class DocentePerfilSchema(DocenteSchema):
+    """Perfil completo del docente con todas sus relaciones"""
+    asignaciones = ma.Nested(AsignacionPerfilSchema, many=True)
+    producciones_academicas = ma.Nested(ProduccionAcademicaSchema, many=True, only=("id", "titulo", "doi", "revista", "anio_publicacion"))
+    disponibilidades = ma.Nested(DisponibilidadHorariaSchema, many=True, only=("id", "descripcion"))
+
 # Instancias de esquemas
 area_schema = AreaSchema()
 areas_schema = AreaSchema(many=True)
@@ -102,4 +174,5 @@ asignaciones_docentes_schema = AsignacionDocenteSchema(many=True)
 produccion_academica_schema = ProduccionAcademicaSchema()
 producciones_academicas_schema = ProduccionAcademicaSchema(many=True)
 disponibilidad_horaria_schema = DisponibilidadHorariaSchema()
-disponibilidades_horarias_schema = DisponibilidadHorariaSchema(many=True) 
\ No newline at end of file
+disponibilidades_horarias_schema = DisponibilidadHorariaSchema(many=True) 
+docente_perfil_schema = DocentePerfilSchema()
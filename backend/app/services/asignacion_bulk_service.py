@@ -0,0 +1,148 @@
+from sqlalchemy import select, insert, update, delete
+from app.models.models import AsignacionDocente, Docente, Curso, PeriodoAcademico
+from app.utils.change_tracking import register_bulk_changes
+from app import db
+
+# Máximo de filas aceptadas en un solo lote
+MAX_FILAS_LOTE = 10000
+
+# Claves foráneas de una asignación: campo -> (modelo referenciado, mensaje de error)
+REFERENCIAS = {
+    'docente_id': (Docente, 'El docente no existe'),
+    'curso_id': (Curso, 'El curso no existe'),
+    'periodo_id': (PeriodoAcademico, 'El período académico no existe'),
+}
+CAMPOS = ('docente_id', 'curso_id', 'periodo_id', 'horas_asignadas', 'descripcion')
+OPERACIONES = ('create', 'update', 'delete')
+
+class AsignacionBulkService:
+    """
+    Altas, modificaciones y bajas de asignaciones por lotes.
+    Todas las claves foráneas del lote se validan con una consulta IN por tabla,
+    las filas válidas se escriben con una sentencia por operación (executemany)
+    y las inválidas se informan una por una sin abortar el resto del lote.
+    """
+    def procesar(self, filas):
+        """
+        filas: iterable de (indice, fila, error) con fila = {'op': 'create'|'update'|'delete', ...}.
+        Devuelve {'creadas': [ids], 'actualizadas': n, 'eliminadas': n, 'errores': [...]}.
+        """
+        errores = []
+        operaciones = {op: [] for op in OPERACIONES}
+        for indice, fila, error in filas:
+            if indice >= MAX_FILAS_LOTE:
+                raise ValueError(f'El lote supera el máximo de {MAX_FILAS_LOTE} filas')
+            if error is None:
+                fila, error = self._normalizar(fila)
+            if error:
+                errores.append({'indice': indice, 'error': error})
+            else:
+                operaciones[fila.pop('op')].append((indice, fila))
+
+        # Una consulta por tabla referenciada y otra para las asignaciones existentes
+        existentes = self._existentes(operaciones)
+        actuales = self._asignaciones_actuales(
+            [fila['id'] for _, fila in operaciones['update'] + operaciones['delete']]
+        )
+
+        creadas, actualizadas, eliminadas = [], [], []
+        for indice, fila in operaciones['create']:
+            error = self._validar_referencias(fila, existentes)
+            if error:
+                errores.append({'indice': indice, 'error': error})
+            else:
+                creadas.append((indice, fila))
+        for indice, fila in operaciones['update']:
+            if fila['id'] not in actuales:
+                errores.append({'indice': indice, 'error': 'La asignación no existe'})
+                continue
+            error = self._validar_referencias(fila, existentes)
+            if error:
+                errores.append({'indice': indice, 'error': error})
+            else:
+                actualizadas.append(fila)
+        for indice, fila in operaciones['delete']:
+            if fila['id'] not in actuales:
+                errores.append({'indice': indice, 'error': 'La asignación no existe'})
+            else:
+                eliminadas.append(fila['id'])
+
+        ids_creadas = []
+        if creadas:
+            ids_creadas = list(db.session.scalars(
+                insert(AsignacionDocente).returning(AsignacionDocente.id, sort_by_parameter_order=True),
+                [{'horas_asignadas': 0, 'descripcion': None, **fila} for _, fila in creadas]
+            ))
+        if actualizadas:
+            db.session.execute(update(AsignacionDocente), actualizadas)
+        if eliminadas:
+            db.session.execute(
+                delete(AsignacionDocente).where(AsignacionDocente.id.in_(eliminadas)),
+                execution_options={'synchronize_session': False}
+            )
+
+        register_bulk_changes(db.session,
+            [('asignaciones_docentes', entity_id, 'insert') for entity_id in ids_creadas] +
+            [('asignaciones_docentes', fila['id'], 'update') for fila in actualizadas] +
+            [('asignaciones_docentes', entity_id, 'delete') for entity_id in eliminadas]
+        )
+        db.session.commit()
+
+        errores.sort(key=lambda error: error['indice'])
+        return {
+            'creadas': [
+                {'indice': indice, 'id': entity_id}
+                for (indice, _), entity_id in zip(creadas, ids_creadas)
+            ],
+            'actualizadas': len(actualizadas),
+            'eliminadas': len(eliminadas),
+            'errores': errores
+        }
+
+    def _normalizar(self, fila):
+        """Valida la forma de una fila; devuelve (fila normalizada, error)"""
+        op = fila.get('op', 'create')
+        if op not in OPERACIONES:
+            return None, f"Operación no válida: {op}. Opciones: {', '.join(OPERACIONES)}"
+        normalizada = {'op': op}
+        try:
+            if op in ('update', 'delete'):
+                if not fila.get('id'):
+                    return None, 'El campo id es requerido'
+                normalizada['id'] = int(fila['id'])
+            if op == 'delete':
+                return normalizada, None
+            if op == 'create':
+                for field in REFERENCIAS:
+                    if not fila.get(field):
+                        return None, f'El campo {field} es requerido'
+            for field in CAMPOS:
+                if field in fila:
+                    valor = fila[field]
+                    normalizada[field] = int(valor) if field != 'descripcion' and valor is not None else valor
+        except (TypeError, ValueError):
+            return None, 'Los campos id, docente_id, curso_id, periodo_id y horas_asignadas deben ser enteros'
+        if op == 'update' and len(normalizada) == 2:
+            return None, 'No hay campos para actualizar'
+        if normalizada.get('horas_asignadas') is None and 'horas_asignadas' in normalizada:
+            return None, 'El campo horas_asignadas no puede ser nulo'
+        return normalizada, None
+
+    def _existentes(self, operaciones):
+        """{campo: ids existentes} con una consulta IN por tabla referenciada"""
+        existentes = {}
+        for field, (modelo, _) in REFERENCIAS.items():
+            ids = {fila[field] for op in ('create', 'update') for _, fila in operaciones[op] if fila.get(field)}
+            existentes[field] = set(db.session.scalars(select(modelo.id).where(modelo.id.in_(ids)))) if ids else set()
+        return existentes
+
+    def _asignaciones_actuales(self, ids):
+        if not ids:
+            return set()
+        return set(db.session.scalars(select(AsignacionDocente.id).where(AsignacionDocente.id.in_(set(ids)))))
+
+    def _validar_referencias(self, fila, existentes):
+        for field, (_, mensaje) in REFERENCIAS.items():
+            if field in fila and fila[field] not in existentes[field]:
+                return mensaje
+        return None
@@ -0,0 +1,153 @@
+import bisect
+import threading
+from sqlalchemy import select
+from app.models.models import Docente, Curso, LineaInvestigacion, PeriodoAcademico, Area
+from app.services.busqueda_service import normalizar
+from app import db
+
+# Tipos de autocompletado: tabla, modelo y columnas que se devuelven (las de texto se indexan)
+TIPOS_AUTOCOMPLETE = {
+    'docentes': ('docentes', Docente, ('nombre',)),
+    'cursos': ('cursos', Curso, ('nombre', 'codigo')),
+    'lineas': ('lineas_investigacion', LineaInvestigacion, ('nombre',)),
+    'periodos': ('periodos_academicos', PeriodoAcademico, ('nombre',)),
+    'areas': ('areas', Area, ('nombre',)),
+}
+TIPO_POR_TABLA = {tabla: tipo for tipo, (tabla, _, _) in TIPOS_AUTOCOMPLETE.items()}
+
+class _Prefijos:
+    """
+    Arrays ordenados de (clave normalizada, id) de un tipo.
+    inicios tiene el texto completo de cada campo ("juan perez") y palabras el texto
+    desde cada palabra siguiente ("perez"): un prefijo se resuelve con dos bisect
+    y las coincidencias desde el inicio del nombre se devuelven primero.
+    """
+    def __init__(self):
+        self.inicios = []
+        self.palabras = []
+        self.etiquetas = {}
+        self._claves = {}
+
+    @staticmethod
+    def _claves_de(entity_id, etiqueta):
+        inicios, palabras = set(), set()
+        for valor in etiqueta.values():
+            texto = normalizar(valor) if isinstance(valor, str) else ''
+            if not texto:
+                continue
+            inicios.add((texto, entity_id))
+            partes = texto.split(' ')
+            palabras.update((' '.join(partes[i:]), entity_id) for i in range(1, len(partes)))
+        return inicios, palabras - inicios
+
+    def cargar(self, etiquetas):
+        """Carga inicial: se ordena una sola vez"""
+        for entity_id, etiqueta in etiquetas.items():
+            inicios, palabras = self._claves_de(entity_id, etiqueta)
+            self.inicios.extend(inicios)
+            self.palabras.extend(palabras)
+            self.etiquetas[entity_id] = etiqueta
+            self._claves[entity_id] = (inicios, palabras)
+        self.inicios.sort()
+        self.palabras.sort()
+
+    def guardar(self, entity_id, etiqueta):
+        self.quitar(entity_id)
+        inicios, palabras = self._claves_de(entity_id, etiqueta)
+        for clave in inicios:
+            bisect.insort(self.inicios, clave)
+        for clave in palabras:
+            bisect.insort(self.palabras, clave)
+        self.etiquetas[entity_id] = etiqueta
+        self._claves[entity_id] = (inicios, palabras)
+
+    def quitar(self, entity_id):
+        claves = self._claves.pop(entity_id, None)
+        if claves is None:
+            return
+        for lista, propias in zip((self.inicios, self.palabras), claves):
+            for clave in propias:
+                del lista[bisect.bisect_left(lista, clave)]
+        del self.etiquetas[entity_id]
+
+    def buscar(self, prefijo, k):
+        encontrados = []
+        vistos = set()
+        for lista in (self.inicios, self.palabras):
+            posicion = bisect.bisect_left(lista, (prefijo,))
+            while posicion < len(lista) and len(encontrados) < k:
+                clave, entity_id = lista[posicion]
+                if not clave.startswith(prefijo):
+                    break
+                if entity_id not in vistos:
+                    vistos.add(entity_id)
+                    encontrados.append(self.etiquetas[entity_id])
+                posicion += 1
+        return encontrados
+
+class AutocompleteIndex:
+    """
+    Índice de prefijos en memoria para el autocompletado de docentes, cursos, líneas,
+    períodos y áreas. Se construye al iniciar el servidor (o en la primera consulta),
+    responde sin consultar la base de datos y se mantiene con los cambios confirmados.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tipos = None
+
+    @property
+    def is_warm(self):
+        return self._tipos is not None
+
+    def _leer_etiquetas(self, tipo, ids=None):
+        _, modelo, columnas = TIPOS_AUTOCOMPLETE[tipo]
+        statement = select(modelo.id, *[getattr(modelo, columna) for columna in columnas])
+        if ids is not None:
+            statement = statement.where(modelo.id.in_(ids))
+        return {
+            fila[0]: {'id': fila[0], **dict(zip(columnas, fila[1:]))}
+            for fila in db.session.execute(statement)
+        }
+
+    def rebuild(self):
+        """Construye los índices de todos los tipos desde la base de datos"""
+        tipos = {}
+        for tipo in TIPOS_AUTOCOMPLETE:
+            tipos[tipo] = _Prefijos()
+            tipos[tipo].cargar(self._leer_etiquetas(tipo))
+        with self._lock:
+            self._tipos = tipos
+
+    def buscar(self, tipo, texto, k):
+        """Hasta k entidades del tipo cuyo nombre (o una de sus palabras, o el código) empieza por texto"""
+        if self._tipos is None:
+            self.rebuild()
+        prefijo = normalizar(texto)
+        with self._lock:
+            return self._tipos[tipo].buscar(prefijo, k)
+
+    def preparar(self, session, cambios):
+        if self._tipos is None:
+            return None
+        ids_por_tipo = {}
+        for tabla, entity_id, _ in cambios:
+            tipo = TIPO_POR_TABLA.get(tabla)
+            if tipo is not None:
+                ids_por_tipo.setdefault(tipo, set()).add(entity_id)
+        if not ids_por_tipo:
+            return None
+        return {tipo: (ids, self._leer_etiquetas(tipo, ids)) for tipo, ids in ids_por_tipo.items()}
+
+    def aplicar(self, payload):
+        with self._lock:
+            if self._tipos is None:
+                return
+            for tipo, (ids, etiquetas) in payload.items():
+                prefijos = self._tipos[tipo]
+                for entity_id in ids:
+                    if entity_id in etiquetas:
+                        prefijos.guardar(entity_id, etiquetas[entity_id])
+                    else:
+                        prefijos.quitar(entity_id)
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,415 @@
+import bisect
+import re
+import threading
+import time
+import unicodedata
+import numpy as np
+from sqlalchemy import select, text, func, or_
+from app.models.models import MODELOS_POR_TABLA
+from app import db
+
+# Campos de texto indexados por tabla; el primero de cada tabla pesa más en el ranking
+CAMPOS_BUSQUEDA = {
+    'docentes': ('nombre', 'especialidad', 'grado_academico'),
+    'cursos': ('nombre', 'codigo'),
+    'areas': ('nombre', 'descripcion'),
+    'lineas_investigacion': ('nombre', 'descripcion'),
+    'periodos_academicos': ('nombre', 'descripcion'),
+    'producciones_academicas': ('titulo', 'revista'),
+    'disponibilidades_horarias': ('descripcion',),
+}
+PESO_CAMPO_PRINCIPAL = 2.0
+PESO_CAMPO = 1.0
+# Puntaje según dónde coincide la palabra: al inicio del campo, al inicio de una palabra o en medio
+PUNTAJE_INICIO_CAMPO = 3
+PUNTAJE_INICIO_PALABRA = 2
+PUNTAJE_SUBCADENA = 1
+
+CAPACIDAD_INICIAL = 1024
+
+# Objetos de PostgreSQL para la búsqueda con pg_trgm (índices GIN sobre el texto normalizado)
+FUNCION_NORMALIZAR_PG = 'busqueda_normalizar'
+SENTENCIAS_PG = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE EXTENSION IF NOT EXISTS unaccent',
+    # unaccent() no es IMMUTABLE: se envuelve para poder usarla en un índice de expresión
+    f"""CREATE OR REPLACE FUNCTION {FUNCION_NORMALIZAR_PG}(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, $1)) $$""",
+]
+# Índices GIN de trigramas por campo: {nombre: (tabla, campo)}
+INDICES_PG = {
+    f'ix_{tabla}_{campo}_trgm': (tabla, campo)
+    for tabla, campos in CAMPOS_BUSQUEDA.items() for campo in campos
+}
+# Segundos entre comprobaciones del catálogo mientras falten índices
+INTERVALO_DETECCION = 60
+
+_NO_ALFANUMERICO = re.compile(r'[\W_]+')
+
+def normalizar(texto):
+    """Minúsculas, sin tildes ni diéresis (también ñ → n) y sin signos de puntuación"""
+    if not texto:
+        return ''
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    sin_marcas = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(' ', sin_marcas.casefold()).strip()
+
+def _trigramas(palabra):
+    return {palabra[i:i + 3] for i in range(len(palabra) - 2)}
+
+class _Apariciones:
+    """Lista de apariciones de una palabra: (fila, versión de la fila, campo * 2 + es_primera_palabra)"""
+    def __init__(self):
+        self.filas = np.empty(4, dtype=np.int32)
+        self.versiones = np.empty(4, dtype=np.int32)
+        self.codigos = np.empty(4, dtype=np.int8)
+        self.n = 0
+        self.obsoletas = 0
+
+    def agregar(self, fila, version, codigo):
+        if self.n == len(self.filas):
+            capacidad = len(self.filas) * 2
+            self.filas = np.resize(self.filas, capacidad)
+            self.versiones = np.resize(self.versiones, capacidad)
+            self.codigos = np.resize(self.codigos, capacidad)
+        self.filas[self.n] = fila
+        self.versiones[self.n] = version
+        self.codigos[self.n] = codigo
+        self.n += 1
+
+    def compactar(self, versiones_actuales):
+        vigentes = self.versiones[:self.n] == versiones_actuales[self.filas[:self.n]]
+        self.filas = self.filas[:self.n][vigentes]
+        self.versiones = self.versiones[:self.n][vigentes]
+        self.codigos = self.codigos[:self.n][vigentes]
+        self.n = len(self.filas)
+        self.obsoletas = 0
+
+class _IndiceTabla:
+    """
+    Índice invertido de una tabla: cada palabra del texto normalizado apunta a sus apariciones.
+    Las palabras de la consulta se resuelven sobre el vocabulario (por prefijo con bisect,
+    o como subcadena con un índice de trigramas del vocabulario) y el ranking se calcula
+    con numpy sobre las apariciones, sin recorrer las filas en Python.
+    Cada fila del índice tiene una versión: al modificar o borrar una entidad sus apariciones
+    anteriores quedan obsoletas y se descartan al consultar (y se compactan cuando son mayoría).
+    """
+    def __init__(self, n_campos, capacidad=CAPACIDAD_INICIAL):
+        self.textos = {}
+        self.pesos = np.array([PESO_CAMPO_PRINCIPAL] + [PESO_CAMPO] * (n_campos - 1))
+        self.ids = np.zeros(capacidad, dtype=np.int64)
+        self.versiones = np.zeros(capacidad, dtype=np.int32)
+        self.longitudes = np.ones((n_campos, capacidad))
+        self._fila_de = {}
+        self._libres = []
+        self._siguiente = 0
+        self.apariciones = {}
+        self.vocabulario = []
+        self.trigramas = {}
+
+    def _nueva_fila(self):
+        if self._libres:
+            return self._libres.pop()
+        if self._siguiente == len(self.ids):
+            capacidad = len(self.ids) * 2
+            self.ids = np.resize(self.ids, capacidad)
+            self.versiones = np.resize(self.versiones, capacidad)
+            longitudes = np.ones((len(self.longitudes), capacidad))
+            longitudes[:, :self._siguiente] = self.longitudes
+            self.longitudes = longitudes
+            self.versiones[self._siguiente:] = 0
+        fila = self._siguiente
+        self._siguiente += 1
+        return fila
+
+    def agregar(self, entity_id, textos):
+        self.quitar(entity_id)
+        fila = self._nueva_fila()
+        self._fila_de[entity_id] = fila
+        self.textos[entity_id] = textos
+        self.ids[fila] = entity_id
+        version = self.versiones[fila]
+        codigos = {}
+        for campo, texto in enumerate(textos):
+            self.longitudes[campo, fila] = max(len(texto), 1)
+            for posicion, palabra in enumerate(texto.split()):
+                codigo = campo * 2 + (posicion == 0)
+                codigos.setdefault(palabra, set()).add(codigo)
+        for palabra, codigos_palabra in codigos.items():
+            apariciones = self.apariciones.get(palabra)
+            if apariciones is None:
+                apariciones = self.apariciones[palabra] = _Apariciones()
+                bisect.insort(self.vocabulario, palabra)
+                for trigrama in _trigramas(palabra):
+                    self.trigramas.setdefault(trigrama, set()).add(palabra)
+            for codigo in codigos_palabra:
+                apariciones.agregar(fila, version, codigo)
+
+    def quitar(self, entity_id):
+        textos = self.textos.pop(entity_id, None)
+        if textos is None:
+            return
+        fila = self._fila_de.pop(entity_id)
+        self.versiones[fila] += 1
+        self._libres.append(fila)
+        for palabra in set(' '.join(textos).split()):
+            apariciones = self.apariciones[palabra]
+            apariciones.obsoletas += 1
+            if apariciones.obsoletas * 2 > apariciones.n:
+                apariciones.compactar(self.versiones)
+                if not apariciones.n:
+                    self._quitar_palabra(palabra)
+
+    def _quitar_palabra(self, palabra):
+        del self.apariciones[palabra]
+        del self.vocabulario[bisect.bisect_left(self.vocabulario, palabra)]
+        for trigrama in _trigramas(palabra):
+            palabras = self.trigramas[trigrama]
+            palabras.discard(palabra)
+            if not palabras:
+                del self.trigramas[trigrama]
+
+    def _palabras_que_contienen(self, palabra):
+        """Palabras del vocabulario que contienen la dada (las de 1-2 letras, solo como prefijo)"""
+        if len(palabra) < 3:
+            inicio = bisect.bisect_left(self.vocabulario, palabra)
+            fin = bisect.bisect_left(self.vocabulario, palabra + '\uffff')
+            return self.vocabulario[inicio:fin]
+        candidatas = None
+        for trigrama in _trigramas(palabra):
+            palabras = self.trigramas.get(trigrama)
+            if not palabras:
+                return []
+            if candidatas is None or len(palabras) < len(candidatas):
+                candidatas = palabras
+        return [candidata for candidata in candidatas if palabra in candidata]
+
+    def _puntajes_palabra(self, palabra, campos):
+        """Mejor puntaje de la palabra por fila (0 donde no aparece)"""
+        puntajes = np.zeros(self._siguiente)
+        grupos = [(self.apariciones[v], v.startswith(palabra)) for v in self._palabras_que_contienen(palabra)]
+        if not grupos:
+            return puntajes
+        filas = np.concatenate([a.filas[:a.n] for a, _ in grupos])
+        versiones = np.concatenate([a.versiones[:a.n] for a, _ in grupos])
+        codigos = np.concatenate([a.codigos[:a.n] for a, _ in grupos])
+        prefijo = np.repeat([es_prefijo for _, es_prefijo in grupos], [a.n for a, _ in grupos])
+
+        campo = codigos >> 1
+        vigentes = versiones == self.versiones[filas]
+        if len(campos) < len(self.pesos):
+            vigentes &= np.isin(campo, campos)
+        filas, campo, prefijo, primera = filas[vigentes], campo[vigentes], prefijo[vigentes], (codigos[vigentes] & 1) == 1
+
+        posicion = np.where(prefijo, np.where(primera, PUNTAJE_INICIO_CAMPO, PUNTAJE_INICIO_PALABRA), PUNTAJE_SUBCADENA)
+        puntaje = self.pesos[campo] * posicion + len(palabra) / self.longitudes[campo, filas]
+        np.maximum.at(puntajes, filas, puntaje)
+        return puntajes
+
+    def buscar(self, restricciones, ids=None, limit=None):
+        """
+        Filas que contienen todas las palabras de las restricciones ([(índices de campo o None, palabras)]),
+        cada una en alguno de sus campos. Devuelve (ids ordenados por relevancia, hasta limit; total).
+        """
+        total = np.zeros(self._siguiente)
+        coinciden = np.ones(self._siguiente, dtype=bool)
+        if ids is not None:
+            coinciden[:] = False
+            coinciden[[self._fila_de[i] for i in ids if i in self._fila_de]] = True
+        for campos, palabras in restricciones:
+            for palabra in palabras:
+                puntajes = self._puntajes_palabra(palabra, campos)
+                coinciden &= puntajes > 0
+                total += puntajes
+
+        filas = np.flatnonzero(coinciden)
+        puntajes = total[filas]
+        if limit is not None and limit < len(filas):
+            mejores = np.argpartition(-puntajes, limit - 1)[:limit]
+        else:
+            mejores = np.arange(len(filas))
+        # A igual puntaje, primero el id menor
+        ids_mejores = self.ids[filas[mejores]]
+        orden = np.lexsort((ids_mejores, -puntajes[mejores]))
+        return ids_mejores[orden].tolist(), len(filas)
+
+class IndiceBusqueda:
+    """
+    Índice de búsqueda en memoria (trigramas de los campos de CAMPOS_BUSQUEDA, sin tildes).
+    Se construye por tabla en la primera búsqueda y se mantiene con los cambios confirmados.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tablas = {}
+
+    @property
+    def is_warm(self):
+        return bool(self._tablas)
+
+    def _leer_textos(self, tabla, ids=None):
+        modelo = MODELOS_POR_TABLA[tabla]
+        statement = select(modelo.id, *[getattr(modelo, campo) for campo in CAMPOS_BUSQUEDA[tabla]])
+        if ids is not None:
+            statement = statement.where(modelo.id.in_(ids))
+        return {fila[0]: tuple(normalizar(valor) for valor in fila[1:]) for fila in db.session.execute(statement)}
+
+    def rebuild(self, tabla):
+        """Construye el índice de una tabla desde la base de datos"""
+        textos = self._leer_textos(tabla)
+        indice = _IndiceTabla(len(CAMPOS_BUSQUEDA[tabla]), max(CAPACIDAD_INICIAL, len(textos)))
+        for entity_id, valores in textos.items():
+            indice.agregar(entity_id, valores)
+        with self._lock:
+            self._tablas[tabla] = indice
+
+    def buscar(self, tabla, restricciones, ids=None, limit=None):
+        """Devuelve (ids ordenados por relevancia, hasta limit; total de coincidencias)"""
+        with self._lock:
+            if tabla not in self._tablas:
+                self.rebuild(tabla)
+            return self._tablas[tabla].buscar(restricciones, ids, limit)
+
+    def preparar(self, session, cambios):
+        """Lee el texto actual de las filas modificadas en las tablas ya indexadas"""
+        with self._lock:
+            indexadas = set(self._tablas)
+        ids_por_tabla = {}
+        for tabla, entity_id, _ in cambios:
+            if tabla in indexadas:
+                ids_por_tabla.setdefault(tabla, set()).add(entity_id)
+        if not ids_por_tabla:
+            return None
+        return {tabla: (ids, self._leer_textos(tabla, ids)) for tabla, ids in ids_por_tabla.items()}
+
+    def aplicar(self, payload):
+        with self._lock:
+            for tabla, (ids, textos) in payload.items():
+                indice = self._tablas.get(tabla)
+                if indice is None:
+                    continue
+                for entity_id in ids:
+                    if entity_id in textos:
+                        indice.agregar(entity_id, textos[entity_id])
+                    else:
+                        indice.quitar(entity_id)
+
+indice_busqueda = IndiceBusqueda()
+
+class BusquedaService:
+    """
+    Búsqueda de texto de los endpoints /buscar.
+    En PostgreSQL usa pg_trgm con índices GIN sobre el texto sin tildes (creados por
+    init_db.py); mientras no existan, o con otra base de datos, usa el índice en memoria.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._motores = {}
+
+    def motor(self):
+        """
+        'postgresql' si la base de datos tiene la función de normalización y todos los índices
+        de trigramas, o 'memoria'. Solo consulta el catálogo (nunca ejecuta DDL) y, mientras
+        falten índices, vuelve a comprobarlo cada INTERVALO_DETECCION segundos.
+        """
+        url = str(db.engine.url)
+        with self._lock:
+            motor, comprobado = self._motores.get(url, (None, 0.0))
+            if motor == 'postgresql' or (motor is not None and time.monotonic() - comprobado < INTERVALO_DETECCION):
+                return motor
+            nuevo = 'memoria'
+            if db.engine.dialect.name == 'postgresql':
+                with db.engine.connect() as connection:
+                    faltantes = self.indices_faltantes(connection)
+                if not faltantes:
+                    nuevo = 'postgresql'
+                elif motor is None:
+                    print(f"Búsqueda: faltan {len(faltantes)} índices de trigramas, se usa el índice en memoria "
+                          f"(se crean con: python init_db.py --solo-indices)")
+            self._motores[url] = (nuevo, time.monotonic())
+            return nuevo
+
+    def indices_faltantes(self, connection):
+        """Índices de trigramas que no existen o quedaron inválidos (todos, si falta la función)"""
+        if connection.execute(text(f"SELECT to_regprocedure('{FUNCION_NORMALIZAR_PG}(text)')")).scalar() is None:
+            return sorted(INDICES_PG)
+        validos = set(connection.execute(text(
+            'SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+            'WHERE i.indisvalid AND c.relname = ANY(:nombres)'
+        ), {'nombres': list(INDICES_PG)}).scalars())
+        return sorted(set(INDICES_PG) - validos)
+
+    def crear_indices_postgres(self):
+        """
+        Crea las extensiones, la función de normalización y los índices GIN de trigramas que falten.
+        Los índices se crean con CREATE INDEX CONCURRENTLY para no bloquear las escrituras; se
+        ejecuta desde init_db.py, nunca durante una petición. Devuelve los índices creados.
+        """
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            for sentencia in SENTENCIAS_PG:
+                connection.execute(text(sentencia))
+            faltantes = self.indices_faltantes(connection)
+            for nombre in faltantes:
+                tabla, campo = INDICES_PG[nombre]
+                # Un CREATE INDEX CONCURRENTLY interrumpido deja un índice inválido: se reemplaza
+                connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {nombre}'))
+                connection.execute(text(
+                    f'CREATE INDEX CONCURRENTLY {nombre} ON {tabla} '
+                    f'USING gin ({FUNCION_NORMALIZAR_PG}({campo}) gin_trgm_ops)'
+                ))
+        with self._lock:
+            self._motores.pop(str(db.engine.url), None)
+        return faltantes
+
+    def buscar(self, query, textos, limit, loader_options=()):
+        """
+        Aplica la búsqueda de texto a una consulta de entidades (que puede traer otros filtros).
+        textos: {campo: texto}, con campo None para buscar en todos los campos indexados.
+        Devuelve (entidades ordenadas por relevancia, hasta limit; total de coincidencias).
+        """
+        model = query.column_descriptions[0]['entity']
+        tabla = model.__tablename__
+        campos = CAMPOS_BUSQUEDA[tabla]
+        restricciones = []
+        for campo, texto in textos.items():
+            palabras = normalizar(texto).split()
+            if palabras:
+                indices = tuple(range(len(campos))) if campo is None else (campos.index(campo),)
+                restricciones.append((indices, palabras))
+        if not restricciones:
+            rows = query.options(*loader_options).order_by(model.id).limit(limit).all()
+            return rows, query.order_by(None).count()
+
+        if self.motor() == 'postgresql':
+            return self._buscar_postgres(query, model, campos, restricciones, limit, loader_options)
+
+        ids = None
+        if query.whereclause is not None:
+            # Otros filtros: la búsqueda solo considera las filas que los cumplen
+            ids = {fila[0] for fila in query.with_entities(model.id).order_by(None)}
+        ranking, total = indice_busqueda.buscar(tabla, restricciones, ids, limit)
+        if not ranking:
+            return [], total
+        rows = model.query.options(*loader_options).filter(model.id.in_(ranking)).all()
+        orden = {entity_id: posicion for posicion, entity_id in enumerate(ranking)}
+        rows.sort(key=lambda row: orden[row.id])
+        return rows, total
+
+    def _buscar_postgres(self, query, model, campos, restricciones, limit, loader_options):
+        """LIKE sobre el texto normalizado (resuelto con los índices GIN) y ranking con word_similarity"""
+        puntaje = 0
+        for indices, palabras in restricciones:
+            normalizar_pg = getattr(func, FUNCION_NORMALIZAR_PG)
+            columnas = [normalizar_pg(getattr(model, campos[indice])) for indice in indices]
+            for palabra in palabras:
+                patrones = [f'%{palabra}%'] if len(palabra) >= 3 else [f'{palabra}%', f'% {palabra}%']
+                query = query.filter(or_(*[columna.like(patron) for columna in columnas for patron in patrones]))
+            consulta = ' '.join(palabras)
+            for indice, columna in zip(indices, columnas):
+                peso = PESO_CAMPO_PRINCIPAL if indice == 0 else PESO_CAMPO
+                puntaje = puntaje + peso * func.coalesce(func.word_similarity(consulta, columna), 0)
+        total = query.order_by(None).count()
+        rows = query.options(*loader_options).order_by(puntaje.desc(), model.id).limit(limit).all()
+        return rows, total
+
+busqueda_service = BusquedaService()
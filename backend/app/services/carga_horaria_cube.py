@@ -0,0 +1,327 @@
+import threading
+import numpy as np
+from sqlalchemy import select
+from app.models.models import (
+    Area, Curso, Docente, LineaInvestigacion, PeriodoAcademico, AsignacionDocente,
+    cursos_lineas_investigacion
+)
+from app import db
+
+# Dimensiones del cubo y la tabla de la que sale la etiqueta de cada una
+DIMENSIONES = ('docente', 'periodo', 'curso', 'area', 'linea')
+TABLAS_DIMENSION = {
+    'docentes': 'docente',
+    'periodos_academicos': 'periodo',
+    'cursos': 'curso',
+    'areas': 'area',
+    'lineas_investigacion': 'linea',
+}
+MODELOS_DIMENSION = {
+    'docente': Docente,
+    'periodo': PeriodoAcademico,
+    'curso': Curso,
+    'area': Area,
+    'linea': LineaInvestigacion,
+}
+# Valor usado en las columnas para "sin valor" (p. ej. un curso sin área)
+SIN_VALOR = -1
+CAPACIDAD_INICIAL = 1024
+
+class CargaHorariaCube:
+    """
+    Cubo OLAP en memoria de la carga horaria (hechos = asignaciones docentes).
+    Las asignaciones se guardan en columnas de NumPy (docente, período, curso,
+    área, horas); la dimensión línea es multivaluada y se resuelve con un puente
+    curso -> líneas, así una asignación suma sus horas en cada línea de su curso.
+    Las agrupaciones combinan las columnas pedidas en una sola clave entera y
+    suman con bincount, sin consultar la base de datos. Las asignaciones,
+    cursos y etiquetas se actualizan con cada transacción confirmada.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._warm = False
+        self._reset(CAPACIDAD_INICIAL)
+
+    def _reset(self, capacidad):
+        self._columnas = {
+            'docente': np.full(capacidad, SIN_VALOR, dtype=np.int64),
+            'periodo': np.full(capacidad, SIN_VALOR, dtype=np.int64),
+            'curso': np.full(capacidad, SIN_VALOR, dtype=np.int64),
+            'area': np.full(capacidad, SIN_VALOR, dtype=np.int64),
+            'horas': np.zeros(capacidad, dtype=np.int64),
+        }
+        self._activa = np.zeros(capacidad, dtype=bool)
+        self._fila_de = {}
+        self._libres = []
+        self._siguiente = 0
+        self._cursos = {}
+        self._puente_cache = None
+        self._etiquetas = {dimension: {} for dimension in DIMENSIONES}
+
+    @property
+    def is_warm(self):
+        return self._warm
+
+    def rebuild(self):
+        """Carga todas las asignaciones, cursos y etiquetas desde la base de datos"""
+        asignaciones = db.session.execute(select(
+            AsignacionDocente.id, AsignacionDocente.docente_id, AsignacionDocente.periodo_id,
+            AsignacionDocente.curso_id, AsignacionDocente.horas_asignadas
+        )).all()
+        cursos = self._leer_cursos(None)
+        etiquetas = self._leer_etiquetas(None)
+        with self._lock:
+            self._reset(max(CAPACIDAD_INICIAL, len(asignaciones)))
+            self._cursos = cursos
+            self._etiquetas = etiquetas
+            for fila in asignaciones:
+                self._guardar_asignacion(fila.id, fila[1:])
+            self._warm = True
+
+    def _leer_cursos(self, ids):
+        """{curso_id: (area_id, frozenset(lineas))}"""
+        statement = select(Curso.id, Curso.area_id)
+        lineas = select(cursos_lineas_investigacion.c.curso_id, cursos_lineas_investigacion.c.linea_investigacion_id)
+        if ids is not None:
+            statement = statement.where(Curso.id.in_(ids))
+            lineas = lineas.where(cursos_lineas_investigacion.c.curso_id.in_(ids))
+        lineas_por_curso = {}
+        for curso_id, linea_id in db.session.execute(lineas):
+            lineas_por_curso.setdefault(curso_id, set()).add(linea_id)
+        return {
+            curso_id: (area_id, frozenset(lineas_por_curso.get(curso_id, ())))
+            for curso_id, area_id in db.session.execute(statement)
+        }
+
+    def _leer_etiquetas(self, ids_por_dimension):
+        """{dimension: {id: nombre}} de las dimensiones indicadas (o todas)"""
+        etiquetas = {}
+        for dimension, modelo in MODELOS_DIMENSION.items():
+            statement = select(modelo.id, modelo.nombre)
+            if ids_por_dimension is not None:
+                ids = ids_por_dimension.get(dimension)
+                if not ids:
+                    continue
+                statement = statement.where(modelo.id.in_(ids))
+            etiquetas[dimension] = dict(db.session.execute(statement).all())
+        return etiquetas
+
+    def _guardar_asignacion(self, asignacion_id, valores):
+        docente_id, periodo_id, curso_id, horas = valores
+        fila = self._fila_de.get(asignacion_id)
+        if fila is None:
+            fila = self._nueva_fila()
+            self._fila_de[asignacion_id] = fila
+        area_id = self._cursos.get(curso_id, (None, None))[0]
+        self._columnas['docente'][fila] = docente_id
+        self._columnas['periodo'][fila] = periodo_id
+        self._columnas['curso'][fila] = curso_id
+        self._columnas['area'][fila] = SIN_VALOR if area_id is None else area_id
+        self._columnas['horas'][fila] = horas or 0
+        self._activa[fila] = True
+
+    def _nueva_fila(self):
+        if self._libres:
+            return self._libres.pop()
+        if self._siguiente == len(self._activa):
+            # Duplicar la capacidad de todas las columnas
+            capacidad = len(self._activa) * 2
+            for nombre, columna in self._columnas.items():
+                nueva = np.full(capacidad, SIN_VALOR if nombre != 'horas' else 0, dtype=columna.dtype)
+                nueva[:len(columna)] = columna
+                self._columnas[nombre] = nueva
+            activa = np.zeros(capacidad, dtype=bool)
+            activa[:len(self._activa)] = self._activa
+            self._activa = activa
+        fila = self._siguiente
+        self._siguiente += 1
+        return fila
+
+    def _eliminar_asignacion(self, asignacion_id):
+        fila = self._fila_de.pop(asignacion_id, None)
+        if fila is not None:
+            self._activa[fila] = False
+            self._libres.append(fila)
+
+    def agrupar(self, dimensiones, filtros=None):
+        """
+        Suma de horas y cantidad de asignaciones agrupadas por las dimensiones dadas.
+        filtros ({dimension: [ids]}) recorta el cubo antes de agrupar (slice/dice).
+        """
+        self._validar(dimensiones, filtros)
+        with self._lock:
+            if not self._warm:
+                self.rebuild()
+            columnas, horas = self._hechos(dimensiones, filtros or {})
+            return self._agrupar(dimensiones, columnas, horas)
+
+    def rollup(self, dimensiones, filtros=None):
+        """Agrupaciones por cada prefijo de dimensiones (de la más detallada al total general)"""
+        self._validar(dimensiones, filtros)
+        with self._lock:
+            if not self._warm:
+                self.rebuild()
+            columnas, horas = self._hechos(dimensiones, filtros or {})
+            niveles = []
+            for nivel in range(len(dimensiones), -1, -1):
+                niveles.append({
+                    'dimensiones': list(dimensiones[:nivel]),
+                    'filas': self._agrupar(dimensiones[:nivel], columnas, horas)
+                })
+            return niveles
+
+    def _validar(self, dimensiones, filtros):
+        invalidas = [dimension for dimension in list(dimensiones) + list(filtros or {}) if dimension not in DIMENSIONES]
+        if invalidas:
+            raise ValueError(f"Dimensiones no válidas: {', '.join(invalidas)}. Opciones: {', '.join(DIMENSIONES)}")
+
+    def _hechos(self, dimensiones, filtros):
+        """Columnas de los hechos activos que pasan los filtros (expandidas por línea si hace falta)"""
+        filas = np.flatnonzero(self._activa[:self._siguiente])
+        columnas = {nombre: columna[filas] for nombre, columna in self._columnas.items()}
+        if 'linea' in dimensiones or 'linea' in filtros:
+            columnas = self._expandir_lineas(columnas)
+        mascara = np.ones(len(columnas['horas']), dtype=bool)
+        for dimension, valores in filtros.items():
+            mascara &= np.isin(columnas[dimension], np.asarray(list(valores), dtype=np.int64))
+        return {dimension: columnas[dimension][mascara] for dimension in dimensiones}, columnas['horas'][mascara]
+
+    def _expandir_lineas(self, columnas):
+        """Repite cada hecho una vez por cada línea de su curso (puente curso -> líneas)"""
+        puente_curso, puente_linea = self._puente()
+        inicio = np.searchsorted(puente_curso, columnas['curso'], side='left')
+        fin = np.searchsorted(puente_curso, columnas['curso'], side='right')
+        repeticiones = np.maximum(fin - inicio, 1)
+        expandidas = {nombre: np.repeat(columna, repeticiones) for nombre, columna in columnas.items()}
+        if len(puente_linea) == 0:
+            expandidas['linea'] = np.full(len(expandidas['horas']), SIN_VALOR, dtype=np.int64)
+            return expandidas
+
+        # Posición en el puente de cada copia: inicio del curso + índice de la copia
+        desplazamiento = np.arange(len(expandidas['horas'])) - np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+        posicion = np.minimum(np.repeat(inicio, repeticiones) + desplazamiento, len(puente_linea) - 1)
+        expandidas['linea'] = np.where(np.repeat(fin > inicio, repeticiones), puente_linea[posicion], SIN_VALOR)
+        return expandidas
+
+    def _puente(self):
+        """Pares (curso, línea) ordenados por curso; se regenera solo cuando cambian los cursos"""
+        if self._puente_cache is None:
+            pares = sorted((curso_id, linea_id) for curso_id, (_, lineas) in self._cursos.items() for linea_id in lineas)
+            self._puente_cache = (
+                np.array([curso_id for curso_id, _ in pares], dtype=np.int64),
+                np.array([linea_id for _, linea_id in pares], dtype=np.int64),
+            )
+        return self._puente_cache
+
+    def _agrupar(self, dimensiones, columnas, horas):
+        if len(horas) == 0:
+            return []
+        if not dimensiones:
+            return [{'total_horas': int(horas.sum()), 'asignaciones': int(len(horas))}]
+
+        # Combinar las dimensiones en una clave entera (radix mixto) y agrupar una sola vez
+        clave = np.zeros(len(horas), dtype=np.int64)
+        valores_por_dimension = []
+        for dimension in dimensiones:
+            valores, inverso = np.unique(columnas[dimension], return_inverse=True)
+            clave = clave * len(valores) + inverso.reshape(-1)
+            valores_por_dimension.append(valores)
+        grupos, inverso = np.unique(clave, return_inverse=True)
+        inverso = inverso.reshape(-1)
+        totales = np.bincount(inverso, weights=horas, minlength=len(grupos))
+        cantidades = np.bincount(inverso, minlength=len(grupos))
+
+        # Recuperar el valor de cada dimensión a partir de la clave combinada
+        codigos = []
+        resto = grupos
+        for valores in reversed(valores_por_dimension):
+            codigos.append(resto % len(valores))
+            resto = resto // len(valores)
+        codigos.reverse()
+
+        filas = []
+        for i in np.argsort(-totales, kind='stable'):
+            fila = {}
+            for dimension, valores, codigo in zip(dimensiones, valores_por_dimension, codigos):
+                entity_id = int(valores[codigo[i]])
+                fila[dimension] = None if entity_id == SIN_VALOR else {
+                    'id': entity_id,
+                    'nombre': self._etiquetas[dimension].get(entity_id)
+                }
+            fila['total_horas'] = int(totales[i])
+            fila['asignaciones'] = int(cantidades[i])
+            filas.append(fila)
+        return filas
+
+    def preparar(self, session, cambios):
+        """Lee las asignaciones, cursos y etiquetas modificados en el flush"""
+        if not self._warm:
+            return None
+
+        asignaciones = {}
+        cursos = set()
+        etiquetas = {}
+        eliminadas = set()
+        for tabla, entity_id, operacion in cambios:
+            if operacion == 'delete':
+                eliminadas.add((tabla, entity_id))
+            if tabla == 'asignaciones_docentes':
+                asignaciones[entity_id] = None
+            elif tabla in TABLAS_DIMENSION:
+                etiquetas.setdefault(TABLAS_DIMENSION[tabla], set()).add(entity_id)
+                if tabla == 'cursos':
+                    cursos.add(entity_id)
+
+        with self._lock:
+            # Al eliminar una línea desaparecen sus filas de asociación sin marcar a los cursos
+            lineas_eliminadas = {entity_id for tabla, entity_id in eliminadas if tabla == 'lineas_investigacion'}
+            if lineas_eliminadas:
+                cursos |= {curso_id for curso_id, (_, lineas) in self._cursos.items() if lineas & lineas_eliminadas}
+
+        vigentes = [entity_id for entity_id in asignaciones if ('asignaciones_docentes', entity_id) not in eliminadas]
+        if vigentes:
+            for fila in db.session.execute(select(
+                AsignacionDocente.id, AsignacionDocente.docente_id, AsignacionDocente.periodo_id,
+                AsignacionDocente.curso_id, AsignacionDocente.horas_asignadas
+            ).where(AsignacionDocente.id.in_(vigentes))):
+                asignaciones[fila.id] = tuple(fila[1:])
+        leidos = self._leer_cursos(cursos) if cursos else {}
+        nombres = {}
+        for dimension, ids in etiquetas.items():
+            leidas = self._leer_etiquetas({dimension: ids}).get(dimension, {})
+            nombres[dimension] = {entity_id: leidas.get(entity_id) for entity_id in ids}
+        return {
+            'asignaciones': asignaciones,
+            'cursos': {curso_id: leidos.get(curso_id) for curso_id in cursos},
+            'etiquetas': nombres
+        }
+
+    def aplicar(self, payload):
+        """Aplica los cambios calculados en preparar() una vez confirmada la transacción"""
+        with self._lock:
+            if not self._warm:
+                return
+            for dimension, nombres in payload['etiquetas'].items():
+                for entity_id, nombre in nombres.items():
+                    if nombre is None:
+                        self._etiquetas[dimension].pop(entity_id, None)
+                    else:
+                        self._etiquetas[dimension][entity_id] = nombre
+            if payload['cursos']:
+                self._puente_cache = None
+            for curso_id, curso in payload['cursos'].items():
+                if curso is None:
+                    self._cursos.pop(curso_id, None)
+                    continue
+                self._cursos[curso_id] = curso
+                # El área está desnormalizada en los hechos del curso
+                filas = self._columnas['curso'][:self._siguiente] == curso_id
+                self._columnas['area'][:self._siguiente][filas] = SIN_VALOR if curso[0] is None else curso[0]
+            for asignacion_id, valores in payload['asignaciones'].items():
+                if valores is None:
+                    self._eliminar_asignacion(asignacion_id)
+                else:
+                    self._guardar_asignacion(asignacion_id, valores)
+
+# Cubo compartido por todo el proceso
+carga_horaria_cube = CargaHorariaCube()
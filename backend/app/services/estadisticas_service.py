@@ -0,0 +1,212 @@
+import heapq
+import threading
+from collections import Counter
+from sqlalchemy import select
+from app.models.models import (
+    Docente, Curso, LineaInvestigacion, AsignacionDocente, ProduccionAcademica,
+    MODELOS_POR_TABLA, docentes_lineas_investigacion, cursos_lineas_investigacion
+)
+from app import db
+
+# Cantidad de elementos en los rankings
+TOP_N = 5
+
+class EstadisticasStore:
+    """
+    Estadísticas materializadas de la base de datos.
+    Cada entidad aporta una pequeña contribución (su docente, sus líneas, su año...)
+    a contadores globales; con cada transacción confirmada se resta la contribución
+    anterior de las entidades modificadas y se suma la nueva. Los endpoints leen
+    una instantánea que solo se recalcula después de una escritura.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._contribuciones = None
+        self._snapshot = None
+        self._conteos = Counter()
+        self._docentes_con_linea = 0
+        self._cursos_con_linea = 0
+        self._docentes_por_linea = Counter()
+        self._asignaciones_por_docente = Counter()
+        self._producciones_por_anio = Counter()
+        self._producciones_por_revista = Counter()
+
+    @property
+    def is_warm(self):
+        return self._contribuciones is not None
+
+    def rebuild(self):
+        """Recalcula todos los contadores desde la base de datos"""
+        contribuciones = {tabla: {} for tabla in MODELOS_POR_TABLA}
+        for (tabla, entity_id), contribucion in self.iter_contribuciones():
+            contribuciones[tabla][entity_id] = contribucion
+        with self._lock:
+            self._contribuciones = {tabla: {} for tabla in MODELOS_POR_TABLA}
+            self._conteos = Counter()
+            self._docentes_con_linea = 0
+            self._cursos_con_linea = 0
+            self._docentes_por_linea = Counter()
+            self._asignaciones_por_docente = Counter()
+            self._producciones_por_anio = Counter()
+            self._producciones_por_revista = Counter()
+            for tabla, por_id in contribuciones.items():
+                for entity_id, contribucion in por_id.items():
+                    self._reemplazar((tabla, entity_id), contribucion)
+            self._snapshot = None
+
+    def iter_contribuciones(self, ids_por_tabla=None):
+        """
+        Itera ((tabla, id), contribución) con una consulta por tabla (y por tabla de asociación).
+        Con ids_por_tabla ({tabla: ids}) solo se leen esas entidades.
+        """
+        def filas(*columnas):
+            modelo = columnas[0].class_
+            statement = select(*columnas)
+            if ids_por_tabla is not None:
+                ids = ids_por_tabla.get(modelo.__tablename__)
+                if not ids:
+                    return []
+                statement = statement.where(modelo.id.in_(ids))
+            return db.session.execute(statement).all()
+
+        def lineas_de(columna_clave, filas_entidad):
+            agrupado = {}
+            if not filas_entidad:
+                return agrupado
+            statement = select(columna_clave, columna_clave.table.c.linea_investigacion_id)
+            if ids_por_tabla is not None:
+                statement = statement.where(columna_clave.in_([fila.id for fila in filas_entidad]))
+            for clave, linea_id in db.session.execute(statement):
+                agrupado.setdefault(clave, set()).add(linea_id)
+            return agrupado
+
+        docentes = filas(Docente.id, Docente.nombre)
+        lineas_por_docente = lineas_de(docentes_lineas_investigacion.c.docente_id, docentes)
+        for fila in docentes:
+            yield ('docentes', fila.id), {'nombre': fila.nombre, 'lineas': frozenset(lineas_por_docente.get(fila.id, ()))}
+
+        cursos = filas(Curso.id)
+        lineas_por_curso = lineas_de(cursos_lineas_investigacion.c.curso_id, cursos)
+        for fila in cursos:
+            yield ('cursos', fila.id), {'lineas': frozenset(lineas_por_curso.get(fila.id, ()))}
+
+        for fila in filas(LineaInvestigacion.id, LineaInvestigacion.nombre):
+            yield ('lineas_investigacion', fila.id), {'nombre': fila.nombre}
+        for fila in filas(AsignacionDocente.id, AsignacionDocente.docente_id):
+            yield ('asignaciones_docentes', fila.id), {'docente_id': fila.docente_id}
+        for fila in filas(ProduccionAcademica.id, ProduccionAcademica.anio_publicacion, ProduccionAcademica.revista):
+            yield ('producciones_academicas', fila.id), {'anio': fila.anio_publicacion, 'revista': fila.revista}
+
+        for tabla, modelo in MODELOS_POR_TABLA.items():
+            if tabla not in ('docentes', 'cursos', 'lineas_investigacion', 'asignaciones_docentes', 'producciones_academicas'):
+                for fila in filas(modelo.id):
+                    yield (tabla, fila.id), {}
+
+    def snapshot(self):
+        """Instantánea de todas las estadísticas (se recalcula solo tras una escritura)"""
+        with self._lock:
+            if self._contribuciones is None:
+                self.rebuild()
+            if self._snapshot is None:
+                self._snapshot = self._calcular_snapshot()
+            return self._snapshot
+
+    def _calcular_snapshot(self):
+        docentes = self._contribuciones['docentes']
+        lineas = self._contribuciones['lineas_investigacion']
+        return {
+            'conteos': {tabla: self._conteos[tabla] for tabla in MODELOS_POR_TABLA},
+            'docentes_con_linea': self._docentes_con_linea,
+            'cursos_con_linea': self._cursos_con_linea,
+            'docentes_mas_asignaciones': [
+                {'nombre': docentes[docente_id]['nombre'], 'asignaciones': cantidad}
+                for docente_id, cantidad in self._top(self._asignaciones_por_docente)
+                if docente_id in docentes
+            ],
+            'lineas_mas_docentes': [
+                {'nombre': lineas[linea_id]['nombre'], 'docentes': cantidad}
+                for linea_id, cantidad in self._top(self._docentes_por_linea)
+                if linea_id in lineas
+            ],
+            'producciones_por_anio': [
+                {'anio': anio, 'cantidad': cantidad}
+                for anio, cantidad in sorted(self._producciones_por_anio.items(), reverse=True)
+            ],
+            'producciones_por_revista': [
+                {'revista': revista, 'cantidad': cantidad}
+                for revista, cantidad in self._top(self._producciones_por_revista)
+            ],
+            'revistas_distintas': len(self._producciones_por_revista)
+        }
+
+    def _top(self, contador):
+        return heapq.nsmallest(TOP_N, contador.items(), key=lambda item: (-item[1], item[0]))
+
+    def preparar(self, session, cambios):
+        """Lee las contribuciones nuevas de las entidades modificadas en el flush"""
+        if self._contribuciones is None:
+            return None
+
+        eliminadas = {(tabla, entity_id) for tabla, entity_id, operacion in cambios if operacion == 'delete'}
+        claves = {(tabla, entity_id) for tabla, entity_id, _ in cambios if tabla in MODELOS_POR_TABLA}
+        with self._lock:
+            # Al eliminar una línea desaparecen sus filas de asociación sin marcar a docentes ni cursos
+            lineas_eliminadas = {entity_id for tabla, entity_id in eliminadas if tabla == 'lineas_investigacion'}
+            if lineas_eliminadas:
+                for tabla in ('docentes', 'cursos'):
+                    for entity_id, contribucion in self._contribuciones[tabla].items():
+                        if contribucion['lineas'] & lineas_eliminadas:
+                            claves.add((tabla, entity_id))
+
+        payload = dict.fromkeys(claves)
+        ids_por_tabla = {}
+        for tabla, entity_id in claves - eliminadas:
+            ids_por_tabla.setdefault(tabla, set()).add(entity_id)
+        if ids_por_tabla:
+            payload.update(self.iter_contribuciones(ids_por_tabla))
+        return payload
+
+    def aplicar(self, payload):
+        """Aplica las contribuciones calculadas en preparar() una vez confirmada la transacción"""
+        with self._lock:
+            if self._contribuciones is None:
+                return
+            for clave, contribucion in payload.items():
+                self._reemplazar(clave, contribucion)
+            self._snapshot = None
+
+    def _reemplazar(self, clave, contribucion):
+        tabla, entity_id = clave
+        anterior = self._contribuciones[tabla].pop(entity_id, None)
+        if anterior is not None:
+            self._sumar(tabla, anterior, -1)
+        if contribucion is not None:
+            self._contribuciones[tabla][entity_id] = contribucion
+            self._sumar(tabla, contribucion, 1)
+
+    def _sumar(self, tabla, contribucion, signo):
+        self._conteos[tabla] += signo
+        if tabla == 'docentes':
+            if contribucion['lineas']:
+                self._docentes_con_linea += signo
+            for linea_id in contribucion['lineas']:
+                self._incrementar(self._docentes_por_linea, linea_id, signo)
+        elif tabla == 'cursos':
+            if contribucion['lineas']:
+                self._cursos_con_linea += signo
+        elif tabla == 'asignaciones_docentes':
+            self._incrementar(self._asignaciones_por_docente, contribucion['docente_id'], signo)
+        elif tabla == 'producciones_academicas':
+            if contribucion['anio'] is not None:
+                self._incrementar(self._producciones_por_anio, contribucion['anio'], signo)
+            if contribucion['revista']:
+                self._incrementar(self._producciones_por_revista, contribucion['revista'], signo)
+
+    @staticmethod
+    def _incrementar(contador, clave, signo):
+        contador[clave] += signo
+        if contador[clave] <= 0:
+            del contador[clave]
+
+# Estadísticas compartidas por todos los blueprints del proceso
+estadisticas_store = EstadisticasStore()
@@ -0,0 +1,208 @@
+import threading
+from collections import Counter
+from sqlalchemy import select
+from app.models.models import Area, Curso, LineaInvestigacion
+from app.services.grafo_service import grafo_cache, node_id, con_posicion
+from app import db
+
+# Agrupaciones disponibles para el modo de nivel de detalle
+AGRUPACIONES = ('area', 'linea', 'periodo')
+
+def _entity_id(nodo):
+    """Id numérico de la entidad a partir del id de nodo (p. ej. docente_7 -> 7)"""
+    return int(nodo.rsplit('_', 1)[1])
+
+class GrafoClusters:
+    """
+    Vista agregada del grafo de visualización para instituciones grandes.
+    Cada nodo se asigna a un único cluster (área, línea o período) y las aristas
+    entre clusters se resumen con su conteo. El índice de cada agrupación se
+    construye una vez a partir del grafo en memoria y se reutiliza hasta que
+    cambia la revisión del grafo, así cada petición solo recorre lo que devuelve.
+    """
+    def __init__(self, grafo_cache):
+        self.grafo_cache = grafo_cache
+        self._lock = threading.Lock()
+        self._indices = {}
+
+    def clusters(self, por):
+        """Nodos cluster y aristas agregadas entre clusters"""
+        indice = self._indice(por)
+        return indice['clusters'], indice['aristas']
+
+    def expandir(self, por, cluster_id, offset=0, limit=500):
+        """
+        Hijos de un cluster: sus nodos (paginados), las aristas entre ellos y las
+        aristas hacia otros clusters agregadas por nodo. Devuelve None si no existe.
+        """
+        indice = self._indice(por)
+        if cluster_id not in indice['miembros']:
+            return None
+        miembros = indice['miembros'][cluster_id]
+        posiciones = self.grafo_cache.posiciones()
+        nodes = [con_posicion(dict(nodo), posiciones) for nodo in miembros[offset:offset + limit]]
+        visibles = {nodo['id'] for nodo in nodes}
+        cluster_de = indice['cluster_de']
+
+        edges = []
+        externas = Counter()
+        for arista in indice['aristas_por_cluster'].get(cluster_id, []):
+            source, target = arista['source'], arista['target']
+            if source in visibles and target in visibles:
+                edges.append(arista)
+            elif source in visibles and cluster_de.get(target, cluster_id) != cluster_id:
+                externas[(source, cluster_de[target], arista['type'])] += 1
+            elif target in visibles and cluster_de.get(source, cluster_id) != cluster_id:
+                externas[(cluster_de[source], target, arista['type'])] += 1
+        edges += [
+            {'source': source, 'target': target, 'type': tipo, 'count': count}
+            for (source, target, tipo), count in sorted(externas.items())
+        ]
+        return {
+            'cluster': indice['por_id'][cluster_id],
+            'nodes': nodes,
+            'edges': edges,
+            'total': len(miembros),
+            'truncated': offset + limit < len(miembros)
+        }
+
+    def _indice(self, por):
+        if por not in AGRUPACIONES:
+            raise ValueError(f"Agrupación no válida: {por}. Opciones: {', '.join(AGRUPACIONES)}")
+        with self._lock:
+            # Los centros de los clusters dependen también del layout publicado
+            revision = (self.grafo_cache.revision, self.grafo_cache.layout.vigente[0])
+            indice = self._indices.get(por)
+            if indice is None or indice['revision'] != revision or not self.grafo_cache.is_warm:
+                indice = self._construir(por)
+                self._indices[por] = indice
+            return indice
+
+    def _construir(self, por):
+        # Se lee antes que los datos: si cambian entretanto, el índice se reconstruye en la siguiente petición
+        revision = (self.grafo_cache.revision, self.grafo_cache.layout.vigente[0])
+        nodes, edges = self.grafo_cache.grafo()
+        posiciones = self.grafo_cache.posiciones()
+        etiquetas, ancla = self._anclas(por, nodes, edges)
+
+        sin_clasificar = f'cluster_{por}_sin'
+        cluster_de = {}
+        miembros = {}
+        for nodo in nodes:
+            clave = ancla(nodo['id'])
+            cluster_id = f'cluster_{por}_{clave}' if clave is not None else sin_clasificar
+            cluster_de[nodo['id']] = cluster_id
+            miembros.setdefault(cluster_id, []).append(nodo)
+
+        aristas = Counter()
+        internas = Counter()
+        aristas_por_cluster = {}
+        for arista in edges:
+            origen = cluster_de.get(arista['source'])
+            destino = cluster_de.get(arista['target'])
+            if origen is None or destino is None:
+                continue
+            aristas_por_cluster.setdefault(origen, []).append(arista)
+            if origen == destino:
+                internas[origen] += 1
+            else:
+                aristas_por_cluster.setdefault(destino, []).append(arista)
+                aristas[(origen, destino, arista['type'])] += 1
+
+        clusters = []
+        por_id = {}
+        for cluster_id, nodos in miembros.items():
+            clave = cluster_id.rsplit('_', 1)[1]
+            # El cluster se ubica en el centro de sus miembros
+            coordenadas = [posiciones[nodo['id']] for nodo in nodos if nodo['id'] in posiciones]
+            cluster = {
+                'id': cluster_id,
+                'label': etiquetas.get(clave, 'Sin clasificar'),
+                'type': 'cluster',
+                'agrupacion': por,
+                'size': len(nodos),
+                'data': {
+                    'tipos': dict(Counter(nodo['type'] for nodo in nodos)),
+                    'aristas_internas': internas[cluster_id]
+                }
+            }
+            if coordenadas:
+                cluster['x'] = round(sum(x for x, _ in coordenadas) / len(coordenadas), 1)
+                cluster['y'] = round(sum(y for _, y in coordenadas) / len(coordenadas), 1)
+            clusters.append(cluster)
+            por_id[cluster_id] = cluster
+        clusters.sort(key=lambda cluster: cluster['size'], reverse=True)
+
+        return {
+            'revision': revision,
+            'clusters': clusters,
+            'por_id': por_id,
+            'aristas': [
+                {'source': origen, 'target': destino, 'type': tipo, 'count': count}
+                for (origen, destino, tipo), count in sorted(aristas.items())
+            ],
+            'miembros': miembros,
+            'cluster_de': cluster_de,
+            'aristas_por_cluster': aristas_por_cluster
+        }
+
+    def _anclas(self, por, nodes, edges):
+        """
+        Etiquetas de los clusters ({clave: etiqueta}) y una función nodo -> clave.
+        Docentes y cursos toman el cluster de su primera línea (o período);
+        producciones y disponibilidades heredan el de su (primer) docente.
+        """
+        primera = {}
+        def anotar(mapa, clave, valor):
+            if clave not in mapa or valor < mapa[clave]:
+                mapa[clave] = valor
+
+        lineas = {}
+        docente_de = {}
+        for arista in edges:
+            tipo = arista['type']
+            if tipo in ('pertenece_linea', 'relacionado_linea'):
+                anotar(lineas, arista['source'], _entity_id(arista['target']))
+            elif tipo in ('tiene_produccion', 'tiene_disponibilidad'):
+                anotar(docente_de, arista['target'], _entity_id(arista['source']))
+
+        if por == 'linea':
+            etiquetas = {str(_entity_id(nodo['id'])): nodo['label'] for nodo in nodes if nodo['type'] == 'linea_investigacion'}
+            for nodo in nodes:
+                if nodo['type'] == 'linea_investigacion':
+                    primera[nodo['id']] = _entity_id(nodo['id'])
+            primera.update(lineas)
+        elif por == 'area':
+            etiquetas = {str(area_id): nombre for area_id, nombre in db.session.execute(select(Area.id, Area.nombre))}
+            area_de_linea = dict(db.session.execute(select(LineaInvestigacion.id, LineaInvestigacion.area_id)).all())
+            area_de_curso = dict(db.session.execute(select(Curso.id, Curso.area_id)).all())
+            for nodo in nodes:
+                entity_id = _entity_id(nodo['id'])
+                if nodo['type'] == 'linea_investigacion':
+                    primera[nodo['id']] = area_de_linea.get(entity_id)
+                elif nodo['type'] == 'curso':
+                    primera[nodo['id']] = area_de_curso.get(entity_id)
+                elif nodo['type'] == 'docente' and nodo['id'] in lineas:
+                    primera[nodo['id']] = area_de_linea.get(lineas[nodo['id']])
+        else:
+            etiquetas = {str(_entity_id(nodo['id'])): nodo['label'] for nodo in nodes if nodo['type'] == 'periodo_academico'}
+            for nodo in nodes:
+                if nodo['type'] == 'periodo_academico':
+                    primera[nodo['id']] = _entity_id(nodo['id'])
+            # Cada asignación une docente, curso y período: se toma la más antigua
+            for asignacion_id, (_, aristas) in sorted(self.grafo_cache.entidades('asignaciones_docentes').items()):
+                dicta, asignado = aristas
+                periodo_id = _entity_id(asignado['target'])
+                primera.setdefault(dicta['source'], periodo_id)
+                primera.setdefault(dicta['target'], periodo_id)
+
+        def ancla(nodo):
+            if nodo in primera:
+                return primera[nodo]
+            if nodo in docente_de:
+                return primera.get(node_id('docentes', docente_de[nodo]))
+            return None
+        return etiquetas, ancla
+
+# Vista agregada compartida por todo el proceso
+grafo_clusters = GrafoClusters(grafo_cache)
@@ -0,0 +1,122 @@
+import threading
+import numpy as np
+
+# Parámetros del layout dirigido por fuerzas (Fruchterman-Reingold vectorizado)
+ITERACIONES = 60
+ITERACIONES_INCREMENTALES = 30
+# Fracción de nodos nuevos a partir de la cual se recalcula el layout completo
+UMBRAL_INCREMENTAL = 0.25
+# En grafos grandes la repulsión de cada iteración se calcula contra una muestra aleatoria de nodos
+MUESTRA_REPULSION = 1000
+BLOQUE_FILAS = 512
+# Píxeles por unidad de distancia ideal entre nodos
+ESCALA = 60.0
+
+class GrafoLayout:
+    """
+    Coordenadas x/y precalculadas para el grafo de visualización.
+    El layout se calcula en el servidor con operaciones vectorizadas de NumPy
+    sobre una copia de los nodos y aristas de una revisión del grafo, y se publica
+    junto con esa revisión. Cuando cambian pocos nodos solo se ubican los nuevos
+    (los existentes conservan su posición), así el dibujo es estable entre
+    versiones y el cliente puede omitir la física.
+    """
+    def __init__(self, semilla=42):
+        self.semilla = semilla
+        self._lock = threading.Lock()
+        self._crudas = {}
+        # (revisión del grafo, {node_id: (x, y)} en píxeles) del último layout calculado;
+        # se reemplaza completo al publicar uno nuevo, nunca se modifica
+        self.vigente = (None, {})
+
+    def calcular(self, revision, nodes, edges):
+        """Calcula y publica el layout de una revisión del grafo (salvo que ya haya uno igual o posterior)"""
+        with self._lock:
+            if self.vigente[0] is not None and self.vigente[0] >= revision:
+                return
+            self._crudas = self._calcular(nodes, edges, self._crudas)
+            self.vigente = (revision, {
+                nodo: (round(float(x) * ESCALA, 1), round(float(y) * ESCALA, 1))
+                for nodo, (x, y) in self._crudas.items()
+            })
+
+    def _calcular(self, nodes, edges, anteriores):
+        ids = [nodo['id'] for nodo in nodes]
+        n = len(ids)
+        if n == 0:
+            return {}
+        indice = {nodo: i for i, nodo in enumerate(ids)}
+        pares = [(indice[a['source']], indice[a['target']]) for a in edges if a['source'] in indice and a['target'] in indice and a['source'] != a['target']]
+        fuentes = np.fromiter((s for s, _ in pares), dtype=np.intp, count=len(pares))
+        destinos = np.fromiter((t for _, t in pares), dtype=np.intp, count=len(pares))
+        rng = np.random.default_rng(self.semilla)
+
+        nuevos = [i for i, nodo in enumerate(ids) if nodo not in anteriores]
+        if not anteriores or len(nuevos) > UMBRAL_INCREMENTAL * n:
+            pos = rng.uniform(-1.0, 1.0, (n, 2)) * np.sqrt(n)
+            pos = self._fuerzas(pos, fuentes, destinos, np.arange(n), ITERACIONES, rng)
+            # Centrar el dibujo en el origen (solo en el cálculo completo, para no mover nodos existentes)
+            pos -= pos.mean(axis=0)
+        else:
+            pos = np.zeros((n, 2))
+            colocados = np.ones(n, dtype=bool)
+            for nodo, i in indice.items():
+                if nodo in anteriores:
+                    pos[i] = anteriores[nodo]
+            colocados[nuevos] = False
+            if nuevos:
+                # Cada nodo nuevo parte del centro de sus vecinos ya ubicados
+                suma = np.zeros((n, 2))
+                cuenta = np.zeros(n)
+                for a, b in ((fuentes, destinos), (destinos, fuentes)):
+                    validos = colocados[b]
+                    np.add.at(suma, a[validos], pos[b[validos]])
+                    np.add.at(cuenta, a[validos], 1)
+                centro = pos[colocados].mean(axis=0)
+                for i in nuevos:
+                    base = suma[i] / cuenta[i] if cuenta[i] else centro
+                    pos[i] = base + rng.normal(0.0, 0.5, 2)
+                pos = self._fuerzas(pos, fuentes, destinos, np.array(nuevos, dtype=np.intp), ITERACIONES_INCREMENTALES, rng, temperatura=1.0)
+        return {nodo: (pos[i, 0], pos[i, 1]) for nodo, i in indice.items()}
+
+    def _fuerzas(self, pos, fuentes, destinos, moviles, iteraciones, rng, temperatura=None):
+        """Itera el modelo de fuerzas moviendo solo los nodos indicados en moviles"""
+        n = len(pos)
+        if temperatura is None:
+            temperatura = 0.1 * np.sqrt(n)
+        enfriamiento = temperatura / (iteraciones + 1)
+        for _ in range(iteraciones):
+            desplazamiento = np.zeros((n, 2))
+            desplazamiento[moviles] = self._repulsion(pos, moviles, rng)
+
+            # Atracción d^2/k a lo largo de cada arista (k = 1)
+            delta = pos[fuentes] - pos[destinos]
+            distancia = np.sqrt((delta ** 2).sum(axis=1))[:, None]
+            fuerza = delta * distancia
+            for eje in range(2):
+                desplazamiento[:, eje] += np.bincount(destinos, fuerza[:, eje], n) - np.bincount(fuentes, fuerza[:, eje], n)
+
+            movimiento = desplazamiento[moviles]
+            largo = np.maximum(np.sqrt((movimiento ** 2).sum(axis=1)), 1e-9)[:, None]
+            pos[moviles] += movimiento / largo * np.minimum(largo, temperatura)
+            temperatura -= enfriamiento
+        return pos
+
+    def _repulsion(self, pos, filas, rng):
+        """Repulsión k^2/d de cada nodo en filas contra todos (o una muestra) de los nodos"""
+        n = len(pos)
+        if n > MUESTRA_REPULSION:
+            otros = pos[rng.choice(n, MUESTRA_REPULSION, replace=False)]
+            factor = n / MUESTRA_REPULSION
+        else:
+            otros = pos
+            factor = 1.0
+        # sum_j (p_i - p_j) / |p_i - p_j|^2 = p_i * sum_j w_ij - W @ p, con |p_i - p_j|^2 por productos matriciales
+        normas_otros = (otros ** 2).sum(axis=1)
+        resultado = np.empty((len(filas), 2))
+        for inicio in range(0, len(filas), BLOQUE_FILAS):
+            bloque = pos[filas[inicio:inicio + BLOQUE_FILAS]]
+            distancia2 = (bloque ** 2).sum(axis=1)[:, None] + normas_otros[None, :] - 2.0 * (bloque @ otros.T)
+            pesos = 1.0 / np.maximum(distancia2, 1e-4, out=distancia2)
+            resultado[inicio:inicio + len(bloque)] = (bloque * pesos.sum(axis=1)[:, None] - pesos @ otros) * factor
+        return resultado
@@ -0,0 +1,452 @@
+import hashlib
+import threading
+from sqlalchemy import select
+from app.models.models import (
+    Docente, Curso, LineaInvestigacion, PeriodoAcademico,
+    AsignacionDocente, ProduccionAcademica, DisponibilidadHoraria,
+    docentes_lineas_investigacion, cursos_lineas_investigacion,
+    docentes_producciones_academicas
+)
+from app.services.grafo_layout import GrafoLayout
+from app.utils.json_provider import dumps_bytes
+from app import db
+
+# Tablas que aparecen en el grafo de visualización, en el orden en que se listan sus nodos
+TABLAS_GRAFO = (
+    'docentes',
+    'cursos',
+    'lineas_investigacion',
+    'periodos_academicos',
+    'producciones_academicas',
+    'disponibilidades_horarias',
+    'asignaciones_docentes',
+)
+
+# Prefijo del id de nodo usado por vis-network para cada tabla (p. ej. docente_7)
+NODO_PREFIJOS = {
+    'docentes': 'docente',
+    'cursos': 'curso',
+    'lineas_investigacion': 'linea',
+    'periodos_academicos': 'periodo',
+    'producciones_academicas': 'produccion',
+    'disponibilidades_horarias': 'disponibilidad',
+}
+
+def node_id(tabla, entity_id):
+    """Id de nodo de una entidad a partir de su tabla e id"""
+    return f'{NODO_PREFIJOS[tabla]}_{entity_id}'
+
+def con_posicion(nodo, posiciones):
+    """Agrega al nodo sus coordenadas precalculadas (x, y) si las tiene"""
+    if nodo['id'] in posiciones:
+        nodo['x'], nodo['y'] = posiciones[nodo['id']]
+    return nodo
+
+class GrafoService:
+    """
+    Construye los fragmentos (nodos y aristas) del grafo de visualización.
+    Cada entidad es dueña de su nodo y de las aristas que salen de ella,
+    así un cambio en la base de datos solo obliga a regenerar sus fragmentos.
+    """
+    def iter_fragmentos(self, ids_por_tabla=None):
+        """
+        Itera ((tabla, id), (nodos, aristas)) para cada entidad del grafo.
+        Cada tabla y cada tabla de asociación se consulta una sola vez.
+        Con ids_por_tabla ({tabla: ids}) solo se generan esas entidades.
+        """
+        def filas(modelo):
+            if ids_por_tabla is None:
+                return modelo.query.all()
+            ids = ids_por_tabla.get(modelo.__tablename__)
+            if not ids:
+                return []
+            return modelo.query.filter(modelo.id.in_(ids)).all()
+
+        docentes = filas(Docente)
+        lineas_por_docente = self._group_association(docentes_lineas_investigacion.c.docente_id, docentes_lineas_investigacion.c.linea_investigacion_id, docentes, ids_por_tabla)
+        producciones_por_docente = self._group_association(docentes_producciones_academicas.c.docente_id, docentes_producciones_academicas.c.produccion_academica_id, docentes, ids_por_tabla)
+        for item in docentes:
+            yield ('docentes', item.id), self._docente_fragmento(item, lineas_por_docente.get(item.id, []), producciones_por_docente.get(item.id, []))
+
+        cursos = filas(Curso)
+        lineas_por_curso = self._group_association(cursos_lineas_investigacion.c.curso_id, cursos_lineas_investigacion.c.linea_investigacion_id, cursos, ids_por_tabla)
+        for item in cursos:
+            yield ('cursos', item.id), self._curso_fragmento(item, lineas_por_curso.get(item.id, []))
+
+        for item in filas(LineaInvestigacion):
+            yield ('lineas_investigacion', item.id), ([{
+                'id': node_id('lineas_investigacion', item.id),
+                'label': item.nombre,
+                'type': 'linea_investigacion'
+            }], [])
+        for item in filas(PeriodoAcademico):
+            yield ('periodos_academicos', item.id), ([{
+                'id': node_id('periodos_academicos', item.id),
+                'label': item.nombre,
+                'type': 'periodo_academico'
+            }], [])
+
+        producciones = filas(ProduccionAcademica)
+        autores_por_produccion = self._group_association(docentes_producciones_academicas.c.produccion_academica_id, docentes_producciones_academicas.c.docente_id, producciones, ids_por_tabla)
+        for item in producciones:
+            yield ('producciones_academicas', item.id), self._produccion_fragmento(item, autores_por_produccion.get(item.id))
+
+        for item in filas(DisponibilidadHoraria):
+            yield ('disponibilidades_horarias', item.id), ([{
+                'id': node_id('disponibilidades_horarias', item.id),
+                'label': item.descripcion,
+                'type': 'disponibilidad_horaria',
+                'data': {
+                    'descripcion': item.descripcion
+                }
+            }], [{
+                'source': node_id('docentes', item.docente_id),
+                'target': node_id('disponibilidades_horarias', item.id),
+                'type': 'tiene_disponibilidad'
+            }])
+
+        for item in filas(AsignacionDocente):
+            yield ('asignaciones_docentes', item.id), ([], [
+                {
+                    'source': node_id('docentes', item.docente_id),
+                    'target': node_id('cursos', item.curso_id),
+                    'type': 'dicta',
+                    'data': {
+                        'horas_asignadas': item.horas_asignadas
+                    }
+                },
+                {
+                    'source': node_id('cursos', item.curso_id),
+                    'target': node_id('periodos_academicos', item.periodo_id),
+                    'type': 'asignado_periodo'
+                }
+            ])
+
+    def _group_association(self, columna_clave, columna_valor, items, ids_por_tabla):
+        """Lee una tabla de asociación en una sola consulta y la agrupa por columna_clave"""
+        agrupado = {}
+        if not items:
+            return agrupado
+        statement = select(columna_clave, columna_valor)
+        if ids_por_tabla is not None:
+            statement = statement.where(columna_clave.in_([item.id for item in items]))
+        for clave, valor in db.session.execute(statement):
+            agrupado.setdefault(clave, []).append(valor)
+        return agrupado
+
+    def _docente_fragmento(self, item, lineas_ids, producciones_ids):
+        origen = node_id('docentes', item.id)
+        nodos = [{
+            'id': origen,
+            'label': item.nombre,
+            'type': 'docente',
+            'data': {
+                'grado_academico': item.grado_academico,
+                'orcid': item.orcid,
+                'email': item.email
+            }
+        }]
+        aristas = [
+            {'source': origen, 'target': node_id('lineas_investigacion', linea_id), 'type': 'pertenece_linea'}
+            for linea_id in sorted(lineas_ids)
+        ]
+        aristas += [
+            {'source': origen, 'target': node_id('producciones_academicas', produccion_id), 'type': 'tiene_produccion'}
+            for produccion_id in sorted(producciones_ids)
+        ]
+        return nodos, aristas
+
+    def _curso_fragmento(self, item, lineas_ids):
+        origen = node_id('cursos', item.id)
+        nodos = [{
+            'id': origen,
+            'label': item.nombre,
+            'type': 'curso'
+        }]
+        aristas = [
+            {'source': origen, 'target': node_id('lineas_investigacion', linea_id), 'type': 'relacionado_linea'}
+            for linea_id in sorted(lineas_ids)
+        ]
+        return nodos, aristas
+
+    def _produccion_fragmento(self, item, autores_ids):
+        # Solo se muestran las producciones que tienen al menos un autor
+        if not autores_ids:
+            return [], []
+        return [{
+            'id': node_id('producciones_academicas', item.id),
+            'label': item.titulo[:50] + '...' if len(item.titulo) > 50 else item.titulo,
+            'type': 'produccion_academica',
+            'data': {
+                'doi': item.doi,
+                'revista': item.revista,
+                'anio_publicacion': item.anio_publicacion
+            }
+        }], []
+
+class GrafoCache:
+    """
+    Grafo de visualización materializado en memoria.
+    Se construye una sola vez y luego cada escritura reemplaza solo los
+    fragmentos de las entidades afectadas. El JSON de respuesta y su ETag
+    se generan de forma perezosa y se reutilizan hasta el siguiente cambio.
+    Junto a los fragmentos se mantiene un índice de adyacencia
+    (nodo -> {(tabla, id, posición): arista}) para recorrer vecindarios.
+    Las coordenadas del layout se calculan en segundo plano, fuera del lock,
+    a partir de una copia de los nodos y aristas de cada revisión.
+    """
+    def __init__(self, grafo_service=None, layout=None):
+        self.grafo_service = grafo_service or GrafoService()
+        self.layout = layout or GrafoLayout()
+        self._lock = threading.RLock()
+        self._fragmentos = None
+        self._payload = None
+        self._nodos = {}
+        self._adyacencia = {}
+        self._calculando_layout = False
+        # Aumenta con cada cambio aplicado; sirve para invalidar vistas derivadas
+        self.revision = 0
+
+    @property
+    def is_warm(self):
+        return self._fragmentos is not None
+
+    def rebuild(self):
+        """Regenera todos los fragmentos desde la base de datos"""
+        fragmentos = {tabla: {} for tabla in TABLAS_GRAFO}
+        for (tabla, entity_id), fragmento in self.grafo_service.iter_fragmentos():
+            fragmentos[tabla][entity_id] = fragmento
+        nodos = {}
+        adyacencia = {}
+        for tabla, por_id in fragmentos.items():
+            for entity_id, fragmento in por_id.items():
+                self._indexar(nodos, adyacencia, (tabla, entity_id), fragmento)
+        with self._lock:
+            self._fragmentos = fragmentos
+            self._nodos = nodos
+            self._adyacencia = adyacencia
+            self._payload = None
+            self.revision += 1
+            self._programar_layout()
+
+    def grafo(self):
+        """Nodos y aristas del grafo completo (se genera si aún no existe)"""
+        with self._lock:
+            if self._fragmentos is None:
+                self.rebuild()
+            nodes = [nodo for tabla in TABLAS_GRAFO for nodos, _ in self._fragmentos[tabla].values() for nodo in nodos]
+            edges = [arista for tabla in TABLAS_GRAFO for _, aristas in self._fragmentos[tabla].values() for arista in aristas]
+            return nodes, edges
+
+    def posiciones(self):
+        """
+        Coordenadas {node_id: (x, y)} del último layout calculado (compartidas, no modificar).
+        Si el grafo cambió desde entonces se programa el recálculo y mientras tanto
+        se devuelven las anteriores: los nodos nuevos quedan sin posición.
+        """
+        revision, posiciones = self.layout.vigente
+        if revision != self.revision:
+            self._programar_layout()
+        return posiciones
+
+    def actualizar_layout(self):
+        """Calcula el layout hasta alcanzar la revisión actual del grafo (en el hilo que llama)"""
+        while True:
+            with self._lock:
+                pendiente = self._layout_pendiente()
+            if pendiente is None:
+                return
+            self.layout.calcular(*pendiente)
+
+    def _layout_pendiente(self):
+        """(revisión, nodos, aristas) a ubicar si el layout no está al día (se llama con el lock tomado)"""
+        if self._fragmentos is None or self.layout.vigente[0] == self.revision:
+            return None
+        return (self.revision,) + self.grafo()
+
+    def _programar_layout(self):
+        """Lanza el cálculo del layout en un hilo en segundo plano si no hay uno en curso"""
+        with self._lock:
+            if self._calculando_layout or self._fragmentos is None:
+                return
+            self._calculando_layout = True
+        threading.Thread(target=self._calcular_layout, name='grafo-layout', daemon=True).start()
+
+    def _calcular_layout(self):
+        try:
+            while True:
+                with self._lock:
+                    pendiente = self._layout_pendiente()
+                    if pendiente is None:
+                        self._calculando_layout = False
+                        return
+                self.layout.calcular(*pendiente)
+        except Exception as e:
+            with self._lock:
+                self._calculando_layout = False
+            print(f"Error al calcular el layout del grafo: {e}")
+
+    def entidades(self, tabla):
+        """Copia de los fragmentos de una tabla: {id: (nodos, aristas)}"""
+        with self._lock:
+            if self._fragmentos is None:
+                self.rebuild()
+            return dict(self._fragmentos[tabla])
+
+    def vecindario(self, origen, hops=1, max_nodes=200):
+        """
+        Nodos a lo sumo a `hops` saltos de `origen` (búsqueda en anchura sobre el
+        índice de adyacencia) y las aristas entre ellos. Se detiene al llegar a
+        max_nodes. Devuelve None si el nodo de origen no existe.
+        """
+        with self._lock:
+            if self._fragmentos is None:
+                self.rebuild()
+            if origen not in self._nodos:
+                return None
+
+            distancia = {origen: 0}
+            frontera = [origen]
+            truncated = False
+            for salto in range(1, hops + 1):
+                siguiente = []
+                for nodo in frontera:
+                    for arista in self._adyacencia.get(nodo, {}).values():
+                        vecino = arista['target'] if arista['source'] == nodo else arista['source']
+                        if vecino in distancia or vecino not in self._nodos:
+                            continue
+                        if len(distancia) >= max_nodes:
+                            truncated = True
+                            break
+                        distancia[vecino] = salto
+                        siguiente.append(vecino)
+                    if truncated:
+                        break
+                frontera = siguiente
+                if truncated or not frontera:
+                    break
+
+            posiciones = self.posiciones()
+            nodes = [con_posicion(dict(self._nodos[nodo], hop=salto), posiciones) for nodo, salto in distancia.items()]
+            edges = {}
+            for nodo in distancia:
+                for clave, arista in self._adyacencia.get(nodo, {}).items():
+                    if arista['source'] in distancia and arista['target'] in distancia:
+                        edges[clave] = arista
+            return nodes, list(edges.values()), truncated
+
+    def payload(self):
+        """
+        Respuesta JSON serializada del grafo completo y su ETag. Se regenera
+        cuando cambia el grafo o cuando se publica un layout más reciente.
+        """
+        with self._lock:
+            if self._fragmentos is None:
+                self.rebuild()
+            revision_layout, posiciones = self.layout.vigente
+            if revision_layout != self.revision:
+                self._programar_layout()
+            if self._payload is None or self._payload[0] != revision_layout:
+                nodes, edges = self.grafo()
+                nodes = [con_posicion(dict(nodo), posiciones) for nodo in nodes]
+                body = dumps_bytes({
+                    'success': True,
+                    'data': {
+                        'nodes': nodes,
+                        'edges': edges
+                    }
+                })
+                self._payload = revision_layout, body, hashlib.sha1(body).hexdigest()
+            return self._payload[1:]
+
+    def preparar(self, session, cambios):
+        """Calcula los fragmentos nuevos de las entidades modificadas en el flush"""
+        if self._fragmentos is None:
+            return None
+
+        eliminadas = {(tabla, entity_id) for tabla, entity_id, operacion in cambios if operacion == 'delete'}
+        claves = {(tabla, entity_id) for tabla, entity_id, _ in cambios if tabla in TABLAS_GRAFO}
+        claves |= self._dependientes(claves, eliminadas)
+
+        payload = dict.fromkeys(claves)
+        payload.update(self._generar(claves - eliminadas))
+
+        # Una producción aparece en cuanto tiene autor: revisar las nuevas aristas de autoría
+        producciones = {
+            ('producciones_academicas', int(arista['target'].rsplit('_', 1)[1]))
+            for (tabla, _), fragmento in payload.items() if tabla == 'docentes' and fragmento
+            for arista in fragmento[1] if arista['type'] == 'tiene_produccion'
+        } - set(payload)
+        payload.update(self._generar(producciones))
+        return payload
+
+    def _generar(self, claves):
+        ids_por_tabla = {}
+        for tabla, entity_id in claves:
+            ids_por_tabla.setdefault(tabla, set()).add(entity_id)
+        if not ids_por_tabla:
+            return {}
+        return dict(self.grafo_service.iter_fragmentos(ids_por_tabla))
+
+    def _dependientes(self, claves, eliminadas):
+        """Entidades cuyos fragmentos dependen de las entidades modificadas"""
+        dependientes = set()
+        with self._lock:
+            for tabla, entity_id in claves:
+                if tabla != 'docentes':
+                    continue
+                # La visibilidad de una producción depende de sus autores
+                _, aristas = self._fragmentos[tabla].get(entity_id, ([], []))
+                for arista in aristas:
+                    if arista['type'] == 'tiene_produccion':
+                        dependientes.add(('producciones_academicas', int(arista['target'].rsplit('_', 1)[1])))
+            for tabla, entity_id in eliminadas:
+                if tabla not in NODO_PREFIJOS:
+                    continue
+                # Quien tenga aristas hacia una entidad eliminada debe regenerarse
+                for dueno_tabla, dueno_id, _ in self._adyacencia.get(node_id(tabla, entity_id), {}):
+                    dependientes.add((dueno_tabla, dueno_id))
+        return dependientes - eliminadas
+
+    def aplicar(self, payload):
+        """Aplica los fragmentos calculados en preparar() una vez confirmada la transacción"""
+        with self._lock:
+            if self._fragmentos is None:
+                return
+            for (tabla, entity_id), fragmento in payload.items():
+                anterior = self._fragmentos[tabla].pop(entity_id, None)
+                if anterior is not None:
+                    self._desindexar(self._nodos, self._adyacencia, (tabla, entity_id), anterior)
+                if fragmento is not None:
+                    self._fragmentos[tabla][entity_id] = fragmento
+                    self._indexar(self._nodos, self._adyacencia, (tabla, entity_id), fragmento)
+            self._payload = None
+            self.revision += 1
+            self._programar_layout()
+
+    @staticmethod
+    def _indexar(nodos, adyacencia, clave, fragmento):
+        tabla, entity_id = clave
+        for nodo in fragmento[0]:
+            nodos[nodo['id']] = nodo
+        for posicion, arista in enumerate(fragmento[1]):
+            clave_arista = (tabla, entity_id, posicion)
+            adyacencia.setdefault(arista['source'], {})[clave_arista] = arista
+            adyacencia.setdefault(arista['target'], {})[clave_arista] = arista
+
+    @staticmethod
+    def _desindexar(nodos, adyacencia, clave, fragmento):
+        tabla, entity_id = clave
+        for nodo in fragmento[0]:
+            nodos.pop(nodo['id'], None)
+        for posicion, arista in enumerate(fragmento[1]):
+            clave_arista = (tabla, entity_id, posicion)
+            for extremo in (arista['source'], arista['target']):
+                aristas = adyacencia.get(extremo)
+                if aristas is not None:
+                    aristas.pop(clave_arista, None)
+                    if not aristas:
+                        del adyacencia[extremo]
+
+# Grafo de visualización compartido por todo el proceso
+grafo_cache = GrafoCache()
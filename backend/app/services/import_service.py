@@ -0,0 +1,324 @@
+import csv
+import json
+import time
+from datetime import date
+from sqlalchemy import select, insert, update, delete, tuple_
+from app.models.models import (
+    Area, LineaInvestigacion, PeriodoAcademico, Curso, Docente,
+    ProduccionAcademica, AsignacionDocente, DisponibilidadHoraria,
+    docentes_lineas_investigacion, cursos_lineas_investigacion,
+    docentes_producciones_academicas
+)
+from app.utils.change_tracking import register_bulk_changes
+from app import db
+
+# Separador de los campos multivaluados (p. ej. lineas="IA;Robótica")
+SEPARADOR_LISTA = ';'
+# Errores detallados incluidos en el reporte (el total siempre se informa)
+MAX_ERRORES_REPORTE = 100
+
+# Cada entidad importable: modelo, clave natural, columnas, tipos y relaciones.
+# Las relaciones muchos a muchos reemplazan las de la entidad si vienen en la fila.
+ENTIDADES = {
+    'areas': {
+        'modelo': Area,
+        'clave': ('nombre',),
+        'campos': ('nombre', 'descripcion'),
+        'requeridos': ('nombre',),
+    },
+    'lineas_investigacion': {
+        'modelo': LineaInvestigacion,
+        'clave': ('nombre',),
+        'campos': ('nombre', 'descripcion', 'area_id'),
+        'requeridos': ('nombre',),
+        'referencias': {'area': ('area_id', 'areas')},
+    },
+    'periodos_academicos': {
+        'modelo': PeriodoAcademico,
+        'clave': ('anio', 'semestre'),
+        'campos': ('nombre', 'anio', 'semestre', 'descripcion'),
+        'requeridos': ('nombre', 'anio', 'semestre'),
+        'enteros': ('anio', 'semestre'),
+    },
+    'docentes': {
+        'modelo': Docente,
+        'clave': ('email',),
+        'campos': ('nombre', 'titulo', 'email', 'grado_academico', 'especialidad', 'orcid'),
+        'requeridos': ('nombre', 'email'),
+        'relaciones': {'lineas': (docentes_lineas_investigacion, 'docente_id', 'linea_investigacion_id', 'lineas_investigacion')},
+    },
+    'cursos': {
+        'modelo': Curso,
+        'clave': ('codigo',),
+        'campos': ('nombre', 'codigo', 'creditos', 'area_id'),
+        'requeridos': ('nombre', 'codigo', 'creditos'),
+        'enteros': ('creditos',),
+        'referencias': {'area': ('area_id', 'areas')},
+        'relaciones': {'lineas': (cursos_lineas_investigacion, 'curso_id', 'linea_investigacion_id', 'lineas_investigacion')},
+    },
+    'producciones_academicas': {
+        'modelo': ProduccionAcademica,
+        'clave': ('doi',),
+        'campos': ('titulo', 'doi', 'fecha_publicacion', 'revista', 'anio_publicacion'),
+        'requeridos': ('titulo', 'doi'),
+        'enteros': ('anio_publicacion',),
+        'fechas': ('fecha_publicacion',),
+        'relaciones': {'autores': (docentes_producciones_academicas, 'produccion_academica_id', 'docente_id', 'docentes')},
+    },
+    'asignaciones_docentes': {
+        'modelo': AsignacionDocente,
+        'clave': ('docente_id', 'curso_id', 'periodo_id'),
+        'campos': ('docente_id', 'curso_id', 'periodo_id', 'horas_asignadas', 'descripcion'),
+        'requeridos': ('docente', 'curso', 'anio', 'semestre', 'horas_asignadas'),
+        'enteros': ('horas_asignadas', 'anio', 'semestre'),
+        'referencias': {'docente': ('docente_id', 'docentes'), 'curso': ('curso_id', 'cursos'), 'periodo': ('periodo_id', 'periodos_academicos')},
+    },
+    'disponibilidades_horarias': {
+        'modelo': DisponibilidadHoraria,
+        'clave': ('docente_id', 'descripcion'),
+        'campos': ('docente_id', 'descripcion'),
+        'requeridos': ('docente', 'descripcion'),
+        'referencias': {'docente': ('docente_id', 'docentes')},
+    },
+}
+
+# Entidades que se crean automáticamente por nombre cuando una fila las referencia
+CREABLES_POR_NOMBRE = {'areas': Area, 'lineas_investigacion': LineaInvestigacion}
+
+class ImportService:
+    """
+    Importación masiva de archivos CSV o NDJSON.
+    Las filas se leen en streaming y se procesan por bloques: las claves naturales
+    (email, código, DOI, año y semestre...) se resuelven a ids con un caché en
+    memoria que se carga una vez por tabla, y cada bloque se escribe con una
+    sentencia INSERT y otra UPDATE (executemany) más las de sus relaciones.
+    """
+    def __init__(self, chunk_size=5000):
+        self.chunk_size = chunk_size
+        self._ids = {}
+
+    def importar(self, entidad, filas):
+        """
+        Importa (upsert) las filas ({columna: valor}) de una entidad.
+        Devuelve el reporte con filas procesadas, insertadas, actualizadas, errores y filas/s.
+        """
+        if entidad not in ENTIDADES:
+            raise ValueError(f"Entidad no válida: {entidad}. Opciones: {', '.join(ENTIDADES)}")
+        reporte = {'entidad': entidad, 'filas': 0, 'insertadas': 0, 'actualizadas': 0, 'total_errores': 0, 'errores': []}
+        inicio = time.perf_counter()
+
+        bloque = []
+        for numero, fila in enumerate(filas, start=1):
+            bloque.append((numero, fila))
+            if len(bloque) >= self.chunk_size:
+                self._importar_bloque(entidad, bloque, reporte)
+                bloque = []
+        if bloque:
+            self._importar_bloque(entidad, bloque, reporte)
+
+        segundos = time.perf_counter() - inicio
+        reporte['segundos'] = round(segundos, 2)
+        reporte['filas_por_segundo'] = round(reporte['filas'] / segundos) if segundos > 0 else reporte['filas']
+        return reporte
+
+    def _importar_bloque(self, entidad, bloque, reporte):
+        spec = ENTIDADES[entidad]
+        reporte['filas'] += len(bloque)
+        try:
+            convertidas = []
+            for numero, fila in bloque:
+                valores, relaciones, error = self._convertir(spec, fila)
+                if error:
+                    self._error(reporte, numero, error)
+                else:
+                    convertidas.append((numero, valores, relaciones))
+
+            validas = self._resolver_relaciones(spec, convertidas, reporte)
+            ids = self._cache(entidad)
+            nuevas = {clave: valores for clave, (_, valores, _) in validas.items() if clave not in ids}
+            existentes = [dict(valores, id=ids[clave]) for clave, (_, valores, _) in validas.items() if clave in ids]
+
+            modelo = spec['modelo']
+            if nuevas:
+                db.session.execute(insert(modelo.__table__), list(nuevas.values()))
+            if existentes:
+                db.session.execute(update(modelo), existentes)
+            nuevos_ids = self._leer_ids(spec, list(nuevas))
+            ids_bloque = {clave: nuevos_ids.get(clave, ids.get(clave)) for clave in validas}
+
+            destinos = {}
+            for nombre, (tabla, columna_duena, columna_destino, tabla_destino) in spec.get('relaciones', {}).items():
+                pares = [
+                    (ids_bloque[clave], destino)
+                    for clave, (_, _, relaciones) in validas.items() if nombre in relaciones
+                    for destino in relaciones[nombre]
+                ]
+                duenos = [ids_bloque[clave] for clave, (_, _, relaciones) in validas.items() if nombre in relaciones]
+                if duenos:
+                    # Como con el ORM, cambiar la asociación modifica también a los destinos anteriores y nuevos
+                    anteriores = db.session.scalars(select(tabla.c[columna_destino]).where(tabla.c[columna_duena].in_(duenos)))
+                    destinos.setdefault(tabla_destino, set()).update(anteriores)
+                    db.session.execute(delete(tabla).where(tabla.c[columna_duena].in_(duenos)))
+                if pares:
+                    db.session.execute(insert(tabla), [{columna_duena: dueno, columna_destino: destino} for dueno, destino in pares])
+                    destinos.setdefault(tabla_destino, set()).update(destino for _, destino in pares)
+
+            register_bulk_changes(db.session,
+                [(modelo.__tablename__, nuevos_ids[clave], 'insert') for clave in nuevas if clave in nuevos_ids] +
+                [(modelo.__tablename__, fila['id'], 'update') for fila in existentes] +
+                [(tabla, entity_id, 'update') for tabla, ids_destino in destinos.items() for entity_id in ids_destino]
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # Los ids creados en un bloque fallido no existen: se descarta el caché afectado
+            self._ids.clear()
+            for numero, _ in bloque:
+                self._error(reporte, numero, f'Bloque no importado: {e}')
+            return
+
+        ids.update(nuevos_ids)
+        reporte['insertadas'] += len(nuevos_ids)
+        reporte['actualizadas'] += len(existentes)
+
+    def _convertir(self, spec, fila):
+        """Normaliza una fila (vacíos a None, enteros, fechas); devuelve (valores, relaciones, error)"""
+        if isinstance(fila, str):
+            # Línea que el lector no pudo interpretar
+            return None, None, fila
+        if not isinstance(fila, dict):
+            return None, None, 'La fila debe ser un objeto'
+        fila = {clave: (valor.strip() if isinstance(valor, str) else valor) for clave, valor in fila.items()}
+        fila = {clave: (None if valor == '' else valor) for clave, valor in fila.items()}
+        for campo in spec['requeridos']:
+            if fila.get(campo) is None:
+                return None, None, f'El campo {campo} es requerido'
+        try:
+            for campo in spec.get('enteros', ()):
+                if fila.get(campo) is not None:
+                    fila[campo] = int(fila[campo])
+            for campo in spec.get('fechas', ()):
+                if isinstance(fila.get(campo), str):
+                    fila[campo] = date.fromisoformat(fila[campo])
+        except ValueError as e:
+            return None, None, f'Valor inválido: {e}'
+
+        if spec['modelo'] is AsignacionDocente:
+            # El período se identifica por su clave natural (anio, semestre)
+            fila['periodo'] = (fila.pop('anio'), fila.pop('semestre'))
+
+        valores = {campo: fila.get(campo) for campo in spec['campos'] if campo in fila}
+        referencias = {nombre: fila[nombre] for nombre in spec.get('referencias', {}) if fila.get(nombre) is not None}
+        relaciones = {}
+        for nombre in spec.get('relaciones', {}):
+            if nombre in fila:
+                valor = fila[nombre] or []
+                if isinstance(valor, str):
+                    valor = [parte.strip() for parte in valor.split(SEPARADOR_LISTA) if parte.strip()]
+                relaciones[nombre] = list(valor)
+        return valores, {'referencias': referencias, **relaciones}, None
+
+    def _resolver_relaciones(self, spec, filas, reporte):
+        """
+        Reemplaza las claves naturales referenciadas por ids y descarta las filas con referencias inexistentes.
+        Devuelve {clave natural: (número de fila, valores, relaciones)}; dentro del bloque gana la última fila.
+        """
+        resueltas = {}
+        pendientes = {}
+        for numero, valores, relaciones in filas:
+            for nombre, valor in relaciones['referencias'].items():
+                pendientes.setdefault(spec['referencias'][nombre][1], set()).add(valor)
+            for nombre, (_, _, _, destino) in spec.get('relaciones', {}).items():
+                for valor in relaciones.get(nombre, []):
+                    pendientes.setdefault(destino, set()).add(valor)
+        for tabla, valores in pendientes.items():
+            self._crear_faltantes(tabla, valores)
+
+        for numero, valores, relaciones in filas:
+            error = None
+            for nombre, valor in relaciones.pop('referencias').items():
+                campo, tabla = spec['referencias'][nombre]
+                entity_id = self._cache(tabla).get(valor if isinstance(valor, tuple) else (valor,))
+                if entity_id is None:
+                    error = f'No existe {nombre} {valor}'
+                    break
+                valores[campo] = entity_id
+            for nombre, (_, _, _, tabla) in spec.get('relaciones', {}).items():
+                if error or nombre not in relaciones:
+                    continue
+                ids = [self._cache(tabla).get((valor,)) for valor in relaciones[nombre]]
+                if None in ids:
+                    error = f'No existe {nombre} {relaciones[nombre][ids.index(None)]}'
+                relaciones[nombre] = set(ids)
+            if error:
+                self._error(reporte, numero, error)
+            else:
+                clave = tuple(valores[campo] for campo in spec['clave'])
+                resueltas[clave] = (numero, valores, relaciones)
+        return resueltas
+
+    def _crear_faltantes(self, tabla, valores):
+        """Crea por nombre las áreas y líneas que aún no existen"""
+        if tabla not in CREABLES_POR_NOMBRE:
+            return
+        ids = self._cache(tabla)
+        faltantes = sorted({valor for valor in valores if (valor,) not in ids})
+        if faltantes:
+            modelo = CREABLES_POR_NOMBRE[tabla]
+            db.session.execute(insert(modelo), [{'nombre': nombre} for nombre in faltantes])
+            for entity_id, nombre in db.session.execute(select(modelo.id, modelo.nombre).where(modelo.nombre.in_(faltantes))):
+                ids.setdefault((nombre,), entity_id)
+            register_bulk_changes(db.session, [(modelo.__tablename__, ids[(nombre,)], 'insert') for nombre in faltantes])
+
+    def _cache(self, tabla):
+        """{clave natural: id} de una tabla, cargado con una sola consulta la primera vez"""
+        if tabla not in self._ids:
+            if tabla in CREABLES_POR_NOMBRE:
+                modelo = CREABLES_POR_NOMBRE[tabla]
+                columnas = (modelo.nombre,)
+            else:
+                spec = ENTIDADES[tabla]
+                modelo = spec['modelo']
+                columnas = tuple(getattr(modelo, campo) for campo in spec['clave'])
+            ids = {}
+            for fila in db.session.execute(select(modelo.id, *columnas).order_by(modelo.id)):
+                ids.setdefault(tuple(fila[1:]), fila[0])
+            self._ids[tabla] = ids
+        return self._ids[tabla]
+
+    def _leer_ids(self, spec, claves):
+        """Ids de las filas recién insertadas, buscadas por su clave natural"""
+        if not claves:
+            return {}
+        modelo = spec['modelo']
+        columnas = [getattr(modelo, campo) for campo in spec['clave']]
+        condicion = columnas[0].in_([clave[0] for clave in claves]) if len(columnas) == 1 else tuple_(*columnas).in_(claves)
+        buscadas = set(claves)
+        ids = {}
+        for fila in db.session.execute(select(modelo.id, *columnas).where(condicion).order_by(modelo.id)):
+            clave = tuple(fila[1:])
+            if clave in buscadas:
+                ids.setdefault(clave, fila[0])
+        return ids
+
+    def _error(self, reporte, numero, error):
+        reporte['total_errores'] += 1
+        if len(reporte['errores']) < MAX_ERRORES_REPORTE:
+            reporte['errores'].append({'fila': numero, 'error': error})
+
+def leer_archivo(archivo, formato):
+    """Itera las filas (dict) de un archivo CSV o NDJSON abierto en modo texto, sin cargarlo completo"""
+    if formato == 'csv':
+        yield from csv.DictReader(archivo)
+    elif formato == 'ndjson':
+        for linea in archivo:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                yield json.loads(linea)
+            except ValueError as e:
+                # Se entrega la línea inválida para que quede registrada como error de fila
+                yield f'JSON inválido: {e}'
+    else:
+        raise ValueError(f'Formato no válido: {formato}. Opciones: csv, ndjson')
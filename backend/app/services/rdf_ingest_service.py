@@ -0,0 +1,268 @@
+import io
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from xml.sax.xmlreader import InputSource
+from rdflib import Namespace, URIRef, BNode
+from rdflib.namespace import RDF, RDFS, FOAF, DCTERMS
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+from rdflib.plugins.parsers.nquads import NQuadsParser
+from rdflib.plugins.parsers.notation3 import SinkParser, RDFSink
+from rdflib.plugins.parsers.rdfxml import create_parser
+from app.services.import_service import ImportService
+
+ACAD = Namespace("http://cramsoft.org/academico#")
+
+# Formato según la extensión del archivo
+FORMATOS = {'.rdf': 'xml', '.owl': 'xml', '.xml': 'xml', '.ttl': 'turtle', '.nt': 'nt', '.nq': 'nquads'}
+
+# Clases de la ontología, en el orden en que se importan (las referenciadas primero)
+CLASES = {
+    'areas': ACAD.Area,
+    'lineas_investigacion': ACAD.LineaInvestigacion,
+    'periodos_academicos': ACAD.PeriodoAcademico,
+    'cursos': ACAD.Curso,
+    'docentes': ACAD.Docente,
+    'producciones_academicas': ACAD.ProduccionAcademica,
+    'asignaciones_docentes': ACAD.AsignacionDocente,
+    'disponibilidades_horarias': ACAD.DisponibilidadHoraria,
+}
+
+# Propiedad -> columna de la fila de importación (ver ENTIDADES en import_service)
+PROPIEDADES = {
+    'areas': {RDFS.label: 'nombre', RDFS.comment: 'descripcion'},
+    'lineas_investigacion': {RDFS.label: 'nombre', RDFS.comment: 'descripcion', ACAD.subAreaDe: 'area'},
+    'periodos_academicos': {RDFS.label: 'nombre', RDFS.comment: 'descripcion', ACAD.anio: 'anio', ACAD.semestre: 'semestre'},
+    'cursos': {
+        RDFS.label: 'nombre', ACAD.codigo: 'codigo', ACAD.creditos: 'creditos',
+        ACAD.perteneceAArea: 'area', ACAD.relacionadoConLinea: 'lineas',
+    },
+    'docentes': {
+        FOAF.name: 'nombre', FOAF.title: 'titulo', FOAF.mbox: 'email', ACAD.gradoAcademico: 'grado_academico',
+        ACAD.especialidad: 'especialidad', ACAD.orcid: 'orcid', ACAD.perteneceLinea: 'lineas',
+    },
+    'producciones_academicas': {
+        ACAD.titulo: 'titulo', ACAD.doi: 'doi', ACAD.fechaPublicacion: 'fecha_publicacion',
+        ACAD.revista: 'revista', DCTERMS.date: 'anio_publicacion', DCTERMS.creator: 'autores',
+    },
+    'asignaciones_docentes': {
+        RDFS.label: 'descripcion', ACAD.horasAsignadas: 'horas_asignadas',
+        ACAD.asignadoA: 'docente', ACAD.cursoDictadoEn: 'curso', ACAD.asignadoEn: 'periodo',
+    },
+    'disponibilidades_horarias': {RDFS.label: 'etiqueta', RDFS.comment: 'descripcion', ACAD.disponibilidadDe: 'docente'},
+}
+# Columnas multivaluadas (el resto conserva el último valor)
+LISTAS = ('lineas', 'autores')
+
+# Propiedades inversas: se guardan en el sentido de la entidad que las importa.
+# acad:disponibilidadDe no existe en la ontología, solo se usa en la carga intermedia.
+INVERSAS = {
+    ACAD.tieneProduccion: DCTERMS.creator,
+    ACAD.tieneAsignacion: ACAD.asignadoA,
+    ACAD.tieneDisponibilidad: ACAD.disponibilidadDe,
+}
+
+# Propiedades que forman la clave natural de cada clase referenciable
+CLAVES = {
+    'areas': (RDFS.label,),
+    'lineas_investigacion': (RDFS.label,),
+    'periodos_academicos': (ACAD.anio, ACAD.semestre),
+    'cursos': (ACAD.codigo,),
+    'docentes': (FOAF.mbox,),
+}
+
+# Triples por escritura en la carga intermedia y caracteres por lectura de Turtle
+LOTE_TRIPLES = 10000
+BLOQUE_TURTLE = 1 << 20
+
+class _TripleSink:
+    """Destino de los parsers de rdflib: guarda en la carga intermedia solo los triples mapeables"""
+    identifier = None
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.total = 0
+        self._predicados = {RDF.type} | set(INVERSAS) | {p for propiedades in PROPIEDADES.values() for p in propiedades}
+        self._lote = []
+
+    def add(self, triple):
+        s, p, o = triple
+        self.total += 1
+        if p not in self._predicados:
+            return
+        if p in INVERSAS:
+            s, p, o = o, INVERSAS[p], s
+        es_recurso = isinstance(o, (URIRef, BNode))
+        if p == FOAF.mbox:
+            o, es_recurso = str(o).removeprefix('mailto:'), False
+        self._lote.append((self._nodo(s), str(p), self._nodo(o) if es_recurso else str(o), es_recurso))
+        if len(self._lote) >= LOTE_TRIPLES:
+            self.flush()
+
+    def triple(self, s, p, o):
+        self.add((s, p, o))
+
+    def get_context(self, _):
+        return self
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def flush(self):
+        if self._lote:
+            self.conexion.executemany("INSERT INTO triples (s, p, o, es_recurso) VALUES (?, ?, ?, ?)", self._lote)
+            self._lote = []
+
+    @staticmethod
+    def _nodo(nodo):
+        return f'_:{nodo}' if isinstance(nodo, BNode) else str(nodo)
+
+class RDFIngestService:
+    """
+    Carga de volcados RDF (RDF/XML, Turtle, N-Triples o N-Quads) en la base de datos relacional.
+    Los archivos se leen con los parsers incrementales de rdflib y los triples mapeables
+    se vuelcan por lotes a una base SQLite temporal en disco, de modo que la memoria no
+    depende del tamaño del volcado. Después cada clase se recorre ordenada por sujeto, se
+    convierte en filas con claves naturales (email, código, DOI...) y se escribe con
+    ImportService en transacciones por bloque.
+    """
+    def __init__(self, chunk_size=5000):
+        self.chunk_size = chunk_size
+
+    def ingerir(self, rutas, formato=None):
+        """Importa los archivos indicados; devuelve el reporte de triples leídos y filas por entidad"""
+        inicio = time.perf_counter()
+        with tempfile.TemporaryDirectory() as directorio:
+            conexion = sqlite3.connect(os.path.join(directorio, 'triples.db'))
+            try:
+                conexion.execute("PRAGMA journal_mode = OFF")
+                conexion.execute("PRAGMA synchronous = OFF")
+                conexion.execute("CREATE TABLE triples (s TEXT, p TEXT, o TEXT, es_recurso INTEGER)")
+                sink = _TripleSink(conexion)
+                for ruta in rutas:
+                    self._parsear(ruta, formato or FORMATOS.get(Path(ruta).suffix.lower(), 'xml'), sink)
+                sink.flush()
+                segundos_lectura = time.perf_counter() - inicio
+                self._indexar(conexion)
+
+                importador = ImportService(chunk_size=self.chunk_size)
+                entidades = {tabla: importador.importar(tabla, self._filas(conexion, tabla)) for tabla in CLASES}
+            finally:
+                conexion.close()
+
+        segundos = time.perf_counter() - inicio
+        return {
+            'triples': sink.total,
+            'triples_por_segundo': round(sink.total / segundos_lectura) if segundos_lectura > 0 else sink.total,
+            'entidades': entidades,
+            'segundos': round(segundos, 2)
+        }
+
+    def _parsear(self, ruta, formato, sink):
+        base = Path(ruta).absolute().as_uri()
+        with open(ruta, 'rb') as archivo:
+            if formato == 'xml':
+                fuente = InputSource(base)
+                fuente.setByteStream(archivo)
+                create_parser(fuente, sink).parse(fuente)
+            elif formato == 'nt':
+                W3CNTriplesParser(sink).parse(archivo)
+            elif formato == 'nquads':
+                # NQuadsParser.parse exige un ConjunctiveGraph; se usa el recorrido línea a línea de la clase base
+                W3CNTriplesParser.parse(NQuadsParser(sink), archivo)
+            elif formato == 'turtle':
+                self._parsear_turtle(io.TextIOWrapper(archivo, encoding='utf-8'), base, sink)
+            else:
+                raise ValueError(f"Formato no válido: {formato}. Opciones: xml, turtle, nt, nquads")
+
+    def _parsear_turtle(self, archivo, base, sink):
+        """El parser de Turtle de rdflib lee todo el texto; aquí se le entrega por bloques de sentencias completas"""
+        parser = SinkParser(RDFSink(sink), baseURI=base, turtle=True)
+        parser.startDoc()
+        pendiente = ''
+        while True:
+            bloque = archivo.read(BLOQUE_TURTLE)
+            pendiente += bloque
+            corte = self._fin_de_sentencias(pendiente) if bloque else len(pendiente)
+            if corte:
+                parser.feed(pendiente[:corte])
+                pendiente = pendiente[corte:]
+            if not bloque:
+                break
+        parser.endDoc()
+
+    @staticmethod
+    def _fin_de_sentencias(texto):
+        """Posición tras el último '.' de fin de línea que no está dentro de un literal multilínea"""
+        for fin in reversed([m.end() for m in re.finditer(r'\.[ \t]*\r?\n', texto)]):
+            if texto.count('"""', 0, fin) % 2 == 0 and texto.count("'''", 0, fin) % 2 == 0:
+                return fin
+        return 0
+
+    def _indexar(self, conexion):
+        """Tipos de cada sujeto y claves naturales de las entidades referenciables"""
+        conexion.execute("CREATE INDEX ix_triples_s ON triples (s)")
+        conexion.execute("CREATE TABLE tipos (s TEXT, tabla TEXT)")
+        conexion.executemany(
+            "INSERT INTO tipos SELECT DISTINCT s, ? FROM triples WHERE p = ? AND o = ?",
+            [(tabla, str(RDF.type), str(clase)) for tabla, clase in CLASES.items()]
+        )
+        conexion.execute("CREATE INDEX ix_tipos ON tipos (tabla, s)")
+        conexion.execute("CREATE TABLE claves (uri TEXT PRIMARY KEY, k1 TEXT, k2 TEXT)")
+        for tabla, predicados in CLAVES.items():
+            if len(predicados) == 1:
+                conexion.execute(
+                    """INSERT OR REPLACE INTO claves SELECT t.s, t.o, NULL FROM tipos ty JOIN triples t ON t.s = ty.s
+                       WHERE ty.tabla = ? AND t.p = ?""",
+                    (tabla, str(predicados[0]))
+                )
+            else:
+                conexion.execute(
+                    """INSERT OR REPLACE INTO claves SELECT a.s, a.o, b.o FROM tipos ty
+                       JOIN triples a ON a.s = ty.s AND a.p = ? JOIN triples b ON b.s = ty.s AND b.p = ?
+                       WHERE ty.tabla = ?""",
+                    (str(predicados[0]), str(predicados[1]), tabla)
+                )
+
+    def _filas(self, conexion, tabla):
+        """Itera las filas de importación de una clase, agrupando los triples ordenados por sujeto"""
+        propiedades = {str(p): columna for p, columna in PROPIEDADES[tabla].items()}
+        cursor = conexion.execute(
+            """SELECT t.s, t.p, t.o, t.es_recurso, k.k1, k.k2 FROM tipos ty JOIN triples t ON t.s = ty.s
+               LEFT JOIN claves k ON t.es_recurso AND k.uri = t.o
+               WHERE ty.tabla = ? ORDER BY t.s, t.rowid""",
+            (tabla,)
+        )
+        sujeto, fila = None, None
+        for s, p, o, es_recurso, k1, k2 in cursor:
+            if s != sujeto:
+                if fila is not None:
+                    yield self._completar(fila)
+                sujeto, fila = s, {}
+            columna = propiedades.get(p)
+            if columna is None:
+                continue
+            valor = o
+            if es_recurso:
+                # Las referencias se entregan por clave natural (la URI si no se encontró la entidad)
+                if columna == 'periodo':
+                    fila['anio'], fila['semestre'] = (k1, k2) if k1 is not None else (o, o)
+                    continue
+                valor = k1 if k1 is not None else o
+            if columna in LISTAS:
+                fila.setdefault(columna, []).append(valor)
+            else:
+                fila[columna] = valor
+        if fila is not None:
+            yield self._completar(fila)
+
+    @staticmethod
+    def _completar(fila):
+        # Disponibilidades sin rdfs:comment se describen con su etiqueta
+        etiqueta = fila.pop('etiqueta', None)
+        if 'descripcion' not in fila and etiqueta is not None:
+            fila['descripcion'] = etiqueta
+        return fila
@@ -1,149 +1,364 @@
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, OWL, XSD, FOAF, DCTERMS
+from rdflib.plugins.serializers.nt import _nt_row
+from sqlalchemy import select
 from app.models.models import (
     Docente, Curso, LineaInvestigacion, PeriodoAcademico, 
-    AsignacionDocente, ProduccionAcademica, DisponibilidadHoraria, Area
+    AsignacionDocente, ProduccionAcademica, DisponibilidadHoraria, Area,
+    MODELOS_POR_TABLA, docentes_lineas_investigacion, cursos_lineas_investigacion,
+    docentes_producciones_academicas
 )
 from app import db
 
+# Prefijo de URI usado para cada tabla (p. ej. acad:docente7)
+URI_PREFIJOS = {
+    'areas': 'area',
+    'lineas_investigacion': 'linea',
+    'periodos_academicos': 'periodo',
+    'cursos': 'curso',
+    'docentes': 'docente',
+    'disponibilidades_horarias': 'disponibilidad',
+    'producciones_academicas': 'pub',
+    'asignaciones_docentes': 'asignacion',
+}
+
+# Base de los grafos con nombre (uno por tipo de entidad) usados en N-Quads
+GRAFOS_BASE = "http://cramsoft.org/academico/grafos/"
+
 class RDFService:
     def __init__(self):
-        self.g = Graph()
         self.ns = Namespace("http://cramsoft.org/academico#")
-        self.g.bind("acad", self.ns)
-        self.g.bind("foaf", FOAF)
-        self.g.bind("dcterms", DCTERMS)
-        self.g.bind("bibo", Namespace("http://purl.org/ontology/bibo/"))
+        self.g = self.new_graph()
+        self._tablas_por_prefijo = {prefijo: tabla for tabla, prefijo in URI_PREFIJOS.items()}
+        self._uri_regex = re.compile(rf"^{re.escape(str(self.ns))}([a-z]+)(\d+)$")
+    
+    def new_graph(self):
+        """Crea un grafo vacío con los namespaces del proyecto"""
+        g = Graph()
+        g.bind("acad", self.ns)
+        g.bind("foaf", FOAF)
+        g.bind("dcterms", DCTERMS)
+        g.bind("bibo", Namespace("http://purl.org/ontology/bibo/"))
+        return g
+    
+    def uri(self, tabla, entity_id):
+        """URI de una entidad a partir de su tabla e id"""
+        return URIRef(f"{self.ns}{URI_PREFIJOS[tabla]}{entity_id}")
+    
+    def key_from_uri(self, uri):
+        """Clave (tabla, id) de una URI generada por este servicio, o None"""
+        match = self._uri_regex.match(str(uri))
+        if not match or match.group(1) not in self._tablas_por_prefijo:
+            return None
+        return self._tablas_por_prefijo[match.group(1)], int(match.group(2))
         
     def generate_rdf_from_database(self):
         """Genera RDF completo desde la base de datos."""
-        self.g = Graph()
-        # Re-bind namespaces for the new graph
-        self.g.bind("acad", self.ns)
-        self.g.bind("foaf", FOAF)
-        self.g.bind("dcterms", DCTERMS)
-        self.g.bind("bibo", Namespace("http://purl.org/ontology/bibo/"))
+        self.g = self.new_graph()
+        for _, triples in self.iter_entity_triples():
+            for triple in triples:
+                self.g.add(triple)
+        return self.g
+    
+    def iter_entity_triples(self, ids_por_tabla=None):
+        """
+        Itera ((tabla, id), triples) para cada entidad de la base de datos.
+        Cada tabla y cada tabla de asociación se consulta una sola vez y las
+        relaciones se unen en memoria, así el número de consultas es constante
+        (11 para la generación completa) sin importar la cantidad de filas.
+        Con ids_por_tabla ({tabla: ids}) solo se generan esas entidades.
+        """
+        def filas(modelo):
+            if ids_por_tabla is None:
+                return modelo.query.all()
+            ids = ids_por_tabla.get(modelo.__tablename__)
+            if not ids:
+                return []
+            return modelo.query.filter(modelo.id.in_(ids)).all()
         
-        # Generar RDF para cada entidad
-        self._generate_areas_rdf()
-        self._generate_lineas_investigacion_rdf()
-        self._generate_periodos_academicos_rdf()
-        self._generate_cursos_rdf()
-        self._generate_docentes_rdf()
-        self._generate_disponibilidades_horarias_rdf()
-        self._generate_producciones_academicas_rdf()
-        self._generate_asignaciones_docentes_rdf()
+        for item in filas(Area):
+            yield ('areas', item.id), self._area_triples(item)
+        for item in filas(LineaInvestigacion):
+            yield ('lineas_investigacion', item.id), self._linea_investigacion_triples(item)
+        for item in filas(PeriodoAcademico):
+            yield ('periodos_academicos', item.id), self._periodo_academico_triples(item)
         
-        return self.g
+        cursos = filas(Curso)
+        lineas_por_curso = self._group_association(cursos_lineas_investigacion.c.curso_id, cursos_lineas_investigacion.c.linea_investigacion_id, cursos, ids_por_tabla)
+        for item in cursos:
+            yield ('cursos', item.id), self._curso_triples(item, lineas_por_curso.get(item.id, []))
+        
+        docentes = filas(Docente)
+        lineas_por_docente = self._group_association(docentes_lineas_investigacion.c.docente_id, docentes_lineas_investigacion.c.linea_investigacion_id, docentes, ids_por_tabla)
+        for item in docentes:
+            yield ('docentes', item.id), self._docente_triples(item, lineas_por_docente.get(item.id, []))
+        
+        disponibilidades = filas(DisponibilidadHoraria)
+        nombres_docentes = {}
+        if ids_por_tabla is None:
+            nombres_docentes = {docente.id: docente.nombre for docente in docentes}
+        elif disponibilidades:
+            docente_ids = {item.docente_id for item in disponibilidades}
+            nombres_docentes = dict(db.session.execute(
+                select(Docente.id, Docente.nombre).where(Docente.id.in_(docente_ids))
+            ).all())
+        for item in disponibilidades:
+            yield ('disponibilidades_horarias', item.id), self._disponibilidad_horaria_triples(item, nombres_docentes.get(item.docente_id))
+        
+        producciones = filas(ProduccionAcademica)
+        autores_por_produccion = self._group_association(docentes_producciones_academicas.c.produccion_academica_id, docentes_producciones_academicas.c.docente_id, producciones, ids_por_tabla)
+        for item in producciones:
+            yield ('producciones_academicas', item.id), self._produccion_academica_triples(item, autores_por_produccion.get(item.id, []))
+        
+        for item in filas(AsignacionDocente):
+            yield ('asignaciones_docentes', item.id), self._asignacion_docente_triples(item)
+    
+    def describe_docente(self, docente_id):
+        """
+        Descripción acotada (al estilo Concise Bounded Description) de un docente.
+        Solo se consultan las filas alcanzables desde él: líneas de investigación,
+        asignaciones, producciones y disponibilidades, por lo que el costo depende
+        del vecindario del docente y no del tamaño de la institución.
+        """
+        ids_por_tabla = {
+            'docentes': {docente_id},
+            'lineas_investigacion': set(db.session.scalars(
+                select(docentes_lineas_investigacion.c.linea_investigacion_id)
+                .where(docentes_lineas_investigacion.c.docente_id == docente_id)
+            )),
+            'producciones_academicas': set(db.session.scalars(
+                select(docentes_producciones_academicas.c.produccion_academica_id)
+                .where(docentes_producciones_academicas.c.docente_id == docente_id)
+            )),
+            'asignaciones_docentes': set(db.session.scalars(
+                select(AsignacionDocente.id).where(AsignacionDocente.docente_id == docente_id)
+            )),
+            'disponibilidades_horarias': set(db.session.scalars(
+                select(DisponibilidadHoraria.id).where(DisponibilidadHoraria.docente_id == docente_id)
+            )),
+        }
+        graph = self.new_graph()
+        for _, triples in self.iter_entity_triples(ids_por_tabla):
+            for triple in triples:
+                graph.add(triple)
+        return graph
+    
+    def _group_association(self, columna_clave, columna_valor, items, ids_por_tabla):
+        """Lee una tabla de asociación en una sola consulta y la agrupa por columna_clave"""
+        agrupado = {}
+        if not items:
+            return agrupado
+        statement = select(columna_clave, columna_valor)
+        if ids_por_tabla is not None:
+            statement = statement.where(columna_clave.in_([item.id for item in items]))
+        for clave, valor in db.session.execute(statement):
+            agrupado.setdefault(clave, []).append(valor)
+        return agrupado
+    
+    def graph_uri(self, tabla):
+        """URI del grafo con nombre que agrupa a las entidades de una tabla"""
+        return URIRef(f"{GRAFOS_BASE}{tabla}")
+    
+    def iter_stream_triples(self, batch_size=1000, tablas=None):
+        """
+        Itera (tabla, triple) recorriendo las tablas con cursores del lado del servidor.
+        Las relaciones muchos a muchos se leen directamente de las tablas de asociación,
+        de modo que nunca se mantiene más de un lote de filas en memoria.
+        Los triples de cada tabla salen contiguos; con tablas se limita el recorrido.
+        """
+        def incluir(tabla):
+            return tablas is None or tabla in tablas
+        
+        if incluir('areas'):
+            for item in Area.query.yield_per(batch_size):
+                for triple in self._area_triples(item):
+                    yield 'areas', triple
+        if incluir('lineas_investigacion'):
+            for item in LineaInvestigacion.query.yield_per(batch_size):
+                for triple in self._linea_investigacion_triples(item):
+                    yield 'lineas_investigacion', triple
+        if incluir('periodos_academicos'):
+            for item in PeriodoAcademico.query.yield_per(batch_size):
+                for triple in self._periodo_academico_triples(item):
+                    yield 'periodos_academicos', triple
+        if incluir('cursos'):
+            for item in Curso.query.yield_per(batch_size):
+                for triple in self._curso_triples(item, []):
+                    yield 'cursos', triple
+            for curso_id, linea_id in self._stream_rows(select(cursos_lineas_investigacion), batch_size):
+                yield 'cursos', (self.uri('cursos', curso_id), self.ns.relacionadoConLinea, self.uri('lineas_investigacion', linea_id))
+        if incluir('docentes'):
+            for item in Docente.query.yield_per(batch_size):
+                for triple in self._docente_triples(item, []):
+                    yield 'docentes', triple
+            for docente_id, linea_id in self._stream_rows(select(docentes_lineas_investigacion), batch_size):
+                yield 'docentes', (self.uri('docentes', docente_id), self.ns.perteneceLinea, self.uri('lineas_investigacion', linea_id))
+        if incluir('disponibilidades_horarias'):
+            disponibilidades = db.session.query(DisponibilidadHoraria, Docente.nombre).join(
+                Docente, DisponibilidadHoraria.docente_id == Docente.id
+            )
+            for item, docente_nombre in disponibilidades.yield_per(batch_size):
+                for triple in self._disponibilidad_horaria_triples(item, docente_nombre):
+                    yield 'disponibilidades_horarias', triple
+        if incluir('producciones_academicas'):
+            for item in ProduccionAcademica.query.yield_per(batch_size):
+                for triple in self._produccion_academica_triples(item, []):
+                    yield 'producciones_academicas', triple
+            for docente_id, produccion_id in self._stream_rows(select(docentes_producciones_academicas), batch_size):
+                yield 'producciones_academicas', (self.uri('docentes', docente_id), self.ns.tieneProduccion, self.uri('producciones_academicas', produccion_id))
+        if incluir('asignaciones_docentes'):
+            for item in AsignacionDocente.query.yield_per(batch_size):
+                for triple in self._asignacion_docente_triples(item):
+                    yield 'asignaciones_docentes', triple
     
-    def _generate_areas_rdf(self):
+    def _stream_rows(self, statement, batch_size):
+        return db.session.execute(statement.execution_options(yield_per=batch_size))
+    
+    def stream_ntriples(self, quads=False, batch_size=1000, chunk_size=64 * 1024):
+        """
+        Genera el RDF en N-Triples (o N-Quads, con un grafo por tipo de entidad)
+        en bloques de texto de ~chunk_size bytes, sin materializar el grafo.
+        Los triples compartidos (p. ej. acad:dicta) pueden aparecer repetidos,
+        lo cual no altera el grafo resultante.
+        """
+        buffer = []
+        size = 0
+        for tabla, triple in self.iter_stream_triples(batch_size):
+            line = _nt_row(triple)
+            if quads:
+                line = f"{line[:-3]} {self.graph_uri(tabla).n3()} .\n"
+            buffer.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer)
+    
+    def _area_triples(self, item):
         """Genera RDF para áreas académicas"""
-        for item in Area.query.all():
-            uri = URIRef(f"{self.ns}area{item.id}")
-            self.g.add((uri, RDF.type, self.ns.Area))
-            self.g.add((uri, RDFS.label, Literal(item.nombre)))
-            if item.descripcion:
-                self.g.add((uri, RDFS.comment, Literal(item.descripcion)))
-    
-    def _generate_lineas_investigacion_rdf(self):
+        uri = self.uri('areas', item.id)
+        triples = [
+            (uri, RDF.type, self.ns.Area),
+            (uri, RDFS.label, Literal(item.nombre)),
+        ]
+        if item.descripcion:
+            triples.append((uri, RDFS.comment, Literal(item.descripcion)))
+        return triples
+    
+    def _linea_investigacion_triples(self, item):
         """Genera RDF para líneas de investigación"""
-        for item in LineaInvestigacion.query.all():
-            uri = URIRef(f"{self.ns}linea{item.id}")
-            self.g.add((uri, RDF.type, self.ns.LineaInvestigacion))
-            self.g.add((uri, RDFS.label, Literal(item.nombre)))
-            if item.descripcion:
-                self.g.add((uri, RDFS.comment, Literal(item.descripcion)))
-            if item.area_id:
-                area_uri = URIRef(f"{self.ns}area{item.area_id}")
-                self.g.add((uri, self.ns.subAreaDe, area_uri))
-    
-    def _generate_periodos_academicos_rdf(self):
+        uri = self.uri('lineas_investigacion', item.id)
+        triples = [
+            (uri, RDF.type, self.ns.LineaInvestigacion),
+            (uri, RDFS.label, Literal(item.nombre)),
+        ]
+        if item.descripcion:
+            triples.append((uri, RDFS.comment, Literal(item.descripcion)))
+        if item.area_id:
+            triples.append((uri, self.ns.subAreaDe, self.uri('areas', item.area_id)))
+        return triples
+    
+    def _periodo_academico_triples(self, item):
         """Genera RDF para períodos académicos"""
-        for item in PeriodoAcademico.query.all():
-            uri = URIRef(f"{self.ns}periodo{item.id}")
-            self.g.add((uri, RDF.type, self.ns.PeriodoAcademico))
-            self.g.add((uri, RDFS.label, Literal(item.nombre)))
-            if item.anio: self.g.add((uri, self.ns.anio, Literal(item.anio, datatype=XSD.integer)))
-            if item.semestre: self.g.add((uri, self.ns.semestre, Literal(item.semestre, datatype=XSD.integer)))
-            if item.descripcion: self.g.add((uri, RDFS.comment, Literal(item.descripcion)))
-    
-    def _generate_cursos_rdf(self):
+        uri = self.uri('periodos_academicos', item.id)
+        triples = [
+            (uri, RDF.type, self.ns.PeriodoAcademico),
+            (uri, RDFS.label, Literal(item.nombre)),
+        ]
+        if item.anio: triples.append((uri, self.ns.anio, Literal(item.anio, datatype=XSD.integer)))
+        if item.semestre: triples.append((uri, self.ns.semestre, Literal(item.semestre, datatype=XSD.integer)))
+        if item.descripcion: triples.append((uri, RDFS.comment, Literal(item.descripcion)))
+        return triples
+    
+    def _curso_triples(self, item, lineas_ids):
         """Genera RDF para cursos"""
-        for item in Curso.query.all():
-            uri = URIRef(f"{self.ns}curso{item.id}")
-            self.g.add((uri, RDF.type, self.ns.Curso))
-            self.g.add((uri, RDFS.label, Literal(item.nombre)))
-            if item.codigo: self.g.add((uri, self.ns.codigo, Literal(item.codigo)))
-            if item.creditos: self.g.add((uri, self.ns.creditos, Literal(item.creditos, datatype=XSD.integer)))
-            if item.area_id:
-                area_uri = URIRef(f"{self.ns}area{item.area_id}")
-                self.g.add((uri, self.ns.perteneceAArea, area_uri))
-            for linea in item.lineas_investigacion:
-                linea_uri = URIRef(f"{self.ns}linea{linea.id}")
-                self.g.add((uri, self.ns.relacionadoConLinea, linea_uri))
-    
-    def _generate_docentes_rdf(self):
+        uri = self.uri('cursos', item.id)
+        triples = [
+            (uri, RDF.type, self.ns.Curso),
+            (uri, RDFS.label, Literal(item.nombre)),
+        ]
+        if item.codigo: triples.append((uri, self.ns.codigo, Literal(item.codigo)))
+        if item.creditos: triples.append((uri, self.ns.creditos, Literal(item.creditos, datatype=XSD.integer)))
+        if item.area_id:
+            triples.append((uri, self.ns.perteneceAArea, self.uri('areas', item.area_id)))
+        for linea_id in lineas_ids:
+            triples.append((uri, self.ns.relacionadoConLinea, self.uri('lineas_investigacion', linea_id)))
+        return triples
+    
+    def _docente_triples(self, item, lineas_ids):
         """Genera RDF para docentes"""
-        for item in Docente.query.all():
-            uri = URIRef(f"{self.ns}docente{item.id}")
-            self.g.add((uri, RDF.type, self.ns.Docente))
-            self.g.add((uri, RDF.type, FOAF.Person))
-            self.g.add((uri, FOAF.name, Literal(item.nombre)))
-            if item.titulo: self.g.add((uri, FOAF.title, Literal(item.titulo)))
-            if item.email: self.g.add((uri, FOAF.mbox, Literal(item.email)))
-            if item.grado_academico: self.g.add((uri, self.ns.gradoAcademico, Literal(item.grado_academico)))
-            if item.especialidad: self.g.add((uri, self.ns.especialidad, Literal(item.especialidad)))
-            if item.orcid: self.g.add((uri, self.ns.orcid, Literal(item.orcid)))
-            for linea in item.lineas_investigacion:
-                linea_uri = URIRef(f"{self.ns}linea{linea.id}")
-                self.g.add((uri, self.ns.perteneceLinea, linea_uri))
-    
-    def _generate_disponibilidades_horarias_rdf(self):
+        uri = self.uri('docentes', item.id)
+        triples = [
+            (uri, RDF.type, self.ns.Docente),
+            (uri, RDF.type, FOAF.Person),
+            (uri, FOAF.name, Literal(item.nombre)),
+        ]
+        if item.titulo: triples.append((uri, FOAF.title, Literal(item.titulo)))
+        if item.email: triples.append((uri, FOAF.mbox, Literal(item.email)))
+        if item.grado_academico: triples.append((uri, self.ns.gradoAcademico, Literal(item.grado_academico)))
+        if item.especialidad: triples.append((uri, self.ns.especialidad, Literal(item.especialidad)))
+        if item.orcid: triples.append((uri, self.ns.orcid, Literal(item.orcid)))
+        for linea_id in lineas_ids:
+            triples.append((uri, self.ns.perteneceLinea, self.uri('lineas_investigacion', linea_id)))
+        return triples
+    
+    def _disponibilidad_horaria_triples(self, item, docente_nombre):
         """Genera RDF para disponibilidad horaria"""
-        for item in DisponibilidadHoraria.query.all():
-            uri = URIRef(f"{self.ns}disponibilidad{item.id}")
-            docente_uri = URIRef(f"{self.ns}docente{item.docente_id}")
-            self.g.add((uri, RDF.type, self.ns.DisponibilidadHoraria))
-            self.g.add((uri, RDFS.label, Literal(f"Disponibilidad de {item.docente.nombre}")))
-            if item.descripcion: self.g.add((uri, RDFS.comment, Literal(item.descripcion)))
-            self.g.add((docente_uri, self.ns.tieneDisponibilidad, uri))
-    
-    def _generate_producciones_academicas_rdf(self):
+        uri = self.uri('disponibilidades_horarias', item.id)
+        docente_uri = self.uri('docentes', item.docente_id)
+        triples = [
+            (uri, RDF.type, self.ns.DisponibilidadHoraria),
+            (uri, RDFS.label, Literal(f"Disponibilidad de {docente_nombre}")),
+        ]
+        if item.descripcion: triples.append((uri, RDFS.comment, Literal(item.descripcion)))
+        triples.append((docente_uri, self.ns.tieneDisponibilidad, uri))
+        return triples
+    
+    def _produccion_academica_triples(self, item, autores_ids):
         """Genera RDF para producción académica"""
-        for item in ProduccionAcademica.query.all():
-            uri = URIRef(f"{self.ns}pub{item.id}")
-            self.g.add((uri, RDF.type, self.ns.ProduccionAcademica))
-            self.g.add((uri, RDF.type, URIRef("http://purl.org/ontology/bibo/Document")))
-            if item.titulo: self.g.add((uri, self.ns.titulo, Literal(item.titulo)))
-            if item.doi: self.g.add((uri, self.ns.doi, Literal(item.doi)))
-            if item.fecha_publicacion: self.g.add((uri, self.ns.fechaPublicacion, Literal(item.fecha_publicacion, datatype=XSD.date)))
-            if item.revista: self.g.add((uri, self.ns.revista, Literal(item.revista)))
-            if item.anio_publicacion: self.g.add((uri, DCTERMS.date, Literal(item.anio_publicacion, datatype=XSD.gYear)))
-            for autor in item.autores:
-                autor_uri = URIRef(f"{self.ns}docente{autor.id}")
-                self.g.add((autor_uri, self.ns.tieneProduccion, uri))
-    
-    def _generate_asignaciones_docentes_rdf(self):
+        uri = self.uri('producciones_academicas', item.id)
+        triples = [
+            (uri, RDF.type, self.ns.ProduccionAcademica),
+            (uri, RDF.type, URIRef("http://purl.org/ontology/bibo/Document")),
+        ]
+        if item.titulo: triples.append((uri, self.ns.titulo, Literal(item.titulo)))
+        if item.doi: triples.append((uri, self.ns.doi, Literal(item.doi)))
+        if item.fecha_publicacion: triples.append((uri, self.ns.fechaPublicacion, Literal(item.fecha_publicacion, datatype=XSD.date)))
+        if item.revista: triples.append((uri, self.ns.revista, Literal(item.revista)))
+        if item.anio_publicacion: triples.append((uri, DCTERMS.date, Literal(item.anio_publicacion, datatype=XSD.gYear)))
+        for autor_id in autores_ids:
+            triples.append((self.uri('docentes', autor_id), self.ns.tieneProduccion, uri))
+        return triples
+    
+    def _asignacion_docente_triples(self, item):
         """Genera RDF para asignaciones de docentes"""
-        for item in AsignacionDocente.query.all():
-            uri = URIRef(f"{self.ns}asignacion{item.id}")
-            docente_uri = URIRef(f"{self.ns}docente{item.docente_id}")
-            curso_uri = URIRef(f"{self.ns}curso{item.curso_id}")
-            periodo_uri = URIRef(f"{self.ns}periodo{item.periodo_id}")
-            
-            self.g.add((uri, RDF.type, self.ns.AsignacionDocente))
-            if item.descripcion:
-                self.g.add((uri, RDFS.label, Literal(item.descripcion)))
-            
-            # Relaciones
-            self.g.add((uri, self.ns.asignadoA, docente_uri))
-            self.g.add((docente_uri, self.ns.tieneAsignacion, uri)) # Inversa
-            self.g.add((uri, self.ns.cursoDictadoEn, curso_uri))
-            self.g.add((uri, self.ns.asignadoEn, periodo_uri))
-            self.g.add((docente_uri, self.ns.dicta, curso_uri)) # Relación directa Docente-Curso
-            
-            if item.horas_asignadas:
-                self.g.add((uri, self.ns.horasAsignadas, Literal(item.horas_asignadas, datatype=XSD.integer)))
+        uri = self.uri('asignaciones_docentes', item.id)
+        docente_uri = self.uri('docentes', item.docente_id)
+        curso_uri = self.uri('cursos', item.curso_id)
+        periodo_uri = self.uri('periodos_academicos', item.periodo_id)
+        
+        triples = [(uri, RDF.type, self.ns.AsignacionDocente)]
+        if item.descripcion:
+            triples.append((uri, RDFS.label, Literal(item.descripcion)))
+        
+        # Relaciones
+        triples.extend([
+            (uri, self.ns.asignadoA, docente_uri),
+            (docente_uri, self.ns.tieneAsignacion, uri), # Inversa
+            (uri, self.ns.cursoDictadoEn, curso_uri),
+            (uri, self.ns.asignadoEn, periodo_uri),
+            (docente_uri, self.ns.dicta, curso_uri), # Relación directa Docente-Curso
+        ])
+        
+        if item.horas_asignadas:
+            triples.append((uri, self.ns.horasAsignadas, Literal(item.horas_asignadas, datatype=XSD.integer)))
+        return triples
     
     def export_rdf_xml(self):
         """Exporta el grafo RDF en formato XML"""
@@ -155,4 +370,134 @@ class RDFService:
     
     def export_rdf_jsonld(self):
         """Exporta el grafo RDF en formato JSON-LD"""
-        return self.g.serialize(format='json-ld') 
\ No newline at end of file
+        return self.g.serialize(format='json-ld')
+
+class RDFGraphCache:
+    """
+    Grafo RDF de larga duración compartido por todo el proceso.
+    Se genera una sola vez desde la base de datos y luego se mantiene al día
+    con los eventos after_insert/after_update/after_delete de los modelos:
+    cada cambio retira y vuelve a agregar solo los triples de la entidad afectada.
+    """
+    def __init__(self, rdf_service=None):
+        self.rdf_service = rdf_service or RDFService()
+        self.ns = self.rdf_service.ns
+        self._lock = threading.RLock()
+        self._graph = None
+        self._triples_por_entidad = {}
+        self._referencias = Counter()
+    
+    @property
+    def is_warm(self):
+        return self._graph is not None
+    
+    def rebuild(self):
+        """Regenera el grafo completo desde la base de datos"""
+        graph = self.rdf_service.new_graph()
+        triples_por_entidad = {}
+        referencias = Counter()
+        for clave, triples in self.rdf_service.iter_entity_triples():
+            triples = frozenset(triples)
+            triples_por_entidad[clave] = triples
+            referencias.update(triples)
+        graph.addN((s, p, o, graph) for s, p, o in referencias)
+        with self._lock:
+            self._graph = graph
+            self._triples_por_entidad = triples_por_entidad
+            self._referencias = referencias
+        return graph
+    
+    @property
+    def total_triples(self):
+        """Cantidad de triples distintos del grafo (se genera si aún no existe)"""
+        with self.read():
+            return len(self._referencias)
+    
+    @contextmanager
+    def read(self):
+        """Acceso de solo lectura al grafo (se genera si aún no existe)"""
+        with self._lock:
+            if self._graph is None:
+                self.rebuild()
+            yield self._graph
+    
+    def serialize(self, format):
+        """Serializa el grafo en memoria sin consultar la base de datos"""
+        with self.read() as graph:
+            return graph.serialize(format=format)
+    
+    def iter_stream_triples(self, tablas=None, **kwargs):
+        """Itera (tabla, triple) desde el grafo en memoria, con los triples de cada tabla contiguos"""
+        with self.read():
+            por_tabla = {}
+            for (tabla, _), triples in self._triples_por_entidad.items():
+                if tablas is None or tabla in tablas:
+                    por_tabla.setdefault(tabla, []).append(triples)
+        for tabla in URI_PREFIJOS:
+            for triples in por_tabla.get(tabla, []):
+                for triple in triples:
+                    yield tabla, triple
+    
+    def preparar(self, session, cambios):
+        """Calcula los nuevos triples de las entidades modificadas en el flush"""
+        if self._graph is None:
+            return None
+        
+        eliminadas = {(tabla, entity_id) for tabla, entity_id, operacion in cambios if operacion == 'delete'}
+        claves = {(tabla, entity_id) for tabla, entity_id, _ in cambios if tabla in MODELOS_POR_TABLA}
+        claves |= self._dependientes(claves, eliminadas)
+        
+        # Las entidades que ya no existen se retiran; el resto se regenera en bloque
+        payload = dict.fromkeys(claves)
+        ids_por_tabla = {}
+        for tabla, entity_id in claves - eliminadas:
+            ids_por_tabla.setdefault(tabla, set()).add(entity_id)
+        for clave, triples in self.rdf_service.iter_entity_triples(ids_por_tabla):
+            payload[clave] = frozenset(triples)
+        return payload
+    
+    def _dependientes(self, claves, eliminadas):
+        """Entidades cuyos triples dependen de las entidades modificadas"""
+        dependientes = set()
+        with self._lock:
+            for tabla, entity_id in claves:
+                uri = self.rdf_service.uri(tabla, entity_id)
+                if (tabla, entity_id) in eliminadas:
+                    # Quien apunte a una entidad eliminada debe regenerarse
+                    for sujeto in self._graph.subjects(None, uri):
+                        clave = self.rdf_service.key_from_uri(sujeto)
+                        if clave and clave != (tabla, entity_id):
+                            dependientes.add(clave)
+                if tabla == 'docentes':
+                    # La etiqueta de la disponibilidad y la autoría dependen del docente;
+                    # si el docente se eliminó, la producción debe retirar el triple de autoría
+                    for objeto in self._graph.objects(uri, self.ns.tieneDisponibilidad):
+                        dependientes.add(self.rdf_service.key_from_uri(objeto))
+                    for objeto in self._graph.objects(uri, self.ns.tieneProduccion):
+                        dependientes.add(self.rdf_service.key_from_uri(objeto))
+        dependientes.discard(None)
+        return dependientes
+    
+    def aplicar(self, payload):
+        """Aplica los triples calculados en preparar() una vez confirmada la transacción"""
+        with self._lock:
+            if self._graph is None:
+                return
+            for clave, nuevos in payload.items():
+                self._replace_entity(clave, nuevos or frozenset())
+    
+    def _replace_entity(self, clave, nuevos):
+        anteriores = self._triples_por_entidad.pop(clave, frozenset())
+        for triple in anteriores - nuevos:
+            self._referencias[triple] -= 1
+            if self._referencias[triple] <= 0:
+                del self._referencias[triple]
+                self._graph.remove(triple)
+        for triple in nuevos - anteriores:
+            self._referencias[triple] += 1
+            self._graph.add(triple)
+        if nuevos:
+            self._triples_por_entidad[clave] = nuevos
+
+# Grafo compartido por todos los blueprints del proceso
+rdf_graph_cache = RDFGraphCache()
@@ -0,0 +1,82 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from app.utils.change_tracking import dataset_version
+
+class SPARQLResultCache:
+    """
+    Caché LRU acotada de resultados SPARQL.
+    La clave es el texto normalizado de la consulta más la versión del dataset,
+    por lo que cualquier escritura confirmada invalida los resultados anteriores.
+    """
+    def __init__(self, max_entries=512, default_ttl=300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    @staticmethod
+    def normalize(query):
+        """Normaliza espacios para que consultas equivalentes compartan entrada"""
+        return re.sub(r'\s+', ' ', query).strip()
+    
+    def key(self, query):
+        """
+        Clave de la consulta con la versión actual del dataset. Se calcula antes de
+        ejecutarla y se usa tanto en get() como en set(): si una escritura se confirma
+        mientras la consulta corre, el resultado queda bajo la versión anterior.
+        """
+        return self.normalize(query), dataset_version.value
+    
+    def get(self, key):
+        """Devuelve el resultado en caché o None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+    
+    def set(self, key, result, ttl=None):
+        """Guarda un resultado; ttl (segundos) reemplaza al TTL por defecto, 0 desactiva la caché"""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entradas': len(self._entries),
+                'max_entradas': self.max_entries,
+                'ttl_por_defecto': self.default_ttl,
+                'version_dataset': dataset_version.value,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_ratio': round(self.hits / total, 4) if total else 0
+            }
@@ -1,14 +1,118 @@
-from SPARQLWrapper import SPARQLWrapper, JSON
+import json
+import threading
+import time
+from collections import OrderedDict
 import requests
-from app.services.rdf_service import RDFService
-from app.models.models import Docente, Curso, LineaInvestigacion, AsignacionDocente, PeriodoAcademico
-from app import db
-from sqlalchemy import func
+from requests.adapters import HTTPAdapter
+from rdflib import URIRef, BNode
+from rdflib.namespace import RDF, RDFS, XSD, FOAF, DCTERMS
+from rdflib.plugins.sparql import prepareQuery
+from app.services.rdf_service import rdf_graph_cache
+from app.services.sparql_cache import SPARQLResultCache
+from app.utils.profiling import medir
+from config import Config
+
+class SPARQLTransport:
+    """
+    Cliente HTTP hacia el endpoint SPARQL con un pool de conexiones keep-alive
+    compartido, para no abrir una conexión TCP nueva en cada consulta.
+    """
+    def __init__(self, endpoint, pool_size=10, connect_timeout=3.05, read_timeout=30):
+        self.endpoint = endpoint
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        # Un único host; pool_block evita abrir más conexiones que hilos del worker
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/sparql-results+json, application/ld+json;q=0.9'
+        })
+    
+    def query(self, query):
+        """Envía la consulta (POST form-encoded) y devuelve la respuesta JSON"""
+        response = self.session.post(self.endpoint, data={'query': query}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def close(self):
+        self.session.close()
+
+class EndpointBreaker:
+    """
+    Corte de circuito del endpoint SPARQL: tras un fallo de conexión las consultas van
+    directo al motor local, sin esperar el timeout de conexión en cada una. La espera se
+    duplica con cada fallo consecutivo (hasta max_espera); al vencer, una sola consulta
+    vuelve a probar el endpoint y, si responde, se cierra el circuito.
+    """
+    def __init__(self, espera_inicial=5, max_espera=300):
+        self.espera_inicial = espera_inicial
+        self.max_espera = max_espera
+        self._lock = threading.Lock()
+        self._fallos = 0
+        self._abierto_hasta = 0.0
+
+    def permitir(self):
+        """True si se puede consultar el endpoint (cerrado, o es el turno de probarlo)"""
+        with self._lock:
+            if not self._fallos:
+                return True
+            ahora = time.monotonic()
+            if ahora < self._abierto_hasta:
+                return False
+            # Las demás consultas siguen con el motor local mientras esta prueba el endpoint
+            self._abierto_hasta = ahora + self._espera()
+            return True
+
+    def exito(self):
+        with self._lock:
+            self._fallos = 0
+            self._abierto_hasta = 0.0
+
+    def fallo(self):
+        with self._lock:
+            self._fallos += 1
+            self._abierto_hasta = time.monotonic() + self._espera()
+
+    def _espera(self):
+        return min(self.espera_inicial * 2 ** max(self._fallos - 1, 0), self.max_espera)
+
+    @property
+    def estado(self):
+        with self._lock:
+            return {
+                'abierto': self._fallos > 0,
+                'fallos_consecutivos': self._fallos,
+                'reintento_en_s': round(max(self._abierto_hasta - time.monotonic(), 0), 1),
+            }
 
 class SPARQLService:
+    # Cantidad máxima de consultas parseadas que se conservan para el motor local
+    PREPARED_QUERIES_MAX = 256
+    
     def __init__(self):
-        self.sparql_endpoint = "http://localhost:3030/acadontology/query"
-        self.rdf_service = RDFService()
+        self.sparql_endpoint = Config.SPARQL_ENDPOINT
+        self.transport = SPARQLTransport(
+            self.sparql_endpoint,
+            pool_size=Config.SPARQL_POOL_SIZE,
+            connect_timeout=Config.SPARQL_CONNECT_TIMEOUT,
+            read_timeout=Config.SPARQL_READ_TIMEOUT
+        )
+        self.breaker = EndpointBreaker(
+            espera_inicial=Config.SPARQL_BREAKER_ESPERA,
+            max_espera=Config.SPARQL_BREAKER_MAX_ESPERA
+        )
+        self.rdf_service = rdf_graph_cache.rdf_service
+        self.init_ns = {
+            'acad': self.rdf_service.ns, 'rdf': RDF, 'rdfs': RDFS, 'xsd': XSD,
+            'foaf': FOAF, 'dcterms': DCTERMS,
+        }
+        self.result_cache = SPARQLResultCache(
+            max_entries=Config.SPARQL_CACHE_SIZE,
+            default_ttl=Config.SPARQL_CACHE_TTL
+        )
+        self._prepared_queries = OrderedDict()
+        self._prepared_lock = threading.Lock()
     
     def query_docentes_por_area(self, area):
         """
@@ -46,7 +150,7 @@ class SPARQLService:
         SELECT DISTINCT ?curso ?nombre ?linea
         WHERE {{
             ?curso a acad:Curso ;
-                  acad:nombre ?nombre ;
+                  rdfs:label ?nombre ;
                   acad:relacionadoConLinea ?linea .
             ?linea rdfs:label ?lineaNombre .
             FILTER(CONTAINS(LCASE(?lineaNombre), LCASE("{linea_investigacion}")))
@@ -63,31 +167,19 @@ class SPARQLService:
         query = f"""
         PREFIX acad: <http://cramsoft.org/academico#>
         PREFIX foaf: <http://xmlns.com/foaf/0.1/>
-        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
         
-        SELECT ?docente ?nombre ?totalHoras
+        SELECT ?docente ?nombre (SUM(?horas) AS ?totalHoras)
         WHERE {{
-            ?docente a acad:Docente ;
-                    foaf:name ?nombre .
             ?asignacion a acad:AsignacionDocente ;
+                       acad:asignadoA ?docente ;
                        acad:asignadoEn ?periodo ;
                        acad:horasAsignadas ?horas .
-            ?periodo acad:nombre ?periodoNombre .
+            ?periodo rdfs:label ?periodoNombre .
             FILTER(?periodoNombre = "{periodo}")
-            
-            {{
-                SELECT ?docente (SUM(?horas) AS ?totalHoras)
-                WHERE {{
-                    ?docente a acad:Docente .
-                    ?asignacion a acad:AsignacionDocente ;
-                               acad:asignadoEn ?periodo ;
-                               acad:horasAsignadas ?horas .
-                    ?periodo acad:nombre ?periodoNombre .
-                    FILTER(?periodoNombre = "{periodo}")
-                }}
-                GROUP BY ?docente
-            }}
+            ?docente foaf:name ?nombre .
         }}
+        GROUP BY ?docente ?nombre
         ORDER BY DESC(?totalHoras)
         """
         
@@ -100,18 +192,15 @@ class SPARQLService:
         query = f"""
         PREFIX acad: <http://cramsoft.org/academico#>
         PREFIX dcterms: <http://purl.org/dc/terms/>
-        PREFIX bibo: <http://purl.org/ontology/bibo/>
         
-        SELECT ?produccion ?titulo ?tipo ?anio ?doi ?revista
+        SELECT ?produccion ?titulo ?anio ?fecha ?doi ?revista
         WHERE {{
-            ?docente a acad:Docente .
-            FILTER(STRENDS(STR(?docente), "Docente_{docente_id}"))
-            ?docente acad:tieneProduccion ?produccion .
-            ?produccion dcterms:title ?titulo .
-            OPTIONAL {{ ?produccion dcterms:type ?tipo }}
+            {self.rdf_service.uri('docentes', docente_id).n3()} acad:tieneProduccion ?produccion .
+            ?produccion acad:titulo ?titulo .
             OPTIONAL {{ ?produccion dcterms:date ?anio }}
+            OPTIONAL {{ ?produccion acad:fechaPublicacion ?fecha }}
             OPTIONAL {{ ?produccion acad:doi ?doi }}
-            OPTIONAL {{ ?produccion dcterms:publisher ?revista }}
+            OPTIONAL {{ ?produccion acad:revista ?revista }}
         }}
         ORDER BY DESC(?anio)
         """
@@ -124,17 +213,15 @@ class SPARQLService:
         """
         query = f"""
         PREFIX acad: <http://cramsoft.org/academico#>
+        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
         
-        SELECT ?disponibilidad ?dia ?horaInicio ?horaFin
+        SELECT ?disponibilidad ?label ?descripcion
         WHERE {{
-            ?docente a acad:Docente .
-            FILTER(STRENDS(STR(?docente), "Docente_{docente_id}"))
-            ?docente acad:tieneDisponibilidad ?disponibilidad .
-            ?disponibilidad acad:diaSemana ?dia .
-            ?disponibilidad acad:horaInicio ?horaInicio .
-            ?disponibilidad acad:horaFin ?horaFin .
+            {self.rdf_service.uri('docentes', docente_id).n3()} acad:tieneDisponibilidad ?disponibilidad .
+            ?disponibilidad rdfs:label ?label .
+            OPTIONAL {{ ?disponibilidad rdfs:comment ?descripcion }}
         }}
-        ORDER BY ?dia ?horaInicio
+        ORDER BY ?disponibilidad
         """
         
         return self._execute_sparql_query(query)
@@ -158,7 +245,8 @@ class SPARQLService:
         ORDER BY DESC(?numDocentes)
         """
         
-        return self._execute_sparql_query(query)
+        # Agregado sobre todo el dataset: se conserva más tiempo en caché
+        return self._execute_sparql_query(query, ttl=900)
     
     def query_by_property(self, clase_objetivo, propiedad, valor, es_id=True, label_propiedad=None):
         """
@@ -195,102 +283,87 @@ class SPARQLService:
         """
         return self._execute_sparql_query(query)
     
-    def _execute_sparql_query(self, query):
+    def _execute_sparql_query(self, query, ttl=None):
         """
-        Ejecuta una consulta SPARQL en el endpoint de Apache Jena
+        Ejecuta una consulta SPARQL en el endpoint de Apache Jena.
+        Los resultados se guardan en caché hasta la próxima escritura en la base
+        de datos o hasta que venza su TTL (ttl=0 evita la caché).
         """
-        try:
-            sparql = SPARQLWrapper(self.sparql_endpoint)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(JSON)
-            results = sparql.query().convert()
-            return results
-        except Exception as e:
-            print(f"Error ejecutando consulta SPARQL: {e}")
-            # Fallback a consultas SQL si el endpoint SPARQL no está disponible
-            return self._fallback_sql_query(query)
+        key = self.result_cache.key(query)
+        if ttl != 0:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        with medir('sparql'):
+            results = None
+            if self.breaker.permitir():
+                try:
+                    results = self.transport.query(query)
+                    self.breaker.exito()
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    print(f"Endpoint SPARQL no disponible: {e}")
+                    self.breaker.fallo()
+                except Exception as e:
+                    print(f"Error ejecutando consulta SPARQL: {e}")
+            if results is None:
+                # Fallback al motor SPARQL en memoria si el endpoint no está disponible
+                results = self._execute_local_query(query)
+        
+        self.result_cache.set(key, results, ttl)
+        return results
     
-    def _fallback_sql_query(self, query):
+    def _execute_local_query(self, query):
         """
-        Fallback a consultas SQL cuando el endpoint SPARQL no está disponible
+        Ejecuta la consulta sobre el grafo RDF en memoria (sincronizado con la base
+        de datos) cuando el endpoint SPARQL no está disponible.
+        Devuelve el mismo formato JSON de resultados SPARQL que el endpoint.
         """
-        if "docentes dictan cursos en el área" in query or "docentes_por_area" in query:
-            # Extraer área de la consulta
-            area = query.split('"')[1] if '"' in query else ""
-            return self._sql_docentes_por_area(area)
-        elif "cursos están relacionados con una línea" in query or "cursos_por_linea" in query:
-            linea = query.split('"')[1] if '"' in query else ""
-            return self._sql_cursos_por_linea(linea)
-        elif "docentes tienen más carga horaria" in query or "carga_horaria" in query:
-            periodo = query.split('"')[1] if '"' in query else ""
-            return self._sql_docentes_carga_horaria(periodo)
-        else:
-            return {"results": {"bindings": []}}
-    
-    def _sql_docentes_por_area(self, area):
-        """Consulta SQL equivalente para docentes por área"""
-        query = db.session.query(Docente).join(
-            AsignacionDocente, Docente.id == AsignacionDocente.docente_id
-        ).join(
-            Curso, AsignacionDocente.curso_id == Curso.id
-        ).join(
-            LineaInvestigacion, Curso.linea_investigacion_id == LineaInvestigacion.id
-        ).filter(
-            LineaInvestigacion.nombre.ilike(f'%{area}%')
-        ).distinct().all()
-        
-        results = []
-        for docente in query:
-            results.append({
-                "docente": {"value": f"http://cramsoft.org/academico#Docente_{docente.id}"},
-                "nombre": {"value": docente.nombre},
-                "grado": {"value": docente.grado_academico or ""},
-                "orcid": {"value": docente.orcid or ""}
-            })
-        
-        return {"results": {"bindings": results}}
+        prepared = self._prepare_query(query)
+        with rdf_graph_cache.read() as graph:
+            result = graph.query(prepared)
+            
+            if result.type == 'ASK':
+                return {"head": {}, "boolean": bool(result.askAnswer)}
+            
+            if result.type == 'SELECT':
+                variables = [str(var) for var in result.vars]
+                bindings = []
+                for row in result:
+                    bindings.append({
+                        var: self._term_to_binding(term)
+                        for var, term in zip(variables, row) if term is not None
+                    })
+                return {"head": {"vars": variables}, "results": {"bindings": bindings}}
+            
+            # CONSTRUCT / DESCRIBE
+            return json.loads(result.graph.serialize(format='json-ld'))
     
-    def _sql_cursos_por_linea(self, linea):
-        """Consulta SQL equivalente para cursos por línea"""
-        query = db.session.query(Curso, LineaInvestigacion).join(
-            LineaInvestigacion, Curso.linea_investigacion_id == LineaInvestigacion.id
-        ).filter(
-            LineaInvestigacion.nombre.ilike(f'%{linea}%')
-        ).all()
+    def _prepare_query(self, query):
+        """Devuelve la consulta parseada, reutilizando las ya preparadas (LRU)"""
+        with self._prepared_lock:
+            prepared = self._prepared_queries.get(query)
+            if prepared is not None:
+                self._prepared_queries.move_to_end(query)
+                return prepared
         
-        results = []
-        for curso, linea_inv in query:
-            results.append({
-                "curso": {"value": f"http://cramsoft.org/academico#Curso_{curso.id}"},
-                "nombre": {"value": curso.nombre},
-                "linea": {"value": linea_inv.nombre}
-            })
+        prepared = prepareQuery(query, initNs=self.init_ns)
         
-        return {"results": {"bindings": results}}
+        with self._prepared_lock:
+            self._prepared_queries[query] = prepared
+            while len(self._prepared_queries) > self.PREPARED_QUERIES_MAX:
+                self._prepared_queries.popitem(last=False)
+        return prepared
     
-    def _sql_docentes_carga_horaria(self, periodo):
-        """Consulta SQL equivalente para carga horaria por periodo"""
-        query = db.session.query(
-            Docente.nombre,
-            func.sum(AsignacionDocente.horas_asignadas).label('total_horas')
-        ).join(
-            AsignacionDocente, Docente.id == AsignacionDocente.docente_id
-        ).join(
-            PeriodoAcademico, AsignacionDocente.periodo_id == PeriodoAcademico.id
-        ).filter(
-            PeriodoAcademico.nombre == periodo
-        ).group_by(
-            Docente.id, Docente.nombre
-        ).order_by(
-            func.sum(AsignacionDocente.horas_asignadas).desc()
-        ).all()
-        
-        results = []
-        for nombre, total_horas in query:
-            results.append({
-                "docente": {"value": f"http://cramsoft.org/academico#Docente_{nombre}"},
-                "nombre": {"value": nombre},
-                "totalHoras": {"value": str(total_horas), "datatype": "http://www.w3.org/2001/XMLSchema#integer"}
-            })
-        
-        return {"results": {"bindings": results}} 
\ No newline at end of file
+    def _term_to_binding(self, term):
+        """Convierte un término rdflib al formato de binding de SPARQL JSON"""
+        if isinstance(term, URIRef):
+            return {"type": "uri", "value": str(term)}
+        if isinstance(term, BNode):
+            return {"type": "bnode", "value": str(term)}
+        binding = {"type": "literal", "value": str(term)}
+        if term.language:
+            binding["xml:lang"] = term.language
+        elif term.datatype:
+            binding["datatype"] = str(term.datatype)
+        return binding
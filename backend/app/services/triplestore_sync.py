@@ -0,0 +1,144 @@
+import gzip
+import threading
+import time
+from itertools import groupby
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app
+from rdflib.plugins.serializers.nt import _nt_row
+from app.services.rdf_service import RDFService, URI_PREFIJOS
+from config import Config
+
+class TriplestoreSyncService:
+    """
+    Carga el RDF generado desde la base de datos en el triplestore mediante el
+    Graph Store Protocol (SPARQL 1.1 GSP).
+    Cada tipo de entidad vive en su propio grafo con nombre: el primer lote de una
+    tabla reemplaza el grafo (PUT) y los siguientes se agregan (POST), así que
+    sincronizar una tabla nunca toca los grafos de las demás.
+    """
+    def __init__(self, data_endpoint=None, batch_size=50000, compress=True, timeout=(3.05, 300)):
+        self.data_endpoint = data_endpoint or Config.SPARQL_DATA_ENDPOINT
+        self.batch_size = batch_size
+        self.compress = compress
+        self.timeout = timeout
+        self.rdf_service = RDFService()
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    
+    def sync(self, tablas=None, source=None):
+        """
+        Sincroniza las tablas indicadas (todas por defecto) y devuelve un reporte
+        con triples, lotes, bytes enviados y throughput en triples por segundo.
+        source es cualquier objeto con iter_stream_triples(tablas=...): por defecto
+        se recorre la base de datos con cursores; también puede ser rdf_graph_cache.
+        """
+        tablas = list(tablas) if tablas else list(URI_PREFIJOS)
+        reporte = {'tablas': {}}
+        inicio = time.perf_counter()
+        
+        source = source or self.rdf_service
+        triples = source.iter_stream_triples(tablas=set(tablas))
+        for tabla, grupo in groupby(triples, key=lambda item: item[0]):
+            reporte['tablas'][tabla] = self._sync_table(tabla, (triple for _, triple in grupo))
+        
+        # Las tablas sin filas también deben vaciar su grafo
+        for tabla in tablas:
+            if tabla not in reporte['tablas']:
+                reporte['tablas'][tabla] = self._sync_table(tabla, iter(()))
+        
+        segundos = time.perf_counter() - inicio
+        total = sum(item['triples'] for item in reporte['tablas'].values())
+        reporte.update({
+            'triples': total,
+            'bytes_enviados': sum(item['bytes_enviados'] for item in reporte['tablas'].values()),
+            'segundos': round(segundos, 3),
+            'triples_por_segundo': round(total / segundos, 1) if segundos > 0 else total
+        })
+        return reporte
+    
+    def _sync_table(self, tabla, triples):
+        graph_uri = str(self.rdf_service.graph_uri(tabla))
+        inicio = time.perf_counter()
+        total = lotes = enviados = 0
+        
+        lote = []
+        for triple in triples:
+            lote.append(_nt_row(triple))
+            if len(lote) >= self.batch_size:
+                enviados += self._send(graph_uri, lote, replace=(lotes == 0))
+                total += len(lote)
+                lotes += 1
+                lote = []
+        if lote or lotes == 0:
+            enviados += self._send(graph_uri, lote, replace=(lotes == 0))
+            total += len(lote)
+            lotes += 1
+        
+        segundos = time.perf_counter() - inicio
+        return {
+            'grafo': graph_uri,
+            'triples': total,
+            'lotes': lotes,
+            'bytes_enviados': enviados,
+            'segundos': round(segundos, 3),
+            'triples_por_segundo': round(total / segundos, 1) if segundos > 0 else total
+        }
+    
+    def _send(self, graph_uri, lineas, replace):
+        """PUT reemplaza el grafo con nombre; POST agrega triples al grafo"""
+        body = ''.join(lineas).encode('utf-8')
+        headers = {'Content-Type': 'application/n-triples; charset=utf-8'}
+        if self.compress:
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+        method = self.session.put if replace else self.session.post
+        response = method(
+            self.data_endpoint,
+            params={'graph': graph_uri},
+            data=body,
+            headers=headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return len(body)
+
+class TriplestoreSyncQueue:
+    """
+    Sincronización en segundo plano de los grafos afectados por las escrituras de la API.
+    Las tablas pendientes se acumulan y un único hilo las envía después de responder:
+    varias escrituras seguidas se resuelven con una sola carga de cada grafo, y un fallo
+    del triplestore se informa en el log sin convertir en error una escritura ya confirmada
+    (el siguiente cambio, o sync_triplestore.py, vuelve a reemplazar esos grafos).
+    """
+    def __init__(self, sync_service, source=None):
+        self.sync_service = sync_service
+        self.source = source
+        self._lock = threading.Lock()
+        self._pendientes = set()
+        self._activo = False
+
+    def programar(self, tablas):
+        """Agrega las tablas a la cola y lanza el hilo de envío si no está en curso"""
+        app = current_app._get_current_object()
+        with self._lock:
+            self._pendientes.update(tablas)
+            if self._activo:
+                return
+            self._activo = True
+        threading.Thread(target=self._procesar, args=(app,), name='triplestore-sync', daemon=True).start()
+
+    def _procesar(self, app):
+        while True:
+            with self._lock:
+                tablas = sorted(self._pendientes)
+                self._pendientes.clear()
+                if not tablas:
+                    self._activo = False
+                    return
+            try:
+                with app.app_context():
+                    self.sync_service.sync(tablas, source=self.source)
+            except Exception as e:
+                print(f"Error al sincronizar el triplestore ({', '.join(tablas)}): {e}")
@@ -0,0 +1,32 @@
+import json
+from flask import request
+
+# Tipos de contenido aceptados como JSON delimitado por líneas
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+def iter_request_rows():
+    """
+    Itera (indice, fila, error) del cuerpo de la petición.
+    Acepta un arreglo JSON o NDJSON (un objeto por línea, leído en streaming);
+    las líneas que no son un objeto JSON válido se devuelven con su error.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        indice = 0
+        for linea in request.stream:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                fila = json.loads(linea)
+                error = None if isinstance(fila, dict) else 'Cada línea debe ser un objeto JSON'
+            except ValueError as e:
+                fila, error = None, f'JSON inválido: {e}'
+            yield indice, fila, error
+            indice += 1
+        return
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        raise ValueError('Se esperaba un arreglo JSON o un cuerpo NDJSON')
+    for indice, fila in enumerate(data):
+        yield indice, fila, None if isinstance(fila, dict) else 'Cada elemento debe ser un objeto JSON'
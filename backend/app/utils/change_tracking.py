@@ -0,0 +1,140 @@
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+# Listeners que mantienen estructuras en memoria sincronizadas con la base de datos.
+# Cada listener implementa:
+#   - preparar(session, cambios): se ejecuta tras el flush (aún se puede consultar la BD)
+#     y devuelve un payload con lo necesario para actualizarse.
+#   - aplicar(payload): se ejecuta solo si la transacción hace commit.
+_listeners = []
+
+def register_change_listener(listener):
+    """Registrar un listener de cambios de modelos"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+def init_change_tracking(session, models):
+    """Registrar los eventos de SQLAlchemy que alimentan a los listeners"""
+    for model in models:
+        for nombre, operacion in (('after_insert', 'insert'), ('after_update', 'update'), ('after_delete', 'delete')):
+            handler = _mapper_handlers[operacion]
+            if not event.contains(model, nombre, handler):
+                event.listen(model, nombre, handler)
+
+    for nombre, handler in (
+        ('after_flush_postexec', _after_flush_postexec),
+        ('after_commit', _after_commit),
+        ('after_rollback', _after_rollback),
+    ):
+        if not event.contains(session, nombre, handler):
+            event.listen(session, nombre, handler)
+
+def register_bulk_changes(session, cambios):
+    """
+    Registrar cambios hechos con sentencias masivas (insert/update/delete sobre
+    varias filas), que no emiten eventos de mapper. cambios es una lista de
+    (tabla, id, operacion); los listeners se preparan de inmediato y se aplican
+    en el commit, igual que con los cambios hechos a través del ORM.
+    """
+    session.info.setdefault('cambios', []).extend(cambios)
+    _after_flush_postexec(session, None)
+
+def _registrar_cambio(target, operacion):
+    session = object_session(target)
+    if session is None:
+        return
+    session.info.setdefault('cambios', []).append((target.__tablename__, target.id, operacion))
+
+def _on_insert(mapper, connection, target):
+    _registrar_cambio(target, 'insert')
+
+def _on_update(mapper, connection, target):
+    _registrar_cambio(target, 'update')
+
+def _on_delete(mapper, connection, target):
+    _registrar_cambio(target, 'delete')
+
+_mapper_handlers = {'insert': _on_insert, 'update': _on_update, 'delete': _on_delete}
+
+def _after_flush_postexec(session, flush_context):
+    cambios = session.info.pop('cambios', None)
+    if not cambios:
+        return
+    pendientes = session.info.setdefault('cambios_pendientes', [])
+    with session.no_autoflush:
+        for listener in _listeners:
+            payload = listener.preparar(session, cambios)
+            if payload is not None:
+                pendientes.append((listener, payload))
+
+def _after_commit(session):
+    pendientes = session.info.pop('cambios_pendientes', None)
+    session.info.pop('cambios', None)
+    for listener, payload in pendientes or []:
+        try:
+            listener.aplicar(payload)
+        except Exception as e:
+            print(f"Error aplicando cambios en {type(listener).__name__}: {e}")
+
+def _after_rollback(session):
+    session.info.pop('cambios', None)
+    session.info.pop('cambios_pendientes', None)
+
+class DatasetVersion:
+    """Contador de versión del dataset: aumenta con cada transacción que modifica datos"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+    
+    def preparar(self, session, cambios):
+        return True
+    
+    def aplicar(self, payload):
+        with self._lock:
+            self.value += 1
+
+dataset_version = DatasetVersion()
+
+class TableVersions:
+    """
+    Versión y fecha de la última modificación de cada tabla, actualizadas con cada commit.
+    Alimentan los validadores HTTP (ETag / Last-Modified) de las rutas GET.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Las versiones empiezan en 0 en cada proceso: el token distingue los ETags de cada arranque
+        self.token = uuid.uuid4().hex[:8]
+        self.inicio = truncar_segundo(datetime.now(timezone.utc))
+        self._versiones = Counter()
+        self._modificadas = {}
+
+    def preparar(self, session, cambios):
+        return {tabla for tabla, _, _ in cambios}
+
+    def aplicar(self, tablas):
+        ahora = truncar_segundo(datetime.now(timezone.utc))
+        with self._lock:
+            for tabla in tablas:
+                self._versiones[tabla] += 1
+                self._modificadas[tabla] = ahora
+
+    def validadores(self, tablas):
+        """(etag, last_modified) de un conjunto de tablas"""
+        with self._lock:
+            etag = self.token + '-' + '.'.join(str(self._versiones[tabla]) for tabla in tablas)
+            last_modified = max((self._modificadas.get(tabla, self.inicio) for tabla in tablas), default=self.inicio)
+        return etag, last_modified
+
+def truncar_segundo(momento):
+    """
+    Last-Modified tiene resolución de segundos y no puede ser posterior a Date: se trunca.
+    Dos escrituras en el mismo segundo comparten fecha, por eso las peticiones condicionales
+    no confían en una fecha igual al segundo en curso (ver app/utils/conditional.py).
+    """
+    return momento.replace(microsecond=0)
+
+table_versions = TableVersions()
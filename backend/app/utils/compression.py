@@ -0,0 +1,111 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se negocia gzip
+    brotli = None
+
+# Tamaño mínimo (bytes) a partir del cual se comprime una respuesta
+COMPRESSION_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Tipos de contenido que vale la pena comprimir
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/ld+json', 'application/rdf+xml',
+    'application/sparql-results+json', 'application/n-triples', 'application/n-quads',
+    'application/x-ndjson', 'text/turtle', 'text/csv', 'text/plain', 'text/html',
+}
+
+# Cuerpos comprimidos reutilizados entre peticiones, por (URL, ETag, codificación)
+COMPRESSED_CACHE_SIZE = 16
+
+class _CompressedCache:
+    """LRU pequeño: las respuestas con ETag (p. ej. grafo-completo) se comprimen una vez por versión"""
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get(self, clave, comprimir):
+        with self._lock:
+            if clave in self._items:
+                self._items.move_to_end(clave)
+                return self._items[clave]
+        body = comprimir()
+        with self._lock:
+            self._items[clave] = body
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+        return body
+
+_compressed_cache = _CompressedCache(COMPRESSED_CACHE_SIZE)
+
+def init_compression(app):
+    """Comprime las respuestas según Accept-Encoding (br si está disponible, si no gzip)"""
+    app.after_request(compress_response)
+
+def compress_response(response):
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    if not response.is_streamed and (response.content_length or 0) < COMPRESSION_MIN_SIZE:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = _negotiate_encoding()
+    if encoding is None:
+        return response
+
+    etag, weak = response.get_etag()
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if etag:
+            # El ETag identifica la versión, no el recurso: la clave incluye la URL
+            body = _compressed_cache.get((request.full_path, etag, encoding), lambda: _compress(body, encoding))
+        else:
+            body = _compress(body, encoding)
+        response.set_data(body)
+    # La representación comprimida es otra: el ETag pasa a ser débil (sigue validando If-None-Match)
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def _negotiate_encoding():
+    ofrecidas = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(ofrecidas)
+
+def _compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def _compress_stream(chunks, encoding):
+    """Comprime una respuesta por streaming bloque a bloque, sin reunir el cuerpo completo"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        comprimir, terminar = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        comprimir, terminar = compressor.compress, compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = comprimir(chunk)
+            if data:
+                yield data
+        yield terminar()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from flask import request, g, current_app
+from app.utils.change_tracking import table_versions, truncar_segundo
+
+# Tablas de las que dependen las respuestas GET de cada blueprint (None = todas)
+TABLAS_POR_BLUEPRINT = {
+    'area': ('areas', 'lineas_investigacion', 'cursos'),
+    'linea_investigacion': ('lineas_investigacion', 'areas', 'docentes', 'cursos'),
+    'curso': ('cursos', 'areas', 'lineas_investigacion'),
+    'docente': (
+        'docentes', 'lineas_investigacion', 'asignaciones_docentes', 'cursos', 'periodos_academicos',
+        'producciones_academicas', 'disponibilidades_horarias',
+    ),
+    'periodo_academico': ('periodos_academicos',),
+    'asignacion_docente': (
+        'asignaciones_docentes', 'docentes', 'cursos', 'periodos_academicos', 'areas', 'lineas_investigacion',
+    ),
+    'produccion_academica': ('producciones_academicas', 'docentes'),
+    'disponibilidad_horaria': ('disponibilidades_horarias', 'docentes'),
+    'autocomplete': ('docentes', 'cursos', 'lineas_investigacion', 'periodos_academicos', 'areas'),
+    'rdf_export': None,
+    'visualizacion': None,
+    'main': (),
+}
+
+# Cache-Control de las respuestas GET: por endpoint ('blueprint.funcion') o por blueprint
+DEFAULT_CACHE_CONTROL = 'no-cache'
+CACHE_CONTROL = {
+    # Documentos completos y pesados: se aceptan hasta 60 s de retraso a cambio de no revalidar
+    'rdf_export': 'public, max-age=60',
+    'autocomplete': 'private, max-age=30',
+    'main.index': 'public, max-age=3600',
+    'rdf_export.get_available_formats': 'public, max-age=3600',
+}
+
+# Respuestas que no dependen solo de las tablas (estado del servidor, fecha actual, datos del
+# triplestore): sin validadores. Por endpoint ('blueprint.funcion') o por blueprint
+SIN_VALIDADORES = {
+    'main.health_check': 'no-store',
+    # SPARQL responde desde Fuseki, que también cambia fuera de la API (sync_triplestore.py)
+    'sparql': 'no-cache',
+    'sparql.get_consultas_predefinidas': 'public, max-age=3600',
+    'sparql.get_cache_estadisticas': 'no-store',
+    'metricas.get_metricas': 'no-store',
+    'periodo_academico.get_periodo_actual': 'no-cache',
+}
+
+def _revision_layout():
+    from app.services.grafo_service import grafo_cache
+    return grafo_cache.layout.vigente[0]
+
+# Respuestas que además dependen de un estado que cambia sin escribir en las tablas: su revisión
+# se agrega al ETag y no se envía Last-Modified. Las coordenadas x/y de los nodos vienen del
+# layout, que se calcula en segundo plano después de la escritura
+REVISIONES_EXTRA = {
+    'visualizacion': _revision_layout,
+}
+
+def init_conditional_requests(app):
+    """
+    ETag y Last-Modified en las rutas GET a partir de las versiones de las tablas de las que
+    dependen: If-None-Match / If-Modified-Since se responden con 304 antes de ejecutar la vista.
+    """
+    from app.models.models import MODELOS_POR_TABLA
+    todas = tuple(sorted(MODELOS_POR_TABLA))
+    app.extensions['tablas_por_blueprint'] = {
+        blueprint: todas if tablas is None else tuple(sorted(tablas))
+        for blueprint, tablas in TABLAS_POR_BLUEPRINT.items()
+    }
+    app.before_request(check_conditional)
+    app.after_request(add_validators)
+
+def _sin_validadores():
+    """Cache-Control de la ruta si no lleva validadores, o None"""
+    return SIN_VALIDADORES.get(request.endpoint) or SIN_VALIDADORES.get(request.blueprint)
+
+def _politica():
+    """(tablas, cache_control) de la petición, o None si la ruta no lleva validadores"""
+    if request.method not in ('GET', 'HEAD') or request.endpoint is None or _sin_validadores():
+        return None
+    tablas = current_app.extensions['tablas_por_blueprint'].get(request.blueprint)
+    if tablas is None:
+        return None
+    cache_control = CACHE_CONTROL.get(request.endpoint) or CACHE_CONTROL.get(request.blueprint, DEFAULT_CACHE_CONTROL)
+    return tablas, cache_control
+
+def check_conditional():
+    politica = _politica()
+    if politica is None:
+        return None
+    tablas, cache_control = politica
+    etag, last_modified = table_versions.validadores(tablas)
+    revision_extra = REVISIONES_EXTRA.get(request.blueprint)
+    if revision_extra is not None:
+        etag = f'{etag}-{revision_extra()}'
+        last_modified = None
+    # Una tabla modificada en el segundo en curso puede volver a cambiar con la misma fecha:
+    # esa fecha no se envía como Last-Modified ni sirve para responder 304 a If-Modified-Since
+    if last_modified is not None and last_modified >= truncar_segundo(datetime.now(timezone.utc)):
+        last_modified = None
+    g.validadores = (etag, last_modified, cache_control)
+
+    # If-None-Match tiene prioridad sobre If-Modified-Since; el ETag puede volver débil (comprimido)
+    if request.if_none_match:
+        no_modificado = request.if_none_match.contains_weak(etag)
+    else:
+        no_modificado = (
+            request.if_modified_since is not None and last_modified is not None
+            and last_modified <= request.if_modified_since
+        )
+    if no_modificado:
+        return current_app.response_class(status=304)
+    return None
+
+def add_validators(response):
+    cache_control = _sin_validadores()
+    if cache_control is not None:
+        response.headers.setdefault('Cache-Control', cache_control)
+        return response
+    validadores = g.pop('validadores', None)
+    if validadores is None or response.status_code not in (200, 304):
+        return response
+    etag, last_modified, cache_control = validadores
+    # Las rutas con su propio ETag (p. ej. grafo-completo) lo conservan
+    if 'ETag' not in response.headers:
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+    response.headers.setdefault('Cache-Control', cache_control)
+    return response
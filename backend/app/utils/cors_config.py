@@ -23,7 +23,8 @@ def configure_cors(app):
                      "Content-Type",
                      "X-Total-Count",
                      "X-Page",
-                     "X-Per-Page"
+                     "X-Per-Page",
+                     "X-Next-After"
                  ],
                  "supports_credentials": True,
                  "max_age": 86400  # Cache preflight requests for 24 hours
@@ -0,0 +1,44 @@
+import json
+from flask.json.provider import DefaultJSONProvider
+from app.utils.profiling import medir
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el codificador de la biblioteca estándar
+    orjson = None
+
+def dumps_bytes(obj, default=None, sort_keys=False, indent=False):
+    """Serializa a JSON (UTF-8) con orjson si está instalado, o con json de la biblioteca estándar"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(
+        obj, default=default, sort_keys=sort_keys, ensure_ascii=False,
+        indent=2 if indent else None, separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de la app: jsonify() codifica con orjson cuando está disponible.
+    Fechas, dataclasses y demás tipos no nativos pasan por el mismo default() de Flask,
+    así la salida es la misma que con el proveedor por defecto (salvo los espacios y
+    que los caracteres no ASCII van en UTF-8 en lugar de escapados).
+    """
+    def dumps(self, obj, **kwargs):
+        with medir('serializacion'):
+            if orjson is None or kwargs:
+                return super().dumps(obj, **kwargs)
+            return dumps_bytes(obj, default=self.default, sort_keys=self.sort_keys).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        with medir('serializacion'):
+            if orjson is None:
+                return super().response(*args, **kwargs)
+            obj = self._prepare_response_obj(args, kwargs)
+            indent = (self.compact is None and self._app.debug) or self.compact is False
+            body = dumps_bytes(obj, default=self.default, sort_keys=self.sort_keys, indent=indent)
+            return self._app.response_class(body + b'\n', mimetype=self.mimetype)
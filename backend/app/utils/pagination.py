@@ -0,0 +1,129 @@
+from itertools import islice
+from flask import request, jsonify, current_app, Response, stream_with_context
+from sqlalchemy.orm import load_only
+
+# Tamaño máximo de página permitido en los listados
+MAX_LIMIT = 1000
+# Filas leídas y serializadas por bloque en los listados completos (enviados por streaming)
+STREAM_BATCH_SIZE = 500
+
+def paginated_response(query, schema):
+    """
+    Respuesta de listado con paginación por cursor y proyección de campos:
+      - ?after=<id>&limit=<n>: devuelve hasta n filas con id > after (orden por id)
+      - ?fields=a,b,c: solo serializa (y solo consulta) esos campos
+      - ?ids=3,1,2: devuelve esas filas (una sola consulta IN) en el orden pedido;
+        los ids inexistentes se informan en missing
+    Siempre agrega X-Total-Count; con limit también X-Per-Page y X-Next-After.
+    Sin limit devuelve el listado completo por streaming, en bloques de filas.
+    """
+    model = query.column_descriptions[0]['entity']
+    try:
+        after = _parse_int(request.args.get('after'), 'after')
+        limit = _parse_int(request.args.get('limit'), 'limit')
+        fields = _parse_fields(request.args.get('fields'), schema)
+        ids = _parse_ids(request.args.get('ids'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    if limit is not None:
+        limit = max(1, min(limit, MAX_LIMIT))
+
+    if ids is None:
+        headers = {'X-Total-Count': str(query.order_by(None).count())}
+        if after is not None:
+            query = query.filter(model.id > after)
+        query = query.order_by(model.id)
+    else:
+        query = query.filter(model.id.in_(ids)).order_by(None)
+
+    list_schema = type(schema)(many=True, only=fields) if fields else schema
+    columnas = model.__table__.columns.keys()
+    if fields and all(field in columnas for field in fields):
+        # Solo columnas: se consultan únicamente las pedidas (más el id del cursor)
+        seleccion = ['id'] + [field for field in fields if field != 'id']
+        query = query.with_entities(*[getattr(model, field) for field in seleccion])
+    else:
+        if fields:
+            # Con relaciones anidadas se cargan las entidades, pero solo con las columnas pedidas
+            query = query.options(load_only(*[getattr(model, field) for field in fields if field in columnas]))
+        query = query.options(*list_schema.loader_options())
+
+    if ids is not None:
+        return _batch_response(query, list_schema, ids)
+
+    if limit is None:
+        return Response(stream_with_context(_stream_rows(query, list_schema)), 200, headers, mimetype='application/json')
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    headers['X-Per-Page'] = str(limit)
+    if has_more:
+        headers['X-Next-After'] = str(rows[-1].id)
+
+    body = {
+        'success': True,
+        'data': list_schema.dump(rows),
+        'next_after': rows[-1].id if has_more else None
+    }
+    return jsonify(body), 200, headers
+
+def _batch_response(query, schema, ids):
+    """Filas pedidas por ?ids=, en el orden de la petición"""
+    por_id = {row.id: row for row in query}
+    rows = [por_id[entity_id] for entity_id in ids if entity_id in por_id]
+    body = {
+        'success': True,
+        'data': schema.dump(rows),
+        'missing': [entity_id for entity_id in ids if entity_id not in por_id]
+    }
+    return jsonify(body), 200, {'X-Total-Count': str(len(rows))}
+
+def _stream_rows(query, schema):
+    """Cuerpo {"success": true, "data": [...]} generado bloque a bloque, sin materializar el listado"""
+    yield '{"success":true,"data":['
+    rows = iter(query.yield_per(STREAM_BATCH_SIZE))
+    separador = ''
+    while True:
+        batch = list(islice(rows, STREAM_BATCH_SIZE))
+        if not batch:
+            break
+        # Se codifica el bloque como lista y se quitan los corchetes
+        items = current_app.json.dumps(schema.dump(batch))[1:-1]
+        yield separador + items
+        separador = ','
+    yield ']}\n'
+
+def _parse_int(value, nombre):
+    """Entero opcional; un valor no numérico es un error (no se ignora)"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{nombre} debe ser un número entero")
+
+def _parse_ids(value):
+    """Lista de ids sin repetir, en el orden pedido"""
+    if value is None:
+        return None
+    try:
+        ids = list(dict.fromkeys(int(parte) for parte in value.split(',') if parte.strip()))
+    except ValueError:
+        raise ValueError("ids debe ser una lista de enteros separados por comas")
+    if len(ids) > MAX_LIMIT:
+        raise ValueError(f"Se pueden pedir como máximo {MAX_LIMIT} ids")
+    return ids
+
+def _parse_fields(value, schema):
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    invalidos = [field for field in fields if field not in schema.fields]
+    if invalidos:
+        raise ValueError(f"Campos no válidos: {', '.join(invalidos)}")
+    return tuple(fields)
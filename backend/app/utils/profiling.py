@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config import Config
+
+# Componentes medidos en cada petición (además del tiempo total)
+COMPONENTES = ('sql', 'sparql', 'serializacion')
+PERCENTILES = (50, 95, 99)
+
+class MetricasStore:
+    """Últimas muestras de cada ruta (tiempo total y por componente) para calcular percentiles"""
+    def __init__(self, muestras_por_ruta):
+        self.muestras_por_ruta = muestras_por_ruta
+        self._lock = threading.Lock()
+        self._rutas = {}
+
+    def registrar(self, ruta, status, total_ms, perfil):
+        muestra = (total_ms, perfil['sql_consultas']) + tuple(perfil[componente] for componente in COMPONENTES)
+        with self._lock:
+            datos = self._rutas.get(ruta)
+            if datos is None:
+                datos = self._rutas[ruta] = {'peticiones': 0, 'errores': 0, 'muestras': deque(maxlen=self.muestras_por_ruta)}
+            datos['peticiones'] += 1
+            if status >= 500:
+                datos['errores'] += 1
+            datos['muestras'].append(muestra)
+
+    def resumen(self):
+        """Percentiles por ruta, de la más lenta (p95) a la más rápida"""
+        with self._lock:
+            rutas = {ruta: (datos['peticiones'], datos['errores'], list(datos['muestras'])) for ruta, datos in self._rutas.items()}
+        resumen = []
+        for ruta, (peticiones, errores, muestras) in rutas.items():
+            valores = np.array(muestras)
+            fila = {
+                'ruta': ruta,
+                'peticiones': peticiones,
+                'errores': errores,
+                'muestras': len(muestras),
+                'total_ms': _percentiles(valores[:, 0]),
+                'sql_consultas_promedio': round(float(valores[:, 1].mean()), 2),
+            }
+            for indice, componente in enumerate(COMPONENTES, start=2):
+                fila[f'{componente}_ms'] = _percentiles(valores[:, indice])
+            resumen.append(fila)
+        resumen.sort(key=lambda fila: fila['total_ms']['p95'], reverse=True)
+        return resumen
+
+    def reset(self):
+        with self._lock:
+            self._rutas = {}
+
+def _percentiles(valores):
+    calculados = np.percentile(valores, PERCENTILES)
+    resultado = {f'p{p}': round(float(v), 2) for p, v in zip(PERCENTILES, calculados)}
+    resultado['max'] = round(float(valores.max()), 2)
+    return resultado
+
+metricas_store = MetricasStore(Config.PROFILING_SAMPLES)
+
+def init_profiling(app):
+    """
+    Perfilado por petición (opcional, PROFILING=1): tiempo total, consultas SQL y su tiempo,
+    tiempo de SPARQL y de serialización. Se informa en el encabezado Server-Timing y se
+    acumula por ruta en metricas_store (/api/_metrics).
+    """
+    app.before_request(iniciar_perfil)
+    app.after_request(registrar_perfil)
+    for nombre, handler in (('before_cursor_execute', _antes_sql), ('after_cursor_execute', _despues_sql)):
+        if not event.contains(Engine, nombre, handler):
+            event.listen(Engine, nombre, handler)
+
+def iniciar_perfil():
+    g.perfil = {'inicio': time.perf_counter(), 'sql_consultas': 0, 'anidados': set()}
+    g.perfil.update({componente: 0.0 for componente in COMPONENTES})
+
+def registrar_perfil(response):
+    perfil = g.get('perfil')
+    if perfil is None:
+        return response
+    # Solo rutas existentes (las URL inexistentes no acumulan métricas) y sin contar el propio endpoint de métricas
+    ruta = None
+    if request.url_rule is not None and request.blueprint != 'metricas':
+        ruta = f'{request.method} {request.url_rule.rule}'
+
+    if response.is_streamed:
+        # El cuerpo (y sus consultas) se genera después de after_request: el perfil sigue
+        # abierto en g y se registra al cerrar la respuesta. Los encabezados ya se enviaron,
+        # así que estas rutas solo se informan en /api/_metrics
+        response.call_on_close(lambda: _cerrar_perfil(perfil, ruta, response.status_code))
+        return response
+
+    g.pop('perfil')
+    total_ms = _cerrar_perfil(perfil, ruta, response.status_code)
+    metricas = [f'total;dur={total_ms:.2f}', f'sql;desc="{perfil["sql_consultas"]} consultas";dur={perfil["sql"]:.2f}']
+    if perfil['sparql']:
+        metricas.append(f'sparql;dur={perfil["sparql"]:.2f}')
+    metricas.append(f'serializacion;dur={perfil["serializacion"]:.2f}')
+    response.headers.add('Server-Timing', ', '.join(metricas))
+    return response
+
+def _cerrar_perfil(perfil, ruta, status):
+    """Pasa el perfil a milisegundos, lo acumula en metricas_store y devuelve el tiempo total"""
+    total_ms = (time.perf_counter() - perfil['inicio']) * 1000
+    perfil.update({componente: perfil[componente] * 1000 for componente in COMPONENTES})
+    if ruta is not None:
+        metricas_store.registrar(ruta, status, total_ms, perfil)
+    return total_ms
+
+@contextmanager
+def medir(componente):
+    """Suma la duración del bloque al componente de la petición actual (si se está perfilando)"""
+    perfil = g.get('perfil') if has_request_context() else None
+    # Las llamadas anidadas (p. ej. un esquema dentro de otro) solo se cuentan una vez
+    if perfil is None or componente in perfil['anidados']:
+        yield
+        return
+    perfil['anidados'].add(componente)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        perfil[componente] += time.perf_counter() - inicio
+        perfil['anidados'].discard(componente)
+
+def _antes_sql(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._inicio_perfil = time.perf_counter()
+
+def _despues_sql(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, '_inicio_perfil', None)
+    if inicio is None or not has_request_context():
+        return
+    perfil = g.get('perfil')
+    if perfil is not None:
+        perfil['sql'] += time.perf_counter() - inicio
+        perfil['sql_consultas'] += 1
@@ -0,0 +1,28 @@
+from flask import request, jsonify
+from app.services.busqueda_service import busqueda_service
+from app.utils.pagination import MAX_LIMIT
+
+# Resultados devueltos por defecto cuando se busca por texto
+SEARCH_DEFAULT_LIMIT = 50
+
+def search_response(query, schema, textos):
+    """
+    Respuesta de los endpoints /buscar.
+    query trae los filtros que no son de texto; textos es {campo: texto} (campo None
+    busca en todos los campos indexados). Con texto, los resultados van ordenados por
+    relevancia y se devuelven hasta ?limit=<n> (por defecto SEARCH_DEFAULT_LIMIT);
+    sin texto se devuelven todas las filas filtradas, salvo que se indique limit.
+    Siempre agrega X-Total-Count con el total de coincidencias.
+    """
+    textos = {campo: texto for campo, texto in textos.items() if texto and texto.strip()}
+    limit = request.args.get('limit', type=int)
+    if limit is None and textos:
+        limit = SEARCH_DEFAULT_LIMIT
+    if limit is not None:
+        limit = max(1, min(limit, MAX_LIMIT))
+
+    rows, total = busqueda_service.buscar(query, textos, limit, schema.loader_options())
+    return jsonify({
+        'success': True,
+        'data': schema.dump(rows)
+    }), 200, {'X-Total-Count': str(total)}
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización y compresión de las respuestas de la API.
+Sobre una base SQLite en memoria con datos sintéticos compara:
+  - el tiempo de codificación JSON con la biblioteca estándar (comportamiento anterior)
+    y con el proveedor de la app (orjson si está instalado);
+  - los bytes enviados sin compresión, con gzip y con brotli (si está instalado),
+    y el tiempo de respuesta de cada variante.
+
+Uso:
+    python benchmark_respuestas.py
+    python benchmark_respuestas.py --docentes 20000 --repeticiones 5
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+# El benchmark nunca usa la base de datos configurada
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert
+from app import create_app, db
+from app.models.models import (
+    Area, LineaInvestigacion, PeriodoAcademico, Curso, Docente, ProduccionAcademica,
+    AsignacionDocente, docentes_lineas_investigacion, docentes_producciones_academicas
+)
+from app.schemas import docentes_schema, asignaciones_docentes_schema
+from app.services.grafo_service import grafo_cache
+from app.utils.compression import brotli
+
+ENDPOINTS = [
+    '/api/docentes/',
+    '/api/asignaciones-docentes/',
+    '/api/visualizacion/grafo-completo',
+    '/api/rdf/export/jsonld',
+]
+
+def poblar(docentes):
+    """Datos sintéticos: cada docente con 2 líneas, 2 asignaciones y 1 producción"""
+    db.create_all()
+    db.session.execute(insert(Area), [{'id': i, 'nombre': f'Área {i}'} for i in range(1, 11)])
+    db.session.execute(insert(LineaInvestigacion), [
+        {'id': i, 'nombre': f'Línea de investigación {i}', 'area_id': i % 10 + 1} for i in range(1, 51)
+    ])
+    db.session.execute(insert(PeriodoAcademico), [
+        {'id': i, 'nombre': f'202{i}-I', 'anio': 2020 + i, 'semestre': 1} for i in range(1, 5)
+    ])
+    cursos = max(docentes // 4, 1)
+    db.session.execute(insert(Curso), [
+        {'id': i, 'nombre': f'Curso {i}', 'codigo': f'C{i:05d}', 'creditos': 3, 'area_id': i % 10 + 1}
+        for i in range(1, cursos + 1)
+    ])
+    db.session.execute(insert(Docente), [
+        {'id': i, 'nombre': f'Docente Número {i}', 'email': f'docente{i}@universidad.edu',
+         'grado_academico': 'Doctorado en Ciencias de la Computación', 'especialidad': 'Ingeniería de Software'}
+        for i in range(1, docentes + 1)
+    ])
+    db.session.execute(insert(docentes_lineas_investigacion), [
+        {'docente_id': i, 'linea_investigacion_id': (i + k) % 50 + 1} for i in range(1, docentes + 1) for k in (0, 7)
+    ])
+    db.session.execute(insert(AsignacionDocente), [
+        {'docente_id': i, 'curso_id': (i * k) % cursos + 1, 'periodo_id': k, 'horas_asignadas': 4 + k}
+        for i in range(1, docentes + 1) for k in (1, 2)
+    ])
+    db.session.execute(insert(ProduccionAcademica), [
+        {'id': i, 'titulo': f'Publicación sobre sistemas distribuidos {i}', 'doi': f'10.1000/pub.{i}',
+         'revista': f'Revista {i % 20}', 'anio_publicacion': 2015 + i % 10}
+        for i in range(1, docentes + 1)
+    ])
+    db.session.execute(insert(docentes_producciones_academicas), [
+        {'docente_id': i, 'produccion_academica_id': i} for i in range(1, docentes + 1)
+    ])
+    db.session.commit()
+
+def medir(funcion, repeticiones):
+    """Mediana en milisegundos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de serialización y compresión de respuestas')
+    parser.add_argument('--docentes', type=int, default=5000, help='Cantidad de docentes sintéticos')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por medición (se informa la mediana)')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        print(f"Poblando la base con {args.docentes} docentes...")
+        poblar(args.docentes)
+
+        print("\nCodificación JSON (ms):")
+        nodes, edges = grafo_cache.grafo()
+        cargas = {
+            'docentes': {'success': True, 'data': docentes_schema.dump(Docente.query.all())},
+            'asignaciones': {'success': True, 'data': asignaciones_docentes_schema.dump(AsignacionDocente.query.all())},
+            'grafo': {'success': True, 'data': {'nodes': nodes, 'edges': edges}},
+        }
+        estandar = DefaultJSONProvider(app)
+        for nombre, carga in cargas.items():
+            with app.test_request_context():
+                antes = medir(lambda: estandar.response(carga), args.repeticiones)
+                ahora = medir(lambda: app.json.response(carga), args.repeticiones)
+            print(f"- {nombre}: stdlib {antes:.1f} ms, {type(app.json).__name__} {ahora:.1f} ms ({antes / ahora:.1f}x)")
+
+    codificaciones = ['identity', 'gzip'] + (['br'] if brotli is not None else [])
+    print(f"\nBytes enviados y tiempo de respuesta ({', '.join(codificaciones)}):")
+    client = app.test_client()
+    for url in ENDPOINTS:
+        resultados = []
+        for codificacion in codificaciones:
+            headers = {'Accept-Encoding': codificacion}
+            response = client.get(url, headers=headers)
+            tamanio = len(response.get_data())
+            tiempo = medir(lambda: client.get(url, headers=headers).get_data(), args.repeticiones)
+            resultados.append(f"{codificacion} {tamanio / 1024:.0f} KiB / {tiempo:.0f} ms")
+        print(f"- {url}: " + ', '.join(resultados))
+
+if __name__ == '__main__':
+    main()
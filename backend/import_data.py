@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Script para importar masivamente archivos CSV o NDJSON a la base de datos.
+Las filas se insertan o actualizan (upsert) por su clave natural:
+email del docente, código del curso, (anio, semestre) del período y DOI de la producción.
+Las columnas multivaluadas (lineas, autores) se separan con ';'.
+
+Uso:
+    python import_data.py docentes docentes.csv
+    python import_data.py producciones_academicas producciones.ndjson --chunk-size 10000
+    python import_data.py asignaciones_docentes asignaciones.csv   # columnas docente, curso, anio, semestre, horas_asignadas
+"""
+
+import argparse
+import os
+from app import create_app
+from app.services.import_service import ENTIDADES, ImportService, leer_archivo
+
+def main():
+    parser = argparse.ArgumentParser(description='Importar archivos CSV/NDJSON a la base de datos')
+    parser.add_argument('entidad', choices=list(ENTIDADES), help='Entidad a importar')
+    parser.add_argument('archivos', nargs='+', help='Archivos a importar')
+    parser.add_argument('--formato', choices=['csv', 'ndjson'], help='Formato (por defecto según la extensión)')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Filas por bloque (una transacción por bloque)')
+    args = parser.parse_args()
+    
+    app = create_app()
+    
+    with app.app_context():
+        service = ImportService(chunk_size=args.chunk_size)
+        for ruta in args.archivos:
+            formato = args.formato or ('csv' if os.path.splitext(ruta)[1].lower() == '.csv' else 'ndjson')
+            print(f"Importando {ruta} ({formato}) en {args.entidad}...")
+            with open(ruta, encoding='utf-8', newline='') as archivo:
+                reporte = service.importar(args.entidad, leer_archivo(archivo, formato))
+            
+            print(f"- {reporte['filas']} filas: {reporte['insertadas']} insertadas, "
+                  f"{reporte['actualizadas']} actualizadas, {reporte['total_errores']} con error")
+            print(f"- {reporte['segundos']} s ({reporte['filas_por_segundo']} filas/s)")
+            for error in reporte['errores']:
+                print(f"  fila {error['fila']}: {error['error']}")
+        
+        print("\n¡Importación completada!")
+
+if __name__ == '__main__':
+    main()
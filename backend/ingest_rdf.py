@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Script para cargar volcados RDF (como dml.rdf) en la base de datos relacional.
+Las instancias de las clases acad: se insertan o actualizan por su clave natural
+(email del docente, código del curso, DOI, (anio, semestre) del período, nombre
+de áreas y líneas), igual que en import_data.py.
+
+Uso:
+    python ingest_rdf.py ../dml.rdf
+    python ingest_rdf.py volcado.nt --chunk-size 10000
+    python ingest_rdf.py datos.ttl --formato turtle
+"""
+
+import argparse
+from app import create_app
+from app.services.rdf_ingest_service import RDFIngestService
+
+def main():
+    parser = argparse.ArgumentParser(description='Cargar archivos RDF en la base de datos')
+    parser.add_argument('archivos', nargs='+', help='Archivos RDF a cargar')
+    parser.add_argument('--formato', choices=['xml', 'turtle', 'nt', 'nquads'], help='Formato (por defecto según la extensión)')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Filas por bloque (una transacción por bloque)')
+    args = parser.parse_args()
+    
+    app = create_app()
+    
+    with app.app_context():
+        service = RDFIngestService(chunk_size=args.chunk_size)
+        print(f"Cargando {', '.join(args.archivos)}...")
+        reporte = service.ingerir(args.archivos, args.formato)
+        
+        print(f"- {reporte['triples']} triples leídos ({reporte['triples_por_segundo']} triples/s)")
+        for tabla, datos in reporte['entidades'].items():
+            print(f"- {tabla}: {datos['insertadas']} insertadas, {datos['actualizadas']} actualizadas, "
+                  f"{datos['total_errores']} con error")
+            for error in datos['errores']:
+                print(f"  fila {error['fila']}: {error['error']}")
+        
+        print("\n¡Carga completada!")
+        print(f"Total: {reporte['segundos']} s")
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,28 @@
 #!/usr/bin/env python3
 """
 Script para inicializar la base de datos con datos de ejemplo
+
+Uso:
+    python init_db.py                 # tablas, índices de búsqueda y datos de ejemplo
+    python init_db.py --solo-indices  # solo los índices de búsqueda (base existente)
 """
 
+import argparse
 from app import create_app, db
 from app.models.models import (
     LineaInvestigacion, Docente, Curso, PeriodoAcademico, 
     AsignacionDocente, ProduccionAcademica, DisponibilidadHoraria
 )
-from datetime import date, time
+from app.services.busqueda_service import busqueda_service
+
+def crear_indices_busqueda():
+    """Extensiones e índices de trigramas de la búsqueda (solo en PostgreSQL)"""
+    if db.engine.dialect.name != 'postgresql':
+        print("Índices de búsqueda: la base de datos no es PostgreSQL, se usa el índice en memoria")
+        return
+    print("Creando índices de búsqueda (pg_trgm, CREATE INDEX CONCURRENTLY)...")
+    creados = busqueda_service.crear_indices_postgres()
+    print(f"- {len(creados)} índices creados" if creados else "- Los índices ya existían")
 
 def init_database():
     """Inicializar la base de datos con datos de ejemplo"""
@@ -18,6 +32,12 @@ def init_database():
         # Crear tablas
         db.create_all()
         
+        try:
+            crear_indices_busqueda()
+        except Exception as e:
+            # Sin permisos para crear extensiones la búsqueda usa el índice en memoria
+            print(f"Índices de búsqueda no creados: {e}")
+        
         print("Creando líneas de investigación...")
         
         # Crear líneas de investigación
@@ -41,36 +61,36 @@ def init_database():
                 nombre="Dr. Juan Pérez",
                 grado_academico="Doctorado en Ciencias de la Computación",
                 orcid="0000-0001-2345-6789",
-                correo="juan.perez@universidad.edu",
-                linea_investigacion_id=1
+                email="juan.perez@universidad.edu",
+                lineas_investigacion=[lineas[0]]
             ),
             Docente(
                 nombre="Dra. María García",
                 grado_academico="Doctorado en Inteligencia Artificial",
                 orcid="0000-0002-3456-7890",
-                correo="maria.garcia@universidad.edu",
-                linea_investigacion_id=2
+                email="maria.garcia@universidad.edu",
+                lineas_investigacion=[lineas[1]]
             ),
             Docente(
                 nombre="Dr. Carlos López",
                 grado_academico="Doctorado en Sistemas Distribuidos",
                 orcid="0000-0003-4567-8901",
-                correo="carlos.lopez@universidad.edu",
-                linea_investigacion_id=3
+                email="carlos.lopez@universidad.edu",
+                lineas_investigacion=[lineas[2]]
             ),
             Docente(
                 nombre="Dra. Ana Rodríguez",
                 grado_academico="Doctorado en Ingeniería de Software",
                 orcid="0000-0004-5678-9012",
-                correo="ana.rodriguez@universidad.edu",
-                linea_investigacion_id=4
+                email="ana.rodriguez@universidad.edu",
+                lineas_investigacion=[lineas[3]]
             ),
             Docente(
                 nombre="Dr. Luis Martínez",
                 grado_academico="Doctorado en Ciberseguridad",
                 orcid="0000-0005-6789-0123",
-                correo="luis.martinez@universidad.edu",
-                linea_investigacion_id=5
+                email="luis.martinez@universidad.edu",
+                lineas_investigacion=[lineas[4]]
             )
         ]
         
@@ -82,16 +102,16 @@ def init_database():
         
         # Crear cursos
         cursos = [
-            Curso(nombre="Introducción a la Inteligencia Artificial", linea_investigacion_id=1),
-            Curso(nombre="Machine Learning Avanzado", linea_investigacion_id=2),
-            Curso(nombre="Sistemas Distribuidos", linea_investigacion_id=3),
-            Curso(nombre="Ingeniería de Software", linea_investigacion_id=4),
-            Curso(nombre="Ciberseguridad Aplicada", linea_investigacion_id=5),
-            Curso(nombre="Redes Neuronales", linea_investigacion_id=1),
-            Curso(nombre="Deep Learning", linea_investigacion_id=2),
-            Curso(nombre="Computación en la Nube", linea_investigacion_id=3),
-            Curso(nombre="Arquitectura de Software", linea_investigacion_id=4),
-            Curso(nombre="Criptografía", linea_investigacion_id=5)
+            Curso(nombre="Introducción a la Inteligencia Artificial", codigo="INF101", creditos=4, lineas_investigacion=[lineas[0]]),
+            Curso(nombre="Machine Learning Avanzado", codigo="INF102", creditos=4, lineas_investigacion=[lineas[1]]),
+            Curso(nombre="Sistemas Distribuidos", codigo="INF103", creditos=4, lineas_investigacion=[lineas[2]]),
+            Curso(nombre="Ingeniería de Software", codigo="INF104", creditos=4, lineas_investigacion=[lineas[3]]),
+            Curso(nombre="Ciberseguridad Aplicada", codigo="INF105", creditos=4, lineas_investigacion=[lineas[4]]),
+            Curso(nombre="Redes Neuronales", codigo="INF106", creditos=3, lineas_investigacion=[lineas[0]]),
+            Curso(nombre="Deep Learning", codigo="INF107", creditos=3, lineas_investigacion=[lineas[1]]),
+            Curso(nombre="Computación en la Nube", codigo="INF108", creditos=3, lineas_investigacion=[lineas[2]]),
+            Curso(nombre="Arquitectura de Software", codigo="INF109", creditos=3, lineas_investigacion=[lineas[3]]),
+            Curso(nombre="Criptografía", codigo="INF110", creditos=3, lineas_investigacion=[lineas[4]])
         ]
         
         for curso in cursos:
@@ -104,13 +124,13 @@ def init_database():
         periodos = [
             PeriodoAcademico(
                 nombre="2025-I",
-                fecha_inicio=date(2025, 1, 15),
-                fecha_fin=date(2025, 5, 30)
+                anio=2025,
+                semestre=1
             ),
             PeriodoAcademico(
                 nombre="2025-II",
-                fecha_inicio=date(2025, 8, 15),
-                fecha_fin=date(2025, 12, 30)
+                anio=2025,
+                semestre=2
             )
         ]
         
@@ -143,49 +163,39 @@ def init_database():
         # Crear producción académica
         producciones = [
             ProduccionAcademica(
-                docente_id=1,
-                tipo="Artículo",
                 titulo="Aplicación de Redes Neuronales en el Reconocimiento de Patrones",
-                anio=2024,
+                anio_publicacion=2024,
                 revista="Journal of Artificial Intelligence",
                 doi="10.1000/ai.2024.001",
-                enlace="https://doi.org/10.1000/ai.2024.001"
+                autores=[docentes[0]]
             ),
             ProduccionAcademica(
-                docente_id=2,
-                tipo="Artículo",
                 titulo="Algoritmos de Machine Learning para Predicción de Datos",
-                anio=2024,
+                anio_publicacion=2024,
                 revista="Machine Learning Quarterly",
                 doi="10.1000/ml.2024.002",
-                enlace="https://doi.org/10.1000/ml.2024.002"
+                autores=[docentes[1]]
             ),
             ProduccionAcademica(
-                docente_id=3,
-                tipo="Libro",
                 titulo="Sistemas Distribuidos: Teoría y Práctica",
-                anio=2023,
+                anio_publicacion=2023,
                 revista="Editorial Universitaria",
                 doi="10.1000/book.2023.001",
-                enlace="https://doi.org/10.1000/book.2023.001"
+                autores=[docentes[2]]
             ),
             ProduccionAcademica(
-                docente_id=4,
-                tipo="Ponencia",
                 titulo="Metodologías Ágiles en el Desarrollo de Software",
-                anio=2024,
+                anio_publicacion=2024,
                 revista="Conferencia Internacional de Ingeniería de Software",
                 doi="10.1000/conf.2024.001",
-                enlace="https://doi.org/10.1000/conf.2024.001"
+                autores=[docentes[3]]
             ),
             ProduccionAcademica(
-                docente_id=5,
-                tipo="Artículo",
                 titulo="Nuevas Técnicas de Criptografía para la Seguridad Informática",
-                anio=2024,
+                anio_publicacion=2024,
                 revista="Journal of Cybersecurity",
                 doi="10.1000/cyber.2024.001",
-                enlace="https://doi.org/10.1000/cyber.2024.001"
+                autores=[docentes[4]]
             )
         ]
         
@@ -199,45 +209,31 @@ def init_database():
         disponibilidades = [
             DisponibilidadHoraria(
                 docente_id=1,
-                dia_semana="Lunes",
-                hora_inicio=time(8, 0),
-                hora_fin=time(12, 0)
+                descripcion="Lunes 08:00 - 12:00"
             ),
             DisponibilidadHoraria(
                 docente_id=1,
-                dia_semana="Martes",
-                hora_inicio=time(14, 0),
-                hora_fin=time(18, 0)
+                descripcion="Martes 14:00 - 18:00"
             ),
             DisponibilidadHoraria(
                 docente_id=2,
-                dia_semana="Miércoles",
-                hora_inicio=time(8, 0),
-                hora_fin=time(12, 0)
+                descripcion="Miércoles 08:00 - 12:00"
             ),
             DisponibilidadHoraria(
                 docente_id=2,
-                dia_semana="Jueves",
-                hora_inicio=time(14, 0),
-                hora_fin=time(18, 0)
+                descripcion="Jueves 14:00 - 18:00"
             ),
             DisponibilidadHoraria(
                 docente_id=3,
-                dia_semana="Viernes",
-                hora_inicio=time(8, 0),
-                hora_fin=time(12, 0)
+                descripcion="Viernes 08:00 - 12:00"
             ),
             DisponibilidadHoraria(
                 docente_id=4,
-                dia_semana="Lunes",
-                hora_inicio=time(14, 0),
-                hora_fin=time(18, 0)
+                descripcion="Lunes 14:00 - 18:00"
             ),
             DisponibilidadHoraria(
                 docente_id=5,
-                dia_semana="Martes",
-                hora_inicio=time(8, 0),
-                hora_fin=time(12, 0)
+                descripcion="Martes 08:00 - 12:00"
             )
         ]
         
@@ -256,4 +252,12 @@ def init_database():
         print(f"- {len(disponibilidades)} disponibilidades horarias")
 
 if __name__ == '__main__':
-    init_database() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Inicializar la base de datos')
+    parser.add_argument('--solo-indices', action='store_true', help='Solo crear los índices de búsqueda en una base existente')
+    args = parser.parse_args()
+    
+    if args.solo_indices:
+        with create_app().app_context():
+            crear_indices_busqueda()
+    else:
+        init_database() 
\ No newline at end of file
@@ -1,4 +1,5 @@
 from app import create_app, db
+from app.services.autocomplete_index import autocomplete_index
 from app.models.models import (
     LineaInvestigacion, Docente, Curso, PeriodoAcademico, 
     AsignacionDocente, ProduccionAcademica, DisponibilidadHoraria
@@ -6,6 +7,14 @@ from app.models.models import (
 
 app = create_app()
 
+# El índice de autocompletado se construye al iniciar (si las tablas aún no existen, en la primera consulta)
+with app.app_context():
+    try:
+        autocomplete_index.rebuild()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Índice de autocompletado no construido al iniciar: {e}")
+
 def create_tables():
     """Crear las tablas de la base de datos si no existen"""
     db.create_all()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Script para cargar el RDF generado desde la base de datos en el triplestore (Apache Jena Fuseki)
+usando el Graph Store Protocol, con un grafo con nombre por tipo de entidad.
+
+Uso:
+    python sync_triplestore.py                          # todas las tablas
+    python sync_triplestore.py --tablas docentes cursos # solo esos grafos
+"""
+
+import argparse
+from app import create_app
+from app.services.rdf_service import URI_PREFIJOS
+from app.services.triplestore_sync import TriplestoreSyncService
+
+def main():
+    parser = argparse.ArgumentParser(description='Sincronizar la base de datos con el triplestore')
+    parser.add_argument('--tablas', nargs='+', choices=list(URI_PREFIJOS), help='Tablas a sincronizar (por defecto todas)')
+    parser.add_argument('--endpoint', help='Endpoint Graph Store Protocol (por defecto SPARQL_DATA_ENDPOINT)')
+    parser.add_argument('--batch-size', type=int, default=50000, help='Triples por petición')
+    parser.add_argument('--sin-compresion', action='store_true', help='Enviar los lotes sin gzip')
+    args = parser.parse_args()
+    
+    app = create_app()
+    
+    with app.app_context():
+        service = TriplestoreSyncService(
+            data_endpoint=args.endpoint,
+            batch_size=args.batch_size,
+            compress=not args.sin_compresion
+        )
+        print(f"Sincronizando con {service.data_endpoint}...")
+        reporte = service.sync(args.tablas)
+        
+        for tabla, datos in reporte['tablas'].items():
+            print(f"- {tabla}: {datos['triples']} triples en {datos['lotes']} lotes "
+                  f"({datos['triples_por_segundo']} triples/s)")
+        
+        print("\n¡Sincronización completada!")
+        print(f"Total: {reporte['triples']} triples, {reporte['bytes_enviados']} bytes enviados, "
+              f"{reporte['segundos']} s ({reporte['triples_por_segundo']} triples/s)")
+
+if __name__ == '__main__':
+    main()
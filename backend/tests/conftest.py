@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Las pruebas nunca usan la base de datos configurada
+os.environ['DATABASE_URL'] = 'sqlite://'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from app import create_app, db
+from app.services.autocomplete_index import autocomplete_index
+from app.services.busqueda_service import indice_busqueda, CAMPOS_BUSQUEDA
+from app.services.carga_horaria_cube import carga_horaria_cube
+from app.services.estadisticas_service import estadisticas_store
+from app.services.grafo_service import grafo_cache
+from app.services.rdf_service import rdf_graph_cache
+
+@pytest.fixture
+def app():
+    """App con una base SQLite en memoria vacía"""
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        # Los cachés en memoria son del proceso: se reconstruyen sobre la base vacía de cada prueba
+        for cache in (rdf_graph_cache, grafo_cache, estadisticas_store, carga_horaria_cube, autocomplete_index):
+            cache.rebuild()
+        for tabla in CAMPOS_BUSQUEDA:
+            indice_busqueda.rebuild(tabla)
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+class ServidorStub:
+    """
+    Servidor HTTP local (HTTP/1.1 keep-alive) que registra cada petición y responde
+    `respuesta` como JSON, opcionalmente después de `demora` segundos.
+    """
+    def __init__(self):
+        self.peticiones = []
+        self.respuesta = {'head': {'vars': []}, 'results': {'bindings': []}}
+        self.demora = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                stub._responder(self)
+
+            do_PUT = do_POST
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_port}'
+
+    def _responder(self, handler):
+        cuerpo = handler.rfile.read(int(handler.headers.get('Content-Length', 0)))
+        self.peticiones.append({
+            'metodo': handler.command,
+            'ruta': handler.path,
+            'headers': dict(handler.headers),
+            'cuerpo': cuerpo,
+            'puerto_cliente': handler.client_address[1],
+        })
+        if self.demora:
+            time.sleep(self.demora)
+        body = json.dumps(self.respuesta).encode('utf-8')
+        try:
+            handler.send_response(200)
+            handler.send_header('Content-Type', 'application/sparql-results+json')
+            handler.send_header('Content-Length', str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        except OSError:
+            # El cliente ya cerró la conexión (timeout)
+            handler.close_connection = True
+
+@pytest.fixture
+def servidor_http():
+    stub = ServidorStub()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
@@ -0,0 +1,47 @@
+import json
+from sqlalchemy import func, select
+from app import db
+from app.models.models import AsignacionDocente
+from app.services.carga_horaria_cube import carga_horaria_cube
+from app.services.rdf_service import RDFService, rdf_graph_cache
+from test_rdf_service import poblar
+
+def test_lote_con_errores_por_fila_y_caches_consistentes(app):
+    poblar(4)
+    rdf_graph_cache.rebuild()
+    carga_horaria_cube.rebuild()
+    filas = [
+        {'op': 'create', 'docente_id': 1, 'curso_id': 2, 'periodo_id': 1, 'horas_asignadas': 7},
+        {'op': 'create', 'docente_id': 999, 'curso_id': 1, 'periodo_id': 1},
+        {'op': 'update', 'id': 2, 'horas_asignadas': 9},
+        {'op': 'update', 'id': 999, 'horas_asignadas': 1},
+        {'op': 'delete', 'id': 3},
+        {'op': 'mover', 'id': 4},
+    ]
+    body = ''.join(json.dumps(fila) + '\n' for fila in filas) + 'no es json\n'
+
+    response = app.test_client().post(
+        '/api/asignaciones-docentes/bulk', data=body, content_type='application/x-ndjson'
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    [creada] = data['creadas']
+    assert creada['indice'] == 0
+    assert (data['actualizadas'], data['eliminadas']) == (1, 1)
+    assert [error['indice'] for error in data['errores']] == [1, 3, 5, 6]
+    assert data['errores'][0]['error'] == 'El docente no existe'
+
+    # Las filas válidas se escribieron; las inválidas no tocaron la base
+    assert db.session.get(AsignacionDocente, creada['id']).horas_asignadas == 7
+    assert db.session.get(AsignacionDocente, 2).horas_asignadas == 9
+    assert db.session.get(AsignacionDocente, 3) is None
+    assert AsignacionDocente.query.count() == 8
+
+    # Los cachés en memoria recibieron las escrituras masivas
+    with rdf_graph_cache.read() as graph:
+        assert set(graph) == set(RDFService().generate_rdf_from_database())
+    por_docente = dict(db.session.execute(
+        select(AsignacionDocente.docente_id, func.sum(AsignacionDocente.horas_asignadas)).group_by(AsignacionDocente.docente_id)
+    ).all())
+    assert {fila['docente']['id']: fila['total_horas'] for fila in carga_horaria_cube.agrupar(['docente'])} == por_docente
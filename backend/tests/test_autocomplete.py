@@ -0,0 +1,26 @@
+from app.routes import docente
+
+def sugerencias(client, tipo, q):
+    response = client.get(f'/api/autocomplete?tipo={tipo}&q={q}')
+    assert response.status_code == 200
+    return [item['nombre'] for item in response.get_json()['data']]
+
+def test_autocompletado_sigue_las_escrituras(app, monkeypatch):
+    monkeypatch.setattr(docente.triplestore_sync, 'programar', lambda tablas: None)
+    client = app.test_client()
+    assert sugerencias(client, 'docentes', 'ang') == []
+
+    docente_id = client.post('/api/docentes/', json={
+        'nombre': 'Ángela Ruiz', 'email': 'angela@universidad.edu'
+    }).get_json()['data']['id']
+    # Sin tildes ni mayúsculas, desde el inicio del nombre o desde otra palabra
+    assert sugerencias(client, 'docentes', 'ANGE') == ['Ángela Ruiz']
+    assert sugerencias(client, 'docentes', 'rui') == ['Ángela Ruiz']
+
+    client.put(f'/api/docentes/{docente_id}', json={'nombre': 'Beatriz Ruiz'})
+    assert sugerencias(client, 'docentes', 'ange') == []
+    assert sugerencias(client, 'docentes', 'bea') == ['Beatriz Ruiz']
+
+    client.delete(f'/api/docentes/{docente_id}')
+    assert sugerencias(client, 'docentes', 'bea') == []
+    assert sugerencias(client, 'docentes', 'rui') == []
@@ -0,0 +1,22 @@
+from sqlalchemy import event
+from app import db
+from app.models.models import Docente
+
+def test_buscar_sin_tildes_y_sin_ddl_durante_la_peticion(app):
+    db.session.add_all([
+        Docente(nombre='José Núñez', email='jose@universidad.edu', especialidad='Redes'),
+        Docente(nombre='Ana Pérez', email='ana@universidad.edu', especialidad='Bases de datos'),
+    ])
+    db.session.commit()
+    sentencias = []
+    registrar = lambda conn, cursor, statement, *args: sentencias.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    try:
+        response = app.test_client().get('/api/docentes/buscar?q=nunez')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', registrar)
+
+    assert response.status_code == 200
+    assert [docente['nombre'] for docente in response.get_json()['data']] == ['José Núñez']
+    assert response.headers['X-Total-Count'] == '1'
+    assert not [sentencia for sentencia in sentencias if sentencia.lstrip().upper().startswith(('CREATE', 'DROP'))]
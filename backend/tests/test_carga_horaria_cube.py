@@ -0,0 +1,54 @@
+from sqlalchemy import func, select
+from app import db
+from app.models.models import AsignacionDocente, Curso, cursos_lineas_investigacion
+from app.services.carga_horaria_cube import carga_horaria_cube
+from test_rdf_service import poblar
+
+def por_sql(*columnas, filtro=None, join=None):
+    """{(ids...): (total_horas, asignaciones)} con un GROUP BY en la base de datos"""
+    statement = select(*columnas, func.sum(AsignacionDocente.horas_asignadas), func.count()).select_from(AsignacionDocente)
+    for tabla, condicion in join or ():
+        statement = statement.join(tabla, condicion)
+    if filtro is not None:
+        statement = statement.where(filtro)
+    statement = statement.group_by(*columnas)
+    return {tuple(fila[:-2]): (fila[-2], fila[-1]) for fila in db.session.execute(statement)}
+
+def por_cubo(client, consulta, dimensiones):
+    response = client.get(f'/api/asignaciones-docentes/carga-horaria/cubo?{consulta}')
+    assert response.status_code == 200
+    return {
+        tuple(fila[dimension]['id'] for dimension in dimensiones): (fila['total_horas'], fila['asignaciones'])
+        for fila in response.get_json()['data']
+    }
+
+def test_cubo_coincide_con_group_by_tras_escrituras(app):
+    poblar(12)
+    carga_horaria_cube.rebuild()
+    # Escrituras después de cargar el cubo: horas distintas, una baja y un alta
+    for asignacion in AsignacionDocente.query.filter(AsignacionDocente.id % 3 == 0):
+        asignacion.horas_asignadas = asignacion.id
+    db.session.delete(db.session.get(AsignacionDocente, 1))
+    db.session.add(AsignacionDocente(docente_id=2, curso_id=3, periodo_id=2, horas_asignadas=10))
+    db.session.get(Curso, 2).area_id = 3
+    db.session.commit()
+    client = app.test_client()
+
+    assert por_cubo(client, 'dimensiones=docente,periodo', ('docente', 'periodo')) == por_sql(
+        AsignacionDocente.docente_id, AsignacionDocente.periodo_id
+    )
+    assert por_cubo(client, 'dimensiones=area', ('area',)) == por_sql(
+        Curso.area_id, join=[(Curso, Curso.id == AsignacionDocente.curso_id)]
+    )
+    # Dimensión multivaluada: cada asignación suma en cada línea de su curso
+    assert por_cubo(client, 'dimensiones=linea', ('linea',)) == por_sql(
+        cursos_lineas_investigacion.c.linea_investigacion_id,
+        join=[(cursos_lineas_investigacion, cursos_lineas_investigacion.c.curso_id == AsignacionDocente.curso_id)]
+    )
+    assert por_cubo(client, 'dimensiones=curso&periodo=1', ('curso',)) == por_sql(
+        AsignacionDocente.curso_id, filtro=AsignacionDocente.periodo_id == 1
+    )
+
+    niveles = client.get('/api/asignaciones-docentes/carga-horaria/cubo?dimensiones=periodo&rollup=true').get_json()['data']
+    [total] = niveles[-1]['filas']
+    assert (total['total_horas'], total['asignaciones']) == por_sql()[()]
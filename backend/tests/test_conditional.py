@@ -0,0 +1,100 @@
+from app import db
+from app.models.models import PeriodoAcademico
+
+def get_cerrada(client, url, **kwargs):
+    """GET que cierra la respuesta: el listado completo se envía por streaming"""
+    response = client.get(url, **kwargs)
+    response.close()
+    return response
+
+def test_get_devuelve_304_hasta_que_cambia_la_tabla(app):
+    client = app.test_client()
+    response = get_cerrada(client, '/api/periodos-academicos/')
+    etag = response.headers['ETag']
+
+    assert get_cerrada(client, '/api/periodos-academicos/', headers={'If-None-Match': etag}).status_code == 304
+
+    db.session.add(PeriodoAcademico(nombre='2025-I', anio=2025, semestre=1))
+    db.session.commit()
+    response = get_cerrada(client, '/api/periodos-academicos/', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+class TransporteFalso:
+    def query(self, query):
+        return {'head': {'vars': []}, 'results': {'bindings': []}}
+
+def test_consultas_sparql_sin_validadores(app, monkeypatch):
+    from app.routes import sparql
+    monkeypatch.setattr(sparql.sparql_service, 'transport', TransporteFalso())
+    client = app.test_client()
+    response = client.get('/api/sparql/consultas-predefinidas')
+
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+    assert 'Last-Modified' not in response.headers
+    assert response.headers['Cache-Control'] == 'public, max-age=3600'
+
+    # Los resultados vienen del triplestore: nunca se responden con 304 a partir de las tablas
+    response = client.get('/api/sparql/lineas-investigacion-docentes', headers={'If-None-Match': '*'})
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+class RelojFijo:
+    """Reemplazo de datetime en conditional.py con la hora actual fija"""
+    ahora = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.ahora
+
+def test_if_modified_since_no_confia_en_el_segundo_en_curso(app, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+    from werkzeug.http import http_date
+    from app.utils import conditional
+    from app.utils.change_tracking import table_versions
+
+    modificada = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    monkeypatch.setitem(table_versions._modificadas, 'periodos_academicos', modificada)
+    monkeypatch.setattr(conditional, 'datetime', RelojFijo)
+    client = app.test_client()
+    headers = {'If-Modified-Since': http_date(modificada)}
+
+    # Dentro del mismo segundo otra escritura tendría la misma fecha: ni Last-Modified ni 304
+    RelojFijo.ahora = modificada + timedelta(milliseconds=500)
+    response = get_cerrada(client, '/api/periodos-academicos/', headers=headers)
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response.headers
+
+    RelojFijo.ahora = modificada + timedelta(seconds=1, milliseconds=200)
+    response = get_cerrada(client, '/api/periodos-academicos/')
+    assert response.last_modified == modificada
+    assert get_cerrada(client, '/api/periodos-academicos/', headers=headers).status_code == 304
+
+def test_etag_del_grafo_cambia_al_publicar_el_layout(app, monkeypatch):
+    from test_grafo import LayoutLento, esperar_layout
+    from app.models.models import Docente
+    from app.services.grafo_service import grafo_cache
+    layout = LayoutLento()
+    monkeypatch.setattr(grafo_cache, 'layout', layout)
+    docente = Docente(nombre='Ana Torres', email='ana@universidad.edu')
+    db.session.add(docente)
+    db.session.commit()
+    client = app.test_client()
+    url = f'/api/visualizacion/vecindario/docente/{docente.id}'
+
+    # Sin escribir en las tablas, las coordenadas llegan cuando termina el layout en segundo plano
+    assert layout.en_curso.wait(5)
+    response = client.get(url)
+    etag = response.headers['ETag']
+    assert 'Last-Modified' not in response.headers
+    assert 'x' not in response.get_json()['data']['nodes'][0]
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    layout.liberar.set()
+    esperar_layout(grafo_cache)
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert 'x' in response.get_json()['data']['nodes'][0]
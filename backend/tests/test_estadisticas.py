@@ -0,0 +1,19 @@
+from app import db
+from app.models.models import ProduccionAcademica
+from app.services.estadisticas_service import TOP_N
+
+def test_por_revista_devuelve_solo_las_top_n(app):
+    # Revista k con k producciones: las más frecuentes son las de mayor k
+    db.session.add_all([
+        ProduccionAcademica(titulo=f'Publicación {k}-{i}', revista=f'Revista {k}', anio_publicacion=2024)
+        for k in range(1, TOP_N + 4) for i in range(k)
+    ])
+    db.session.commit()
+
+    data = app.test_client().get('/api/produccion-academica/estadisticas').get_json()['data']
+
+    assert data['revistas_distintas'] == TOP_N + 3
+    assert data['por_revista'] == [
+        {'revista': f'Revista {k}', 'cantidad': k} for k in range(TOP_N + 3, 3, -1)
+    ]
+    assert data['total_producciones'] == sum(range(1, TOP_N + 4))
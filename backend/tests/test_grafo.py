@@ -0,0 +1,60 @@
+import threading
+import time
+from app import db
+from app.models.models import Docente, LineaInvestigacion
+from app.services.grafo_service import GrafoCache
+from app.services.grafo_layout import GrafoLayout
+
+class LayoutLento(GrafoLayout):
+    """Layout que espera una señal antes de calcular, para observar el grafo mientras corre"""
+    def __init__(self):
+        super().__init__()
+        self.en_curso = threading.Event()
+        self.liberar = threading.Event()
+
+    def calcular(self, revision, nodes, edges):
+        self.en_curso.set()
+        self.liberar.wait(5)
+        super().calcular(revision, nodes, edges)
+
+def esperar_layout(cache, timeout=5):
+    limite = time.monotonic() + timeout
+    while cache.layout.vigente[0] != cache.revision and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert cache.layout.vigente[0] == cache.revision
+
+def poblar():
+    linea = LineaInvestigacion(nombre='Inteligencia Artificial')
+    db.session.add_all([
+        Docente(nombre=f'Docente {i}', email=f'd{i}@universidad.edu', lineas_investigacion=[linea]) for i in range(3)
+    ])
+    db.session.commit()
+    return linea
+
+def test_el_layout_no_bloquea_el_grafo(app):
+    linea = poblar()
+    cache = GrafoCache(layout=LayoutLento())
+    cache.rebuild()
+    assert cache.layout.en_curso.wait(5)
+
+    # Mientras se calcula el layout el grafo responde y acepta cambios (sin coordenadas aún)
+    nodes, edges, truncated = cache.vecindario(f'linea_{linea.id}', hops=1)
+    assert len(nodes) == 4 and len(edges) == 3 and not truncated
+    assert all('x' not in nodo for nodo in nodes)
+    cache.aplicar({})
+
+    cache.layout.liberar.set()
+    esperar_layout(cache)
+    nodes, _, _ = cache.vecindario(f'linea_{linea.id}', hops=1)
+    assert all('x' in nodo and 'y' in nodo for nodo in nodes)
+
+def test_payload_se_regenera_al_publicar_el_layout(app):
+    poblar()
+    cache = GrafoCache(layout=LayoutLento())
+    _, etag_sin_layout = cache.payload()
+
+    cache.layout.liberar.set()
+    esperar_layout(cache)
+    body, etag = cache.payload()
+    assert etag != etag_sin_layout
+    assert b'"x"' in body
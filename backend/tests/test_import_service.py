@@ -0,0 +1,64 @@
+import io
+import json
+from app.models.models import AsignacionDocente, Curso, Docente, LineaInvestigacion, PeriodoAcademico
+from app.services.import_service import ImportService, leer_archivo
+from app import db
+
+DOCENTES_CSV = """nombre,email,titulo,lineas
+Ana Torres,ana@universidad.edu,Dra.,Inteligencia Artificial;Robótica
+Juan Pérez,juan@universidad.edu,,Robótica
+"""
+
+def importar(entidad, texto, formato):
+    return ImportService(chunk_size=2).importar(entidad, leer_archivo(io.StringIO(texto), formato))
+
+def test_csv_hace_upsert_por_email(app):
+    reporte = importar('docentes', DOCENTES_CSV, 'csv')
+    assert (reporte['insertadas'], reporte['actualizadas'], reporte['total_errores']) == (2, 0, 0)
+    # Las líneas referenciadas por nombre se crean una sola vez
+    assert sorted(linea.nombre for linea in LineaInvestigacion.query) == ['Inteligencia Artificial', 'Robótica']
+
+    # Misma clave natural (email): se actualiza la fila y se reemplazan sus líneas; la nueva se inserta
+    reporte = importar('docentes', (
+        "nombre,email,titulo,lineas\n"
+        "Ana María Torres,ana@universidad.edu,Dra.,Robótica\n"
+        "Luis Gómez,luis@universidad.edu,Mg.,\n"
+        "Sin Email,,,\n"
+    ), 'csv')
+    assert (reporte['insertadas'], reporte['actualizadas'], reporte['total_errores']) == (1, 1, 1)
+    assert reporte['errores'] == [{'fila': 3, 'error': 'El campo email es requerido'}]
+
+    db.session.expire_all()
+    assert Docente.query.count() == 3
+    ana = Docente.query.filter_by(email='ana@universidad.edu').one()
+    assert ana.nombre == 'Ana María Torres'
+    assert [linea.nombre for linea in ana.lineas_investigacion] == ['Robótica']
+    assert Docente.query.filter_by(email='luis@universidad.edu').one().lineas_investigacion == []
+
+def test_ndjson_asignaciones_por_claves_naturales(app):
+    importar('docentes', DOCENTES_CSV, 'csv')
+    importar('cursos', '{"nombre": "Robótica I", "codigo": "ROB1", "creditos": 4, "area": "Ingeniería"}\n', 'ndjson')
+    importar('periodos_academicos', 'nombre,anio,semestre\n2025-I,2025,1\n', 'csv')
+
+    def asignacion(email, horas):
+        return json.dumps({'docente': email, 'curso': 'ROB1', 'anio': 2025, 'semestre': 1, 'horas_asignadas': horas})
+
+    reporte = importar('asignaciones_docentes', '\n'.join([
+        asignacion('ana@universidad.edu', 4),
+        asignacion('juan@universidad.edu', 6),
+        asignacion('nadie@universidad.edu', 2),
+        '{no es json',
+    ]), 'ndjson')
+    assert (reporte['insertadas'], reporte['total_errores']) == (2, 2)
+    assert sorted(error['fila'] for error in reporte['errores']) == [3, 4]
+
+    # Docente, curso y período identifican la asignación: reimportar actualiza las horas
+    reporte = importar('asignaciones_docentes', asignacion('ana@universidad.edu', 8), 'ndjson')
+    assert (reporte['insertadas'], reporte['actualizadas']) == (0, 1)
+    db.session.expire_all()
+    ana = Docente.query.filter_by(email='ana@universidad.edu').one()
+    curso = Curso.query.filter_by(codigo='ROB1').one()
+    periodo = PeriodoAcademico.query.filter_by(anio=2025, semestre=1).one()
+    assert AsignacionDocente.query.count() == 2
+    assert AsignacionDocente.query.filter_by(docente_id=ana.id, curso_id=curso.id, periodo_id=periodo.id).one().horas_asignadas == 8
+    assert curso.area.nombre == 'Ingeniería'
@@ -0,0 +1,46 @@
+from sqlalchemy import insert
+from app import db
+from app.models.models import PeriodoAcademico
+
+def poblar(cantidad):
+    db.session.execute(insert(PeriodoAcademico), [
+        {'id': i, 'nombre': f'Período {i}', 'anio': 2000 + i, 'semestre': 1} for i in range(1, cantidad + 1)
+    ])
+    db.session.commit()
+
+def test_paginacion_por_cursor_recorre_todas_las_filas(app):
+    poblar(7)
+    client = app.test_client()
+    vistos = []
+    after = 0
+    while True:
+        response = client.get(f'/api/periodos-academicos/?after={after}&limit=3&fields=id,nombre')
+        assert response.headers['X-Total-Count'] == '7'
+        filas = response.get_json()['data']
+        assert all(set(fila) == {'id', 'nombre'} for fila in filas)
+        vistos += [fila['id'] for fila in filas]
+        if not response.headers.get('X-Next-After'):
+            break
+        after = response.headers['X-Next-After']
+    assert vistos == list(range(1, 8))
+
+def test_ids_en_el_orden_pedido_con_faltantes(app):
+    poblar(5)
+    response = app.test_client().get('/api/periodos-academicos/?ids=4,1,99,2')
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [fila['id'] for fila in body['data']] == [4, 1, 2]
+    assert body['missing'] == [99]
+
+def test_ids_invalidos(app):
+    response = app.test_client().get('/api/periodos-academicos/?ids=1,a')
+    assert response.status_code == 400
+
+def test_after_o_limit_invalidos_devuelven_400(app):
+    poblar(3)
+    client = app.test_client()
+    for consulta in ('limit=abc', 'after=uno&limit=2', 'after=1.5'):
+        response = client.get(f'/api/periodos-academicos/?{consulta}')
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
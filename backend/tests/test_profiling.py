@@ -0,0 +1,24 @@
+from sqlalchemy import insert
+from app import db
+from app.models.models import PeriodoAcademico
+from app.utils.pagination import STREAM_BATCH_SIZE
+from app.utils.profiling import init_profiling, metricas_store
+
+def test_listado_por_streaming_registra_las_consultas_del_cuerpo(app):
+    init_profiling(app)
+    metricas_store.reset()
+    filas = STREAM_BATCH_SIZE + 100
+    db.session.execute(insert(PeriodoAcademico), [
+        {'nombre': f'{2000 + i}-I', 'anio': 2000 + i, 'semestre': 1} for i in range(filas)
+    ])
+    db.session.commit()
+
+    with app.test_client().get('/api/periodos-academicos/') as response:
+        assert response.is_streamed
+        assert len(response.get_json()['data']) == filas
+    [ruta] = metricas_store.resumen()
+
+    # El conteo (X-Total-Count) en la vista y la consulta del listado mientras se envía el cuerpo
+    assert ruta['ruta'] == 'GET /api/periodos-academicos/'
+    assert ruta['sql_consultas_promedio'] == 2
+    assert ruta['serializacion_ms']['max'] > 0
@@ -0,0 +1,50 @@
+import os
+from rdflib import Graph
+from rdflib.namespace import RDF, RDFS, FOAF
+from app.services.rdf_ingest_service import RDFIngestService, CLASES, ACAD
+from app.services.rdf_service import RDFService
+
+DML = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'dml.rdf')
+
+def relaciones(graph, propiedad, clave_sujeto, clave_objeto):
+    """Pares (clave natural del sujeto, clave natural del objeto) de una propiedad"""
+    return {
+        (str(graph.value(sujeto, clave_sujeto)), str(graph.value(objeto, clave_objeto)))
+        for sujeto, objeto in graph.subject_objects(propiedad)
+    }
+
+def asignaciones(graph):
+    """(email del docente, código del curso, horas) de cada asignación"""
+    filas = set()
+    for asignacion in graph.subjects(RDF.type, ACAD.AsignacionDocente):
+        docente = graph.value(asignacion, ACAD.asignadoA) or graph.value(None, ACAD.tieneAsignacion, asignacion)
+        curso = graph.value(asignacion, ACAD.cursoDictadoEn)
+        filas.add((str(graph.value(docente, FOAF.mbox)), str(graph.value(curso, ACAD.codigo)), int(graph.value(asignacion, ACAD.horasAsignadas))))
+    return filas
+
+def test_ingesta_de_dml_rdf(app):
+    original = Graph().parse(DML, format='xml')
+
+    reporte = RDFIngestService(chunk_size=4).ingerir([DML])
+
+    # Cada instancia del volcado se convierte en una fila, sin errores
+    for tabla, clase in CLASES.items():
+        entidad = reporte['entidades'][tabla]
+        assert entidad['total_errores'] == 0, entidad['errores']
+        assert entidad['insertadas'] == len(set(original.subjects(RDF.type, clase))), tabla
+
+    # El RDF regenerado desde la base conserva las relaciones (comparadas por clave natural)
+    regenerado = RDFService().generate_rdf_from_database()
+    for propiedad, clave_sujeto, clave_objeto in (
+        (ACAD.perteneceLinea, FOAF.mbox, RDFS.label),
+        (ACAD.tieneProduccion, FOAF.mbox, ACAD.doi),
+        (ACAD.relacionadoConLinea, ACAD.codigo, RDFS.label),
+        (ACAD.subAreaDe, RDFS.label, RDFS.label),
+    ):
+        assert relaciones(regenerado, propiedad, clave_sujeto, clave_objeto) == \
+            relaciones(original, propiedad, clave_sujeto, clave_objeto), propiedad
+    assert asignaciones(regenerado) == asignaciones(original) != set()
+
+    # Volver a ingerir el mismo volcado actualiza por clave natural en lugar de duplicar
+    reporte = RDFIngestService().ingerir([DML])
+    assert all(entidad['insertadas'] == 0 for entidad in reporte['entidades'].values())
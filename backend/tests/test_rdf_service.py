@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import event, insert
+from app import db
+from app.models.models import (
+    Area, LineaInvestigacion, PeriodoAcademico, Curso, Docente, ProduccionAcademica,
+    DisponibilidadHoraria, AsignacionDocente, docentes_lineas_investigacion,
+    cursos_lineas_investigacion, docentes_producciones_academicas
+)
+from app.services.rdf_service import RDFService
+
+# Una consulta por tabla de entidades (8) y por tabla de asociación (3)
+SENTENCIAS_GENERACION = 11
+
+def poblar(docentes):
+    """Datos sintéticos: cada docente con 2 líneas, 1 producción, 1 disponibilidad y 2 asignaciones"""
+    cursos = max(docentes // 2, 1)
+    db.session.execute(insert(Area), [{'id': i, 'nombre': f'Área {i}'} for i in range(1, 4)])
+    db.session.execute(insert(LineaInvestigacion), [
+        {'id': i, 'nombre': f'Línea {i}', 'area_id': i % 3 + 1} for i in range(1, 6)
+    ])
+    db.session.execute(insert(PeriodoAcademico), [
+        {'id': i, 'nombre': f'202{i}-I', 'anio': 2020 + i, 'semestre': 1} for i in range(1, 3)
+    ])
+    db.session.execute(insert(Curso), [
+        {'id': i, 'nombre': f'Curso {i}', 'codigo': f'C{i:04d}', 'creditos': 3, 'area_id': i % 3 + 1}
+        for i in range(1, cursos + 1)
+    ])
+    db.session.execute(insert(cursos_lineas_investigacion), [
+        {'curso_id': i, 'linea_investigacion_id': i % 5 + 1} for i in range(1, cursos + 1)
+    ])
+    db.session.execute(insert(Docente), [
+        {'id': i, 'nombre': f'Docente {i}', 'email': f'docente{i}@universidad.edu'} for i in range(1, docentes + 1)
+    ])
+    db.session.execute(insert(docentes_lineas_investigacion), [
+        {'docente_id': i, 'linea_investigacion_id': (i + k) % 5 + 1} for i in range(1, docentes + 1) for k in (0, 2)
+    ])
+    db.session.execute(insert(ProduccionAcademica), [
+        {'id': i, 'titulo': f'Publicación {i}', 'anio_publicacion': 2020} for i in range(1, docentes + 1)
+    ])
+    db.session.execute(insert(docentes_producciones_academicas), [
+        {'docente_id': i, 'produccion_academica_id': i} for i in range(1, docentes + 1)
+    ])
+    db.session.execute(insert(DisponibilidadHoraria), [
+        {'docente_id': i, 'descripcion': f'Lunes {i}'} for i in range(1, docentes + 1)
+    ])
+    db.session.execute(insert(AsignacionDocente), [
+        {'docente_id': i, 'curso_id': (i + k) % cursos + 1, 'periodo_id': k, 'horas_asignadas': 4}
+        for i in range(1, docentes + 1) for k in (1, 2)
+    ])
+    db.session.commit()
+
+def contar_sentencias(funcion):
+    """Ejecuta la función y devuelve (resultado, sentencias SQL emitidas)"""
+    sentencias = []
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', registrar)
+    try:
+        resultado = funcion()
+    finally:
+        event.remove(engine, 'before_cursor_execute', registrar)
+    return resultado, sentencias
+
+@pytest.mark.parametrize('docentes', [5, 200])
+def test_generate_rdf_from_database_emite_sentencias_constantes(app, docentes):
+    poblar(docentes)
+    # Sin objetos en la sesión: cualquier carga perezosa emitiría una consulta más
+    db.session.expunge_all()
+
+    graph, sentencias = contar_sentencias(RDFService().generate_rdf_from_database)
+
+    assert len(sentencias) == SENTENCIAS_GENERACION
+    # Todas las relaciones quedaron en el grafo
+    service = RDFService()
+    assert len(list(graph.triples((None, service.ns.perteneceLinea, None)))) == 2 * docentes
+    assert len(list(graph.triples((None, service.ns.tieneProduccion, None)))) == docentes
+    assert len(list(graph.triples((None, service.ns.tieneDisponibilidad, None)))) == docentes
+
+def test_grafo_en_cache_coincide_con_la_regeneracion_tras_escrituras(app, monkeypatch):
+    from app.routes import docente
+    from app.services.rdf_service import rdf_graph_cache
+    monkeypatch.setattr(docente.triplestore_sync, 'programar', lambda tablas: None)
+    poblar(3)
+    rdf_graph_cache.rebuild()
+    client = app.test_client()
+
+    def comparar():
+        with rdf_graph_cache.read() as graph:
+            cacheados = set(graph)
+        assert cacheados == set(RDFService().generate_rdf_from_database())
+
+    response = client.post('/api/docentes/', json={
+        'nombre': 'Ana Torres', 'email': 'ana@universidad.edu',
+        'lineas_investigacion_ids': [1], 'producciones_academicas_ids': [1, 2]
+    })
+    assert response.status_code == 201
+    docente_id = response.get_json()['data']['id']
+    comparar()
+
+    response = client.put(f'/api/docentes/{docente_id}', json={
+        'nombre': 'Ana María Torres', 'lineas_investigacion_ids': [2, 3], 'producciones_academicas_ids': [3]
+    })
+    assert response.status_code == 200
+    comparar()
+
+    # La producción 3 conserva su otro autor, pero pierde la autoría del docente eliminado
+    assert client.delete(f'/api/docentes/{docente_id}').status_code == 200
+    comparar()
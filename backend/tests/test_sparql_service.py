@@ -0,0 +1,184 @@
+import time
+from urllib.parse import parse_qs
+import pytest
+import requests
+from app.services.sparql_service import SPARQLService, SPARQLTransport
+from app.utils.change_tracking import dataset_version
+
+CONSULTA = 'SELECT ?s WHERE { ?s ?p ?o } LIMIT 1'
+RESULTADO = {'head': {'vars': ['s']}, 'results': {'bindings': []}}
+
+class TransporteFalso:
+    """Endpoint SPARQL simulado; con escritura=True confirma una escritura mientras responde"""
+    def __init__(self, escritura=False):
+        self.escritura = escritura
+        self.consultas = 0
+
+    def query(self, query):
+        self.consultas += 1
+        if self.escritura:
+            dataset_version.aplicar(True)
+        return RESULTADO
+
+def servicio(transporte):
+    service = SPARQLService()
+    service.transport = transporte
+    return service
+
+def test_resultado_en_cache_hasta_la_siguiente_escritura():
+    transporte = TransporteFalso()
+    service = servicio(transporte)
+
+    assert service._execute_sparql_query(CONSULTA) == RESULTADO
+    assert service._execute_sparql_query(CONSULTA) == RESULTADO
+    assert transporte.consultas == 1
+
+    dataset_version.aplicar(True)
+    service._execute_sparql_query(CONSULTA)
+    assert transporte.consultas == 2
+
+def test_escritura_durante_la_consulta_no_deja_el_resultado_como_vigente():
+    transporte = TransporteFalso(escritura=True)
+    service = servicio(transporte)
+
+    service._execute_sparql_query(CONSULTA)
+    transporte.escritura = False
+    # El resultado quedó bajo la versión anterior a la escritura: se vuelve a consultar
+    service._execute_sparql_query(CONSULTA)
+    assert transporte.consultas == 2
+
+def test_ttl_cero_no_usa_la_cache():
+    transporte = TransporteFalso()
+    service = servicio(transporte)
+
+    service._execute_sparql_query(CONSULTA, ttl=0)
+    service._execute_sparql_query(CONSULTA, ttl=0)
+    assert transporte.consultas == 2
+
+def test_query_rechaza_cache_ttl_invalido_antes_de_consultar(app, monkeypatch):
+    from app.routes import sparql
+    transporte = TransporteFalso()
+    monkeypatch.setattr(sparql.sparql_service, 'transport', transporte)
+    client = app.test_client()
+
+    for cache_ttl in ('abc', -1, 1.5, True):
+        response = client.post('/api/sparql/query', json={'query': CONSULTA, 'cache_ttl': cache_ttl})
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
+    assert transporte.consultas == 0
+
+    response = client.post('/api/sparql/query', json={'query': CONSULTA, 'cache_ttl': 0})
+    assert response.status_code == 200
+    assert transporte.consultas == 1
+
+class TransporteCaido:
+    """Endpoint SPARQL inalcanzable (o disponible otra vez con caido=False)"""
+    def __init__(self):
+        self.caido = True
+        self.consultas = 0
+
+    def query(self, query):
+        self.consultas += 1
+        if self.caido:
+            raise requests.ConnectionError('Connection refused')
+        return RESULTADO
+
+def test_endpoint_caido_no_se_consulta_hasta_vencer_la_espera(app):
+    transporte = TransporteCaido()
+    service = servicio(transporte)
+
+    for _ in range(3):
+        assert 'results' in service._execute_sparql_query(CONSULTA, ttl=0)
+    # Solo la primera consulta pagó el intento de conexión; las demás fueron al motor local
+    assert transporte.consultas == 1
+    assert service.breaker.estado['abierto']
+
+    # Vencida la espera se prueba una vez; al fallar otra vez la espera se duplica
+    service.breaker._abierto_hasta = 0
+    service._execute_sparql_query(CONSULTA, ttl=0)
+    service._execute_sparql_query(CONSULTA, ttl=0)
+    assert transporte.consultas == 2
+    assert service.breaker.estado['fallos_consecutivos'] == 2
+    assert service.breaker.estado['reintento_en_s'] > service.breaker.espera_inicial
+
+    transporte.caido = False
+    service.breaker._abierto_hasta = 0
+    assert service._execute_sparql_query(CONSULTA, ttl=0) == RESULTADO
+    assert service._execute_sparql_query(CONSULTA, ttl=0) == RESULTADO
+    assert transporte.consultas == 4
+    assert not service.breaker.estado['abierto']
+
+def test_consultas_predefinidas_en_el_motor_local(app, monkeypatch):
+    from app import db
+    from app.models.models import (
+        Area, LineaInvestigacion, Curso, Docente, PeriodoAcademico, AsignacionDocente,
+        ProduccionAcademica, DisponibilidadHoraria
+    )
+    from app.routes import sparql
+    from app.services.sparql_service import EndpointBreaker
+    monkeypatch.setattr(sparql.sparql_service, 'transport', TransporteCaido())
+    monkeypatch.setattr(sparql.sparql_service, 'breaker', EndpointBreaker())
+
+    area = Area(nombre='Computación')
+    linea = LineaInvestigacion(nombre='Machine Learning', area=area)
+    curso = Curso(nombre='Aprendizaje Automático', codigo='IA101', creditos=4, area=area, lineas_investigacion=[linea])
+    produccion = ProduccionAcademica(titulo='Redes neuronales', anio_publicacion=2024, revista='IEEE Access')
+    docente = Docente(nombre='Ana Torres', email='ana@universidad.edu', lineas_investigacion=[linea], producciones_academicas=[produccion])
+    periodo = PeriodoAcademico(nombre='2025-I', anio=2025, semestre=1)
+    db.session.add_all([curso, docente, periodo])
+    db.session.flush()
+    db.session.add_all([
+        AsignacionDocente(docente_id=docente.id, curso_id=curso.id, periodo_id=periodo.id, horas_asignadas=6),
+        DisponibilidadHoraria(docente_id=docente.id, descripcion='Lunes 8-10'),
+    ])
+    db.session.commit()
+    client = app.test_client()
+
+    for url in (
+        '/api/sparql/docentes-por-area?area=Machine',
+        '/api/sparql/cursos-por-linea?linea=Machine Learning',
+        '/api/sparql/carga-horaria-periodo?periodo=2025-I',
+        f'/api/sparql/produccion-docente/{docente.id}',
+        f'/api/sparql/disponibilidad-docente/{docente.id}',
+        '/api/sparql/lineas-investigacion-docentes',
+    ):
+        response = client.get(url)
+        assert response.status_code == 200, url
+        assert len(response.get_json()['data']['results']['bindings']) == 1, url
+
+    [fila] = client.get('/api/sparql/carga-horaria-periodo?periodo=2025-I').get_json()['data']['results']['bindings']
+    assert fila['nombre']['value'] == 'Ana Torres' and fila['totalHoras']['value'] == '6'
+    [fila] = client.get(f'/api/sparql/produccion-docente/{docente.id}').get_json()['data']['results']['bindings']
+    assert fila['titulo']['value'] == 'Redes neuronales' and fila['revista']['value'] == 'IEEE Access'
+
+def test_transporte_reutiliza_la_conexion(servidor_http):
+    servidor_http.respuesta = RESULTADO
+    transporte = SPARQLTransport(servidor_http.url + '/acadontology/query', pool_size=2)
+    try:
+        for _ in range(3):
+            assert transporte.query(CONSULTA) == RESULTADO
+    finally:
+        transporte.close()
+
+    assert len(servidor_http.peticiones) == 3
+    # Keep-alive: las tres consultas usaron la misma conexión TCP
+    assert len({peticion['puerto_cliente'] for peticion in servidor_http.peticiones}) == 1
+    peticion = servidor_http.peticiones[0]
+    assert peticion['metodo'] == 'POST' and peticion['ruta'] == '/acadontology/query'
+    assert parse_qs(peticion['cuerpo'].decode('utf-8')) == {'query': [CONSULTA]}
+    assert 'application/sparql-results+json' in peticion['headers']['Accept']
+
+def test_transporte_respeta_el_timeout_de_lectura(servidor_http):
+    servidor_http.demora = 1
+    transporte = SPARQLTransport(servidor_http.url, connect_timeout=1, read_timeout=0.2)
+    try:
+        inicio = time.monotonic()
+        with pytest.raises(requests.Timeout):
+            transporte.query(CONSULTA)
+        assert time.monotonic() - inicio < 0.9
+
+        # El pool sigue utilizable después del timeout
+        servidor_http.demora = 0
+        assert transporte.query(CONSULTA) == servidor_http.respuesta
+    finally:
+        transporte.close()
@@ -0,0 +1,90 @@
+import gzip
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+from rdflib import Graph
+from app import db
+from app.models.models import Docente
+from app.routes import docente
+
+class SyncFalso:
+    """Servicio de sincronización simulado: registra las tablas y puede fallar o esperar una señal"""
+    def __init__(self, error=None, liberar=None):
+        self.error = error
+        self.liberar = liberar
+        self.llamadas = []
+        self.en_curso = threading.Event()
+
+    def sync(self, tablas, source=None):
+        self.en_curso.set()
+        if self.liberar is not None:
+            self.liberar.wait(5)
+        self.llamadas.append(tablas)
+        if self.error is not None:
+            raise self.error
+
+def esperar_cola(cola, timeout=5):
+    limite = time.monotonic() + timeout
+    while cola._activo and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert not cola._activo
+
+def test_fallo_del_triplestore_no_afecta_la_escritura(app, monkeypatch):
+    sync = SyncFalso(error=ConnectionError('Fuseki no disponible'))
+    monkeypatch.setattr(docente.triplestore_sync, 'sync_service', sync)
+
+    response = app.test_client().post('/api/docentes/', json={'nombre': 'Ana Torres', 'email': 'ana@universidad.edu'})
+
+    assert response.status_code == 201
+    assert Docente.query.filter_by(email='ana@universidad.edu').count() == 1
+    esperar_cola(docente.triplestore_sync)
+    assert sync.llamadas == [['disponibilidades_horarias', 'docentes', 'producciones_academicas']]
+
+def test_escrituras_durante_un_envio_se_agrupan(app, monkeypatch):
+    liberar = threading.Event()
+    sync = SyncFalso(liberar=liberar)
+    monkeypatch.setattr(docente.triplestore_sync, 'sync_service', sync)
+    client = app.test_client()
+
+    for i in range(4):
+        response = client.post('/api/docentes/', json={'nombre': f'Docente {i}', 'email': f'd{i}@universidad.edu'})
+        assert response.status_code == 201
+        if i == 0:
+            assert sync.en_curso.wait(5)
+    liberar.set()
+
+    esperar_cola(docente.triplestore_sync)
+    # El primer envío ya estaba en curso; las otras tres escrituras comparten el segundo
+    assert len(sync.llamadas) == 2
+
+def test_envio_por_graph_store_protocol(app, servidor_http):
+    from app.models.models import Area
+    from app.services.triplestore_sync import TriplestoreSyncService
+    db.session.add_all([Area(nombre=f'Área {i}') for i in range(3)])
+    db.session.commit()
+    # Cada área genera 2 triples (tipo y etiqueta): 6 triples en lotes de 2
+    service = TriplestoreSyncService(data_endpoint=servidor_http.url + '/acadontology/data', batch_size=2)
+
+    reporte = service.sync(['areas', 'cursos'])
+
+    areas = [p for p in servidor_http.peticiones if 'areas' in p['ruta']]
+    cursos = [p for p in servidor_http.peticiones if 'cursos' in p['ruta']]
+    # El primer lote reemplaza el grafo con nombre y los siguientes se agregan
+    assert [p['metodo'] for p in areas] == ['PUT', 'POST', 'POST']
+    grafo = 'http://cramsoft.org/academico/grafos/areas'
+    assert all(parse_qs(urlsplit(p['ruta']).query) == {'graph': [grafo]} for p in areas)
+    assert all(urlsplit(p['ruta']).path == '/acadontology/data' for p in areas)
+    assert all(p['headers']['Content-Encoding'] == 'gzip' for p in areas)
+    assert all(p['headers']['Content-Type'].startswith('application/n-triples') for p in areas)
+
+    recibido = Graph()
+    for peticion in areas:
+        lineas = gzip.decompress(peticion['cuerpo']).decode('utf-8')
+        assert len(lineas.splitlines()) == 2
+        recibido.parse(data=lineas, format='nt')
+    assert len(recibido) == 6
+    assert reporte['tablas']['areas']['lotes'] == 3
+
+    # Una tabla sin filas vacía su grafo con un PUT sin triples
+    assert [p['metodo'] for p in cursos] == ['PUT']
+    assert gzip.decompress(cursos[0]['cuerpo']) == b''
@@ -9,7 +9,9 @@ window.onload = function() {
         container.innerHTML = '<div class="alert alert-danger">No se pudo cargar el grafo.</div>';
         return;
       }
-      const nodes = json.data.nodes.map(n => ({ data: { id: n.id, label: n.label, group: n.type, ...n.data } }));
+      const nodes = json.data.nodes.map(n => ({ data: { id: n.id, label: n.label, group: n.type, ...n.data }, position: n.x !== undefined ? { x: n.x, y: n.y } : undefined }));
+      // Con coordenadas precalculadas por el servidor se usa el layout 'preset' (sin simulación)
+      const conPosiciones = json.data.nodes.length > 0 && json.data.nodes.every(n => n.x !== undefined);
       const edges = json.data.edges.map(e => ({ data: { id: `${e.source}_${e.target}_${e.type}`.replace(/[^a-zA-Z0-9_]/g, ''), source: e.source, target: e.target, label: e.type, ...e.data } }));
       try {
         container.innerHTML = '';
@@ -38,7 +40,7 @@ window.onload = function() {
               'text-margin-y': -8
             } }
           ],
-          layout: { name: 'cose', animate: true }
+          layout: conPosiciones ? { name: 'preset' } : { name: 'cose', animate: true }
         });
       } catch (err) {
         // Mostrar árbol HTML agrupado por área > línea > docente/curso
@@ -349,9 +349,13 @@ async function loadGraph() {
                 shape: type === 'docente' ? 'image' : 'dot',
                 image: type === 'docente' ? 'https://via.placeholder.com/50' : undefined,
                 font: { size: 14, color: '#333' },
+                x: node.x,
+                y: node.y,
                 title
             };
         }));
+        // Con coordenadas precalculadas por el servidor no hace falta la simulación física
+        const conPosiciones = data.nodes.length > 0 && data.nodes.every(node => node.x !== undefined);
         // Aristas
         const edges = new vis.DataSet(data.edges.map(edge => {
             let label = edge.type;
@@ -378,7 +382,7 @@ async function loadGraph() {
                 produccion_academica: { color: { background: '#9C27B0', border: '#7B1FA2', highlight: { background: '#BA68C8', border: '#7B1FA2' } }, size: 15 },
                 disponibilidad_horaria: { color: { background: '#00BCD4', border: '#0097A7', highlight: { background: '#4DD0E1', border: '#0097A7' } }, size: 15 }
             },
-            physics: { enabled: true, barnesHut: { gravitationalConstant: -8000, centralGravity: 0.3, springLength: 95, springConstant: 0.04, damping: 0.09, avoidOverlap: 0.1 } },
+            physics: { enabled: !conPosiciones, barnesHut: { gravitationalConstant: -8000, centralGravity: 0.3, springLength: 95, springConstant: 0.04, damping: 0.09, avoidOverlap: 0.1 } },
             interaction: { hover: true, tooltipDelay: 200 },
             layout: { hierarchical: false }
         });